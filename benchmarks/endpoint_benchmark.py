@@ -0,0 +1,300 @@
+"""
+Load-tests every read endpoint of the app and reports requests/sec, p50/p95/p99 latency and
+memory allocated per request for each route.
+
+Two targets are supported:
+- in-process (default): the app is driven through httpx's ASGI transport with its lifespan
+  running, against the database in DATABASE_URL or, with --db memory, an in-memory stand-in
+  (no Postgres or query engine needed);
+- --url: a running server, e.g. `uvicorn project.server:app`, over HTTP.
+
+Results are written as JSON with --output. With --baseline, they are compared against an
+earlier results file and the script exits with status 1 if any route lost more than
+--threshold of its throughput or its p99 latency grew by more than --threshold.
+
+Usage:
+    poetry run python -m benchmarks.endpoint_benchmark --db memory --output results.json
+    poetry run python -m benchmarks.endpoint_benchmark --db memory --baseline results.json
+    poetry run python -m benchmarks.endpoint_benchmark --url http://localhost:8000 --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+@dataclass
+class Case:
+    method: str
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    body: Optional[Dict[str, Any]] = None
+    write: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+CASES: List[Case] = [
+    Case("GET", "/helloworld", body={}),
+    Case("GET", "/helloworld/json", body={}),
+    Case("GET", "/api/docs", body={}),
+    Case("GET", "/health", body={}),
+    Case("GET", "/health/live"),
+    Case("GET", "/health/ready"),
+    Case("GET", "/health/history"),
+    Case("GET", "/metrics"),
+    Case("GET", "/api/errors", params={"limit": 100}, body={}),
+    Case("GET", "/api/errors/1"),
+    Case("GET", "/api/errors/top"),
+    Case("GET", "/api/errors/search", params={"q": "timeout"}),
+    Case("GET", "/api/errors/cache-stats"),
+    Case("GET", "/api/db/pool-stats"),
+    Case("PUT", "/helloworld", params={"message": "Hello, World!"}, write=True),
+    Case("PUT", "/health", params={"statusMessage": "API is operational"}, write=True),
+    Case(
+        "POST",
+        "/api/errors",
+        params={"code": 500, "message": "Benchmark error", "fire_and_forget": True},
+        write=True,
+    ),
+]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def send(client: httpx.AsyncClient, case: Case) -> bool:
+    response = await client.request(
+        case.method, case.path, params=case.params, json=case.body
+    )
+    return response.status_code < 400
+
+
+async def run_case(
+    client: httpx.AsyncClient,
+    case: Case,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    measure_allocations: bool,
+) -> Dict[str, Any]:
+    for _ in range(warmup):
+        await send(client, case)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            ok = await send(client, case)
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    result: Dict[str, Any] = {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_sec": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "alloc_kib_per_request": None,
+    }
+    if measure_allocations:
+        result["alloc_kib_per_request"] = await allocations_per_request(
+            client, case, min(requests, 200)
+        )
+    return result
+
+
+async def allocations_per_request(
+    client: httpx.AsyncClient, case: Case, requests: int
+) -> float:
+    """
+    Measures the memory allocated while handling one request, as the peak traced memory above the
+    starting point, averaged over `requests` sequential requests. This includes the client's own
+    allocations, so compare it between runs rather than read it as an absolute.
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(requests):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await send(client, case)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+    return total / requests / 1024
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Returns one message per route whose throughput dropped, or p99 latency grew, by more than `threshold` against the baseline.
+    """
+    regressions = []
+    for name, current in results["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if previous is None:
+            continue
+        if current["requests_per_sec"] < previous["requests_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {current['requests_per_sec']:.0f} req/s vs "
+                f"{previous['requests_per_sec']:.0f} req/s in the baseline"
+            )
+        if current["p99_ms"] > previous["p99_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p99 {current['p99_ms']:.2f}ms vs "
+                f"{previous['p99_ms']:.2f}ms in the baseline"
+            )
+    return regressions
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(
+        f"{'route':<28}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'KiB/req':>10}{'errors':>8}"
+    )
+    for name, result in results["routes"].items():
+        alloc = result["alloc_kib_per_request"]
+        print(
+            f"{name:<28}{result['requests_per_sec']:>10.0f}{result['p50_ms']:>10.2f}"
+            f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{(f'{alloc:.1f}' if alloc is not None else '-'):>10}{result['errors']:>8}"
+        )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    cases = [
+        case
+        for case in CASES
+        if (args.writes or not case.write)
+        and (not args.routes or case.name in args.routes or case.path in args.routes)
+    ]
+    results: Dict[str, Any] = {
+        "meta": {
+            "target": args.url or "asgi",
+            "db": None if args.url else args.db,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "routes": {},
+    }
+
+    async def run_all(client: httpx.AsyncClient, measure_allocations: bool) -> None:
+        for case in cases:
+            results["routes"][case.name] = await run_case(
+                client,
+                case,
+                args.requests,
+                args.concurrency,
+                args.warmup,
+                measure_allocations,
+            )
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            await run_all(client, measure_allocations=False)
+        return results
+
+    if args.db == "memory":
+        import benchmarks.in_memory_db
+
+        benchmarks.in_memory_db.install(errors=args.seed_errors)
+        import project.change_notifications
+
+        # There is no Postgres to LISTEN on.
+        project.change_notifications.CHANGE_NOTIFICATIONS_ENABLED = False
+    import project.server
+
+    transport = httpx.ASGITransport(app=project.server.app)
+    async with project.server.lifespan(project.server.app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            await run_all(client, measure_allocations=not args.no_allocations)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--url", help="Benchmark a running server instead of the app in-process."
+    )
+    parser.add_argument(
+        "--db",
+        choices=["postgres", "memory"],
+        default="postgres",
+        help="In-process only: use DATABASE_URL or the in-memory stand-in.",
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed-errors", type=int, default=1000)
+    parser.add_argument(
+        "--routes", nargs="*", help="Only these routes, as paths or 'METHOD /path'."
+    )
+    parser.add_argument(
+        "--writes", action="store_true", help="Also benchmark the write endpoints."
+    )
+    parser.add_argument(
+        "--no-allocations",
+        action="store_true",
+        help="Skip the sequential allocation-tracing pass.",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", help="Compare against an earlier results file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative throughput drop or p99 growth against the baseline.",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
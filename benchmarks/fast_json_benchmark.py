@@ -0,0 +1,90 @@
+"""
+Compares GET /api/errors throughput and latency with and without FAST_JSON_RESPONSES on large pages of errors.
+
+The app runs in-process against the in-memory database stand-in (or DATABASE_URL with
+--db postgres), so the difference between the two modes is the response validation and
+encoding FastAPI does for a returned pydantic model. Before measuring, the script checks that
+both modes return the same JSON for every page size.
+
+Usage:
+    poetry run python -m benchmarks.fast_json_benchmark
+    poetry run python -m benchmarks.fast_json_benchmark --page-sizes 100 1000 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+
+import httpx
+from benchmarks.endpoint_benchmark import Case, run_case
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.db == "memory":
+        import benchmarks.in_memory_db
+
+        benchmarks.in_memory_db.install(errors=max(args.page_sizes) * 2)
+        import project.change_notifications
+
+        # There is no Postgres to LISTEN on.
+        project.change_notifications.CHANGE_NOTIFICATIONS_ENABLED = False
+    import project.fast_json
+    import project.server
+
+    transport = httpx.ASGITransport(app=project.server.app)
+    async with project.server.lifespan(project.server.app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            print(
+                f"{'page size':>10}{'mode':>10}{'req/s':>10}{'p50 ms':>10}"
+                f"{'p99 ms':>10}{'KiB/req':>10}"
+            )
+            for page_size in args.page_sizes:
+                case = Case("GET", "/api/errors", params={"limit": page_size}, body={})
+                bodies = []
+                for fast in (False, True):
+                    project.fast_json.FAST_JSON_RESPONSES = fast
+                    response = await client.request(
+                        case.method, case.path, params=case.params, json=case.body
+                    )
+                    response.raise_for_status()
+                    bodies.append(json.loads(response.content))
+                if bodies[0] != bodies[1]:
+                    raise SystemExit(
+                        f"The two modes returned different bodies for limit={page_size}."
+                    )
+                for fast in (False, True):
+                    project.fast_json.FAST_JSON_RESPONSES = fast
+                    result = await run_case(
+                        client,
+                        case,
+                        args.requests,
+                        args.concurrency,
+                        args.warmup,
+                        measure_allocations=not args.no_allocations,
+                    )
+                    alloc = result["alloc_kib_per_request"]
+                    print(
+                        f"{page_size:>10}{'fast' if fast else 'default':>10}"
+                        f"{result['requests_per_sec']:>10.0f}{result['p50_ms']:>10.2f}"
+                        f"{result['p99_ms']:>10.2f}"
+                        f"{(f'{alloc:.1f}' if alloc is not None else '-'):>10}"
+                    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", choices=["postgres", "memory"], default="memory")
+    parser.add_argument(
+        "--page-sizes", type=int, nargs="+", default=[10, 100, 1000], metavar="LIMIT"
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--no-allocations",
+        action="store_true",
+        help="Skip the sequential allocation-tracing pass.",
+    )
+    asyncio.run(main(parser.parse_args()))
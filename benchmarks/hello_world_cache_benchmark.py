@@ -0,0 +1,62 @@
+"""
+Measures GET /helloworld and GET /helloworld/json throughput with and without the
+in-process hello-world message cache.
+
+The app is driven in-process through the ASGI transport, so the numbers exclude network
+and HTTP parsing cost and isolate the database round trip the cache removes. A reachable
+database (DATABASE_URL) and a generated Prisma client are required.
+
+Usage:
+    poetry run python -m benchmarks.hello_world_cache_benchmark --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import project.hello_world_cache
+import project.server
+
+ROUTES = ["/helloworld", "/helloworld/json"]
+
+
+async def run_route(
+    client: httpx.AsyncClient, path: str, requests: int, concurrency: int
+) -> float:
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            response = await client.request("GET", path, json={})
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    cache = project.hello_world_cache.message_cache
+    cached_ttl = cache.ttl if cache.enabled else 300.0
+    transport = httpx.ASGITransport(app=project.server.app)
+    async with project.server.lifespan(project.server.app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            print(f"{'route':<20}{'no cache (req/s)':>20}{'cache (req/s)':>20}")
+            for path in ROUTES:
+                cache.ttl = 0
+                uncached = await run_route(client, path, requests, concurrency)
+                cache.ttl = cached_ttl
+                await cache.load()
+                cached = await run_route(client, path, requests, concurrency)
+                print(f"{path:<20}{uncached:>20.0f}{cached:>20.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
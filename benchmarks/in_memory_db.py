@@ -0,0 +1,248 @@
+"""
+An in-memory stand-in for the Postgres database, for benchmarks that should measure the app
+rather than the database.
+
+`install()` replaces the Prisma client's query execution, so every model query the services
+make is answered from Python dictionaries instead of the query engine. The client's
+instrumentation (metrics, query accounting) still runs, since it wraps the replaced method.
+Only the query shapes the services use are supported: equality and comparison filters,
+ordering by one or more fields, cursors, skip/take, and plain or `increment` updates. Raw SQL
+is accepted and returns no rows.
+"""
+
+import itertools
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import prisma
+import prisma.errors
+from prisma._metrics import Metrics
+
+Row = Dict[str, Any]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# Column defaults from schema.prisma, applied on create.
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "HelloWorldModule": {"message": "Hello, World!", "responseType": "PLAIN_TEXT"},
+    "HealthCheckModule": {"statusMessage": "API is operational"},
+    "ErrorHandlingModule": {
+        "fingerprint": None,
+        "occurrences": 1,
+        "firstSeen": _now,
+        "lastSeen": _now,
+    },
+    "ErrorHandlingArchiveModule": {"archivedAt": _now},
+}
+
+
+def _matches(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return value == condition
+    for operator, operand in condition.items():
+        if operator == "equals" and value != operand:
+            return False
+        if operator == "not" and _matches(value, operand):
+            return False
+        if operator == "in" and value not in operand:
+            return False
+        if operator == "notIn" and value in operand:
+            return False
+        if operator in ("gt", "gte", "lt", "lte") and value is None:
+            return False
+        if operator == "gt" and not value > operand:
+            return False
+        if operator == "gte" and not value >= operand:
+            return False
+        if operator == "lt" and not value < operand:
+            return False
+        if operator == "lte" and not value <= operand:
+            return False
+        if operator == "contains" and operand not in (value or ""):
+            return False
+    return True
+
+
+def _where(row: Row, where: Optional[Dict[str, Any]]) -> bool:
+    for field, condition in (where or {}).items():
+        if field == "AND":
+            if not all(_where(row, clause) for clause in condition):
+                return False
+        elif field == "OR":
+            if not any(_where(row, clause) for clause in condition):
+                return False
+        elif field == "NOT":
+            if _where(row, condition):
+                return False
+        elif not _matches(row.get(field), condition):
+            return False
+    return True
+
+
+class InMemoryDatabase:
+    def __init__(self) -> None:
+        self.tables: Dict[str, Dict[int, Row]] = {}
+        self._ids: Dict[str, Any] = {}
+
+    def table(self, model: str) -> Dict[int, Row]:
+        return self.tables.setdefault(model, {})
+
+    def insert(self, model: str, data: Row) -> Row:
+        row: Row = {
+            field: default() if callable(default) else default
+            for field, default in DEFAULTS.get(model, {}).items()
+        }
+        row.update(data)
+        if "id" not in row:
+            ids = self._ids.setdefault(model, itertools.count(1))
+            row["id"] = next(ids)
+            while row["id"] in self.table(model):
+                row["id"] = next(ids)
+        self.table(model)[row["id"]] = row
+        return row
+
+    def seed(self, errors: int) -> None:
+        self.insert("HelloWorldModule", {})
+        self.insert("HealthCheckModule", {})
+        for i in range(errors):
+            self.insert(
+                "ErrorHandlingModule",
+                {
+                    "errorMessage": f"Benchmark error {i % 50}",
+                    "resolution": "Retry the request",
+                    "code": (400, 404, 500, 503)[i % 4],
+                    "fingerprint": f"benchmark-{i}" if i % 10 == 0 else None,
+                    "occurrences": i % 97 + 1,
+                },
+            )
+
+    def select(self, model: str, arguments: Dict[str, Any]) -> List[Row]:
+        rows = [
+            row
+            for row in self.table(model).values()
+            if _where(row, arguments.get("where"))
+        ]
+        if arguments.get("distinct"):
+            raise NotImplementedError(
+                "The in-memory database does not support distinct."
+            )
+        order = arguments.get("order_by") or {"id": "asc"}
+        for clause in reversed(order if isinstance(order, list) else [order]):
+            for field, direction in reversed(list(clause.items())):
+                rows.sort(key=lambda row: row[field], reverse=direction == "desc")
+        cursor = arguments.get("cursor")
+        if cursor:
+            # Like Prisma, start at the row the cursor points to, in the requested order.
+            start = next(
+                (
+                    index
+                    for index, row in enumerate(rows)
+                    if all(row.get(field) == value for field, value in cursor.items())
+                ),
+                len(rows),
+            )
+            rows = rows[start:]
+        skip = arguments.get("skip") or 0
+        take = arguments.get("take")
+        return rows[skip : skip + take if take is not None else None]
+
+    def _not_found(self, model: str) -> prisma.errors.RecordNotFoundError:
+        return prisma.errors.RecordNotFoundError(
+            {"user_facing_error": {"message": f"No {model} record found."}}
+        )
+
+    def _apply(self, row: Row, data: Dict[str, Any]) -> None:
+        for field, value in data.items():
+            if isinstance(value, dict) and "increment" in value:
+                row[field] += value["increment"]
+            elif isinstance(value, dict) and "set" in value:
+                row[field] = value["set"]
+            else:
+                row[field] = value
+
+    def execute(
+        self, method: str, arguments: Dict[str, Any], model: Optional[type]
+    ) -> Any:
+        if model is None:
+            if method == "query_raw":
+                return {"columns": [], "types": [], "rows": []}
+            return 0
+        name = model.__name__
+        table = self.table(name)
+        if method in ("find_first", "find_unique"):
+            rows = self.select(name, {**arguments, "take": 1})
+            return rows[0] if rows else None
+        if method in ("find_first_or_raise", "find_unique_or_raise"):
+            rows = self.select(name, {**arguments, "take": 1})
+            if not rows:
+                raise self._not_found(name)
+            return rows[0]
+        if method == "find_many":
+            return self.select(name, arguments)
+        if method == "count":
+            return {"_count": {"_all": len(self.select(name, arguments))}}
+        if method == "create":
+            return self.insert(name, arguments["data"])
+        if method == "create_many":
+            for data in arguments["data"]:
+                self.insert(name, data)
+            return {"count": len(arguments["data"])}
+        if method in ("update", "delete"):
+            rows = self.select(name, {"where": arguments["where"], "take": 1})
+            if not rows:
+                raise self._not_found(name)
+            if method == "delete":
+                return table.pop(rows[0]["id"])
+            self._apply(rows[0], arguments["data"])
+            return rows[0]
+        if method == "upsert":
+            rows = self.select(name, {"where": arguments["where"], "take": 1})
+            if not rows:
+                return self.insert(name, arguments["data"]["create"])
+            self._apply(rows[0], arguments["data"]["update"])
+            return rows[0]
+        if method in ("update_many", "delete_many"):
+            rows = self.select(name, {"where": arguments.get("where")})
+            for row in rows:
+                if method == "delete_many":
+                    del table[row["id"]]
+                else:
+                    self._apply(row, arguments["data"])
+            return {"count": len(rows)}
+        raise NotImplementedError(f"The in-memory database does not support {method}.")
+
+
+def install(errors: int = 1000) -> InMemoryDatabase:
+    """
+    Routes every Prisma query of this process to a fresh in-memory database seeded with `errors` errors.
+    """
+    database = InMemoryDatabase()
+    database.seed(errors)
+
+    async def execute(
+        self: Any,
+        *,
+        method: str,
+        arguments: Dict[str, Any],
+        model: Optional[type] = None,
+        root_selection: Optional[List[str]] = None,
+    ) -> Any:
+        return {"data": {"result": database.execute(method, arguments, model)}}
+
+    async def connect(self: Any, timeout: Any = None) -> None:
+        pass
+
+    async def disconnect(self: Any, timeout: Any = None) -> None:
+        pass
+
+    async def get_metrics(self: Any, *args: Any, **kwargs: Any) -> Metrics:
+        return Metrics(counters=[], gauges=[], histograms=[])
+
+    prisma.Prisma._execute = execute
+    prisma.Prisma.connect = connect
+    prisma.Prisma.disconnect = disconnect
+    prisma.Prisma.get_metrics = get_metrics
+    return database
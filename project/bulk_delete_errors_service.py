@@ -0,0 +1,39 @@
+import prisma
+import prisma.models
+import project.change_notifications
+import project.error_cache
+import project.error_filters
+from pydantic import BaseModel
+
+
+class BulkDeleteErrorsResponseModel(BaseModel):
+    """
+    Response model reporting how many errors were deleted, and whether more errors match the selection than one request may delete.
+    """
+
+    affected: int
+    has_more: bool
+
+
+async def bulk_delete_errors(
+    selection: project.error_filters.ErrorSelectionModel,
+) -> BulkDeleteErrorsResponseModel:
+    """
+    This endpoint deletes many errors with a single delete_many statement. Errors are selected by a list of IDs or by a filter on code and ID range. At most ERROR_BULK_MAX_ROWS errors are deleted per request to bound lock duration; when 'has_more' is true, repeat the request to continue.
+
+    Args:
+        selection (project.error_filters.ErrorSelectionModel): Selects the errors to delete, either by explicit IDs or by a filter on error code and ID range.
+
+    Returns:
+        BulkDeleteErrorsResponseModel: Response model reporting how many errors were deleted, and whether more errors match the selection than one request may delete.
+
+    Example:
+        response = await bulk_delete_errors(ErrorSelectionModel(ids=[1, 2, 3]))
+        > BulkDeleteErrorsResponseModel(affected=3, has_more=False)
+    """
+    where, has_more = await project.error_filters.bounded_selection(selection)
+    affected = await prisma.models.ErrorHandlingModule.prisma().delete_many(where=where)
+    if affected:
+        project.error_cache.clear()
+        await project.change_notifications.publish("ErrorHandlingModule")
+    return BulkDeleteErrorsResponseModel(affected=affected, has_more=has_more)
@@ -0,0 +1,72 @@
+from typing import Optional
+
+import prisma
+import prisma.models
+import prisma.types
+import project.change_notifications
+import project.error_cache
+import project.error_filters
+import project.exceptions
+from pydantic import BaseModel
+
+
+class BulkUpdateErrorsRequestModel(BaseModel):
+    """
+    Request model for updating many errors at once. The selection picks the errors; every field that is set is applied to all of them.
+    """
+
+    selection: project.error_filters.ErrorSelectionModel
+    resolution: Optional[str] = None
+    code: Optional[int] = None
+    errorMessage: Optional[str] = None
+
+
+class BulkUpdateErrorsResponseModel(BaseModel):
+    """
+    Response model reporting how many errors were updated, and whether more errors match the selection than one request may change.
+    """
+
+    affected: int
+    has_more: bool
+
+
+async def bulk_update_errors(
+    request: BulkUpdateErrorsRequestModel,
+) -> BulkUpdateErrorsResponseModel:
+    """
+    This endpoint resolves or updates many errors with a single update_many statement. Errors are selected by a list of IDs or by a filter on code and ID range. At most ERROR_BULK_MAX_ROWS errors are changed per request to bound lock duration; when 'has_more' is true, repeat the request to continue.
+
+    Args:
+        request (BulkUpdateErrorsRequestModel): Request model for updating many errors at once. The selection picks the errors; every field that is set is applied to all of them.
+
+    Returns:
+        BulkUpdateErrorsResponseModel: Response model reporting how many errors were updated, and whether more errors match the selection than one request may change.
+
+    Example:
+        request = BulkUpdateErrorsRequestModel(selection=ErrorSelectionModel(code=500), resolution="Fixed in 1.2.3")
+        response = await bulk_update_errors(request)
+        > BulkUpdateErrorsResponseModel(affected=5000, has_more=True)
+    """
+    data: prisma.types.ErrorHandlingModuleUpdateManyMutationInput = {}
+    if request.resolution is not None:
+        data["resolution"] = request.resolution
+    if request.code is not None:
+        data["code"] = request.code
+    if request.errorMessage is not None:
+        data["errorMessage"] = request.errorMessage
+    if "code" in data or "errorMessage" in data:
+        # Fingerprints are derived from code and message; a stale one would make new
+        # occurrences of the old error be counted in the changed rows.
+        data["fingerprint"] = None
+    if not data:
+        raise project.exceptions.BadRequestError(
+            "Nothing to update: set resolution, code or errorMessage."
+        )
+    where, has_more = await project.error_filters.bounded_selection(request.selection)
+    affected = await prisma.models.ErrorHandlingModule.prisma().update_many(
+        where=where, data=data
+    )
+    if affected:
+        project.error_cache.clear()
+        await project.change_notifications.publish("ErrorHandlingModule")
+    return BulkUpdateErrorsResponseModel(affected=affected, has_more=has_more)
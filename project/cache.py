@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+K = TypeVar("K", bound=Hashable)
+
+# Returned by LRUCache.get when there is no fresh entry, since None is a valid cached value.
+MISS: Any = object()
+
+
+class CachedValue(Generic[T]):
+    """
+    A single value loaded from the database and kept in process memory.
+
+    Reads are served from memory while the value is fresh. The TTL is only a safety net:
+    writers are expected to call `set` (write-through) or `invalidate` whenever the
+    underlying row changes. A TTL of zero or less disables caching and every read goes
+    to the loader.
+
+    `set` and `invalidate` bump a version. A load only stores its result if the version is
+    unchanged once the loader returns, so a load that raced with a write does not put the
+    value it read before the write back into the cache.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[T]], ttl: float) -> None:
+        self._loader = loader
+        self.ttl = ttl
+        self._value: Optional[T] = None
+        self._loaded_at: Optional[float] = None
+        self._has_value = False
+        self._version = 0
+        self._lock = asyncio.Lock()
+        self._listeners: List[Callable[[T], None]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def get(self) -> T:
+        """
+        Returns the cached value, loading it first if it is missing or expired.
+
+        Concurrent callers that find the value expired wait on a single load instead of
+        each issuing their own query.
+        """
+        if not self.enabled:
+            return await self._loader()
+        if self.fresh:
+            return self._value  # type: ignore[return-value]
+        async with self._lock:
+            if not self.fresh:
+                return await self._load()
+            return self._value  # type: ignore[return-value]
+
+    async def load(self) -> T:
+        """
+        Unconditionally reloads the value from the loader, e.g. at application startup.
+        """
+        return await self._load()
+
+    async def _load(self) -> T:
+        version = self._version
+        value = await self._loader()
+        if version != self._version:
+            # Written or invalidated while loading: `value` may predate that change.
+            return self._value if self.fresh else value  # type: ignore[return-value]
+        self.set(value)
+        return value
+
+    def add_listener(self, callback: Callable[[T], None]) -> None:
+        """
+        Registers a callback that is called with the new value whenever a load or write changes it.
+        """
+        self._listeners.append(callback)
+
+    def set(self, value: T) -> None:
+        changed = not self._has_value or value != self._value
+        self._value = value
+        self._has_value = True
+        self._loaded_at = time.monotonic()
+        self._version += 1
+        if changed:
+            for callback in self._listeners:
+                callback(value)
+
+    def invalidate(self) -> None:
+        """
+        Marks the value as stale so the next read reloads it. The old value is only kept to detect whether the reload changed it.
+        """
+        self._loaded_at = None
+        self._version += 1
+
+
+class LRUCache(Generic[K, T]):
+    """
+    A bounded least-recently-used cache whose entries also expire after a TTL.
+
+    Once `max_size` entries are held, adding one evicts the least recently used. Entries can be
+    given their own TTL, e.g. a shorter one for negative entries recording that a row does not
+    exist. Hits, misses and evictions are counted.
+
+    `invalidate` and `clear` bump the generation of the keys they drop. A caller loading a value
+    reads `generation(key)` before the load and only puts the value if it is unchanged after, so
+    a load that raced with an invalidation does not cache the old row again. The generations of
+    at most `max_size` invalidated keys are remembered; older ones are folded into a common
+    floor, which may make a put be skipped needlessly but never lets a stale one through.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[K, Tuple[float, T]]" = OrderedDict()
+        self._version = 0
+        self._floor = 0
+        self._generations: "OrderedDict[K, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> T:
+        """
+        Returns the cached value for `key`, or MISS if it is absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return MISS
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: K, value: T, ttl: Optional[float] = None) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def generation(self, key: K) -> int:
+        return self._generations.get(key, self._floor)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+        self._version += 1
+        self._generations[key] = self._version
+        self._generations.move_to_end(key)
+        while len(self._generations) > max(self.max_size, 1):
+            _, version = self._generations.popitem(last=False)
+            self._floor = max(self._floor, version)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._version += 1
+        self._floor = self._version
+        self._generations.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
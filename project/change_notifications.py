@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import prisma
+
+logger = logging.getLogger(__name__)
+
+CHANGE_NOTIFICATIONS_ENABLED = (
+    os.getenv("CHANGE_NOTIFICATIONS_ENABLED", "true").lower() == "true"
+)
+CHANGE_NOTIFICATION_CHANNEL = os.getenv("CHANGE_NOTIFICATION_CHANNEL", "model_changes")
+
+# Identifies this process, so that a worker can skip the notifications it published itself
+# (its own caches are already refreshed write-through).
+_ORIGIN = uuid.uuid4().hex
+
+# DATABASE_URL query parameters that libpq-style drivers understand. Prisma-specific
+# parameters such as `schema` or `connection_limit` are dropped for the listener connection.
+_LISTENER_URL_PARAMETERS = {
+    "host",
+    "port",
+    "sslmode",
+    "sslrootcert",
+    "sslcert",
+    "sslkey",
+    "passfile",
+}
+
+_subscribers: DefaultDict[
+    str, List[Tuple[Callable[[], None], Optional[Callable[[Any], None]]]]
+] = defaultdict(list)
+
+
+def subscribe(
+    model: str,
+    callback: Callable[[], None],
+    invalidate_key: Optional[Callable[[Any], None]] = None,
+) -> None:
+    """
+    Registers a callback that drops locally cached data whenever rows of `model` change on any worker.
+
+    Args:
+        model (str): The Prisma model name, e.g. "HelloWorldModule".
+        callback (Callable[[], None]): Invalidation callback. It must not block.
+        invalidate_key (Optional[Callable[[Any], None]]): Called instead of `callback` with the
+            key of the changed row, e.g. its ID, when the notification names one.
+    """
+    _subscribers[model].append((callback, invalidate_key))
+
+
+def notify_local(model: Optional[str] = None, key: Any = None) -> None:
+    """
+    Runs the invalidation callbacks of `model` in this process, or of every model if None. With
+    a `key`, subscribers that invalidate single keys only drop that one.
+    """
+    models = [model] if model is not None else list(_subscribers)
+    for name in models:
+        for callback, invalidate_key in _subscribers.get(name, ()):
+            try:
+                if key is not None and invalidate_key is not None:
+                    invalidate_key(key)
+                else:
+                    callback()
+            except Exception:
+                logger.exception("Invalidation callback for %s failed", name)
+
+
+async def publish(model: str, key: Any = None) -> None:
+    """
+    Tells every other worker listening on the change channel that rows of `model` changed.
+
+    A failed notification is logged rather than raised: the write itself already succeeded, and
+    the cache TTLs still bound how long other workers can serve the old data.
+
+    Args:
+        model (str): The Prisma model name whose rows changed.
+        key (Any): The JSON-serializable key, e.g. the ID, of the single row that changed. None
+            when any number of rows may have changed.
+    """
+    if not CHANGE_NOTIFICATIONS_ENABLED:
+        return
+    message = {"model": model, "origin": _ORIGIN}
+    if key is not None:
+        message["key"] = key
+    payload = json.dumps(message)
+    try:
+        await prisma.get_client().execute_raw(
+            "SELECT pg_notify($1, $2)", CHANGE_NOTIFICATION_CHANNEL, payload
+        )
+    except Exception:
+        logger.exception("Failed to publish change notification for %s", model)
+
+
+def _handle_notification(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed change notification: %r", payload)
+        return
+    if message.get("origin") == _ORIGIN:
+        return
+    notify_local(message.get("model"), message.get("key"))
+
+
+def _listener_dsn(database_url: str) -> str:
+    parts = urlsplit(database_url)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query)
+        if key in _LISTENER_URL_PARAMETERS
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class ChangeListener:
+    """
+    Listens on the change channel over a dedicated Postgres connection and runs the matching invalidation callbacks.
+
+    The connection is re-established with a backoff when it drops. Notifications sent while it
+    was down are lost, so every subscriber is invalidated after each (re)connect.
+    """
+
+    def __init__(
+        self, database_url: str, channel: str = CHANGE_NOTIFICATION_CHANNEL
+    ) -> None:
+        self._dsn = _listener_dsn(database_url)
+        self._channel = channel
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        try:
+            import asyncpg  # noqa: F401
+        except ImportError:
+            logger.warning(
+                "asyncpg is not installed; cross-worker cache invalidation is disabled "
+                "and caches rely on their TTLs."
+            )
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        backoff = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(
+                    self._channel,
+                    lambda _connection, _pid, _channel, payload: _handle_notification(
+                        payload
+                    ),
+                )
+                notify_local()
+                backoff = 1.0
+                await closed.wait()
+                logger.warning("Change notification connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    "Change notification listener failed; retrying in %.0fs", backoff
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
@@ -0,0 +1,47 @@
+import math
+import os
+from typing import Optional
+
+# cgroup v2 and v1 files holding the CPU quota of the container the process runs in.
+_CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+_CGROUP_V1_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+_CGROUP_V1_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota() -> Optional[int]:
+    """
+    Returns the CPUs allowed by the cgroup CPU quota, rounded up, or None if there is no quota.
+    """
+    cpu_max = _read(_CGROUP_V2_CPU_MAX)
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+    else:
+        quota, period = _read(_CGROUP_V1_QUOTA) or "", _read(_CGROUP_V1_PERIOD) or ""
+    if not quota.lstrip("-").isdigit() or not period.isdigit():
+        return None
+    if int(quota) <= 0 or int(period) <= 0:
+        return None
+    return max(1, math.ceil(int(quota) / int(period)))
+
+
+def available_cpus() -> int:
+    """
+    Counts the CPUs this process may actually use: the CPUs it is allowed to run on, capped by
+    the container's CPU quota. `os.cpu_count()` reports every core of the host instead.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return max(1, cpus)
@@ -0,0 +1,48 @@
+import prisma
+import prisma.enums
+import prisma.models
+import project.change_notifications
+import project.hello_world_cache
+from pydantic import BaseModel
+
+
+class HelloWorldPostResponse(BaseModel):
+    """
+    Response model for the created 'Hello, World!' message, including its unique ID and response type.
+    """
+
+    id: int
+    message: str
+    responseType: prisma.enums.ResponseType
+
+
+async def createHelloWorld(
+    message: str, responseType: prisma.enums.ResponseType
+) -> HelloWorldPostResponse:
+    """
+    This endpoint allows the creation of a new 'Hello, World!' message. It accepts a JSON payload with a 'message' field. This new message can then be fetched via the GET endpoints. Only admin users can create new messages.
+
+    Args:
+        message (str): The 'Hello, World!' message to be stored.
+        responseType (prisma.enums.ResponseType): The format in which the message should be returned.
+
+    Returns:
+        HelloWorldPostResponse: Response model for the created 'Hello, World!' message, including its unique ID and response type.
+
+    Example:
+        response = await createHelloWorld("Hello, World!", prisma.enums.ResponseType.PLAIN_TEXT)
+        > HelloWorldPostResponse(id=1, message="Hello, World!", responseType=ResponseType.PLAIN_TEXT)
+    """
+    hello_world = await prisma.models.HelloWorldModule.prisma().create(
+        data={"message": message, "responseType": responseType}
+    )
+    # The GET endpoints serve the first stored message, which is not necessarily the one
+    # just created, so reload the cache rather than writing the new message through.
+    project.hello_world_cache.forget_loads()
+    await project.hello_world_cache.message_cache.load()
+    await project.change_notifications.publish("HelloWorldModule")
+    return HelloWorldPostResponse(
+        id=hello_world.id,
+        message=hello_world.message,
+        responseType=hello_world.responseType,
+    )
@@ -1,5 +1,11 @@
+from datetime import datetime, timezone
+from typing import Optional
+
 import prisma
 import prisma.models
+import project.error_cache
+import project.error_fingerprint
+import project.error_ingestion
 from pydantic import BaseModel
 
 
@@ -13,13 +19,24 @@ class ErrorResponse(BaseModel):
     message: str
 
 
-async def create_error(code: int, message: str) -> ErrorResponse:
+class ErrorAcceptedResponse(BaseModel):
+    """
+    Response model for an error handed to the ingestion queue. The error is written in the background, so it has no ID yet.
+    """
+
+    accepted: bool
+
+
+async def create_error(
+    code: int, message: str, dedup: Optional[bool] = None
+) -> ErrorResponse:
     """
     This endpoint allows for the creation of a new error message. It is used internally by other modules to log errors. It accepts a JSON object with 'code' and 'message' fields as input and returns the created error object with a unique ID.
 
     Args:
     code (int): The error code representing the type of error.
     message (str): The detailed error message explaining the error.
+    dedup (Optional[bool]): Whether to count the error in the row of earlier errors with the same code and message instead of inserting a new row. Defaults to ERROR_DEDUP_ENABLED.
 
     Returns:
     ErrorResponse: Response model for the created error object. It includes the unique ID of the error, the error code, and the error message.
@@ -28,9 +45,55 @@ async def create_error(code: int, message: str) -> ErrorResponse:
     > create_error(404, 'Not Found')
     > ErrorResponse(id=1, code=404, message='Not Found')
     """
-    new_error = await prisma.models.ErrorHandlingModule.prisma().create(
-        data={"errorMessage": message, "resolution": "", "code": code}
-    )
+    if dedup is None:
+        dedup = project.error_fingerprint.ERROR_DEDUP_ENABLED
+    if dedup:
+        fingerprint = project.error_fingerprint.fingerprint(code, message)
+        new_error = await prisma.models.ErrorHandlingModule.prisma().upsert(
+            where={"fingerprint": fingerprint},
+            data={
+                "create": {
+                    "errorMessage": message,
+                    "resolution": "",
+                    "code": code,
+                    "fingerprint": fingerprint,
+                },
+                "update": {
+                    "occurrences": {"increment": 1},
+                    "lastSeen": datetime.now(timezone.utc),
+                },
+            },
+        )
+    else:
+        new_error = await prisma.models.ErrorHandlingModule.prisma().create(
+            data={"errorMessage": message, "resolution": "", "code": code}
+        )
+    # Drop a negative entry cached for the new ID, if one was looked up before it existed.
+    project.error_cache.invalidate(new_error.id)
     return ErrorResponse(
         id=new_error.id, code=new_error.code, message=new_error.errorMessage
     )
+
+
+async def enqueue_error(
+    code: int, message: str, dedup: Optional[bool] = None
+) -> ErrorAcceptedResponse:
+    """
+    Logs an error without waiting for the database. The error is added to the in-process ingestion queue and written in a batch with other errors shortly afterwards. This is the cheap path for other modules that log errors while the database is under pressure.
+
+    Args:
+    code (int): The error code representing the type of error.
+    message (str): The detailed error message explaining the error.
+    dedup (Optional[bool]): Whether to count the error in the row of earlier errors with the same code and message. Defaults to ERROR_DEDUP_ENABLED.
+
+    Returns:
+    ErrorAcceptedResponse: Whether the error was queued. It is not queued when the queue is full and its overflow policy discards the error.
+
+    Example:
+    > await enqueue_error(503, 'Service Unavailable')
+    > ErrorAcceptedResponse(accepted=True)
+    """
+    if dedup is None:
+        dedup = project.error_fingerprint.ERROR_DEDUP_ENABLED
+    accepted = await project.error_ingestion.error_queue.submit(code, message, dedup)
+    return ErrorAcceptedResponse(accepted=accepted)
@@ -0,0 +1,41 @@
+import prisma
+import prisma.models
+import project.change_notifications
+from pydantic import BaseModel
+
+
+class HealthCheckResponse(BaseModel):
+    """
+    Response model confirming that a new health status entry was created.
+    """
+
+    id: int
+    statusMessage: str
+    confirmationMessage: str
+
+
+async def create_health_status(statusMessage: str, adminId: int) -> HealthCheckResponse:
+    """
+    This endpoint is meant for updating or initiating new health status entry for the API logging purpose. Expected response is a confirmation message that the health status entry was created. Generally, this won't be typically used frequently and is kept primarily for administrative use.
+
+    Args:
+        statusMessage (str): The status message of the new health status entry.
+        adminId (int): The ID of the admin user creating the entry.
+
+    Returns:
+        HealthCheckResponse: Response model confirming that a new health status entry was created.
+
+    Example:
+        response = await create_health_status("API is operational", 1)
+        > HealthCheckResponse(id=1, statusMessage="API is operational", confirmationMessage="Health status entry created by admin 1")
+    """
+    health_check = await prisma.models.HealthCheckModule.prisma().create(
+        data={"statusMessage": statusMessage}
+    )
+    project.change_notifications.notify_local("HealthCheckModule")
+    await project.change_notifications.publish("HealthCheckModule")
+    return HealthCheckResponse(
+        id=health_check.id,
+        statusMessage=health_check.statusMessage,
+        confirmationMessage=f"Health status entry created by admin {adminId}",
+    )
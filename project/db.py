@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import project.cpus
+import project.metrics
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+# Maximum open connections per worker. 0 splits DB_CONNECTION_BUDGET between the workers.
+DB_CONNECTION_LIMIT = int(os.getenv("DB_CONNECTION_LIMIT", "0"))
+# Pooled connections for all the workers of this instance together. 0 = twice the usable CPUs
+# plus one, Prisma's default for a single process.
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", "0"))
+# Worker processes sharing the budget; project.launcher sets it to the number it starts.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+# Seconds a query waits for a free pooled connection before failing. Prisma only accepts whole
+# seconds in the URL, for this and DB_CONNECT_TIMEOUT.
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Seconds allowed to open a new database connection.
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+# Seconds allowed for the query engine to start when connecting the client.
+DB_ENGINE_CONNECT_TIMEOUT = float(os.getenv("DB_ENGINE_CONNECT_TIMEOUT", "10"))
+DB_WARM_UP_CONNECTIONS = int(os.getenv("DB_WARM_UP_CONNECTIONS", "4"))
+
+
+def effective_connection_limit() -> int:
+    """
+    Returns this worker's pool size: DB_CONNECTION_LIMIT if set, else its share of
+    DB_CONNECTION_BUDGET, so the instance's connections do not grow with workers x CPUs.
+    """
+    if DB_CONNECTION_LIMIT > 0:
+        return DB_CONNECTION_LIMIT
+    budget = DB_CONNECTION_BUDGET or project.cpus.available_cpus() * 2 + 1
+    return max(1, budget // max(1, WEB_CONCURRENCY))
+
+
+def pooled_database_url(
+    database_url: str,
+    connection_limit: Optional[int] = None,
+    pool_timeout: int = DB_POOL_TIMEOUT,
+    connect_timeout: int = DB_CONNECT_TIMEOUT,
+) -> str:
+    """
+    Adds the pool settings to the DATABASE_URL query string, where Prisma reads them from.
+    Settings from the environment replace the ones already in the URL. `connection_limit`
+    defaults to effective_connection_limit().
+    """
+    parts = urlsplit(database_url)
+    query = dict(parse_qsl(parts.query))
+    query["connection_limit"] = str(connection_limit or effective_connection_limit())
+    query["pool_timeout"] = str(int(pool_timeout))
+    query["connect_timeout"] = str(int(connect_timeout))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+db_client = project.metrics.InstrumentedPrisma(
+    auto_register=True,
+    datasource={"url": pooled_database_url(DATABASE_URL)} if DATABASE_URL else None,
+    connect_timeout=timedelta(seconds=DB_ENGINE_CONNECT_TIMEOUT),
+)
+
+
+async def connect(warm_up_connections: int = DB_WARM_UP_CONNECTIONS) -> None:
+    """
+    Connects the Prisma client and opens `warm_up_connections` pooled connections up front, so the
+    first requests after a deploy do not pay the connection setup cost.
+    """
+    await db_client.connect()
+    await warm_up(min(warm_up_connections, effective_connection_limit()))
+
+
+async def warm_up(connections: int) -> None:
+    """
+    Opens up to `connections` pooled connections by running that many overlapping queries.
+
+    The pool only opens a connection when a query needs one, so each query holds its connection
+    briefly to make the others open their own. A failed warm-up is logged and the pool fills
+    lazily instead.
+    """
+    if connections <= 0:
+        return
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(
+                db_client.execute_raw("SELECT pg_sleep(0.05)")
+                for _ in range(connections)
+            )
+        )
+    except Exception:
+        logger.exception("Database connection warm-up failed")
+        return
+    logger.info(
+        "Opened %d database connections in %.0fms",
+        connections,
+        (time.perf_counter() - started) * 1000,
+    )
+
+
+async def disconnect() -> None:
+    await db_client.disconnect()
+
+
+async def pool_metrics() -> Dict[str, float]:
+    """
+    Reads the connection pool gauges and query wait times from the Prisma query engine.
+
+    Returns:
+    Dict[str, float]: Gauge and counter values by metric key, plus `<histogram>_sum` and `<histogram>_count` for each histogram.
+    """
+    metrics = await db_client.get_metrics()
+    values: Dict[str, float] = {}
+    for metric in (*metrics.counters, *metrics.gauges):
+        values[metric.key] = metric.value
+    for histogram in metrics.histograms:
+        values[f"{histogram.key}_sum"] = histogram.value.sum
+        values[f"{histogram.key}_count"] = histogram.value.count
+    return values
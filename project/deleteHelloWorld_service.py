@@ -0,0 +1,53 @@
+import prisma
+import prisma.models
+import project.change_notifications
+import project.exceptions
+import project.hello_world_cache
+from pydantic import BaseModel
+
+
+class DeleteHelloWorldRequestModel(BaseModel):
+    """
+    Request model for deleting the 'Hello, World!' message. This endpoint does not require any request parameters.
+    """
+
+    pass
+
+
+class DeleteHelloWorldResponseModel(BaseModel):
+    """
+    Response model confirming the deletion of the 'Hello, World!' message.
+    """
+
+    message: str
+
+
+async def deleteHelloWorld(
+    request: DeleteHelloWorldRequestModel,
+) -> DeleteHelloWorldResponseModel:
+    """
+    This endpoint allows deleting the 'Hello, World!' message. It's a destructive operation and hence restricted to admin users only. After deletion, the GET endpoints will no longer return the message.
+
+    Args:
+        request (DeleteHelloWorldRequestModel): Request model for deleting the 'Hello, World!' message. This endpoint does not require any request parameters.
+
+    Returns:
+        DeleteHelloWorldResponseModel: Response model confirming the deletion of the 'Hello, World!' message.
+
+    Example:
+        request = DeleteHelloWorldRequestModel()
+        response = await deleteHelloWorld(request)
+        > DeleteHelloWorldResponseModel(message="'Hello, World!' message deleted successfully")
+    """
+    hello_world = await prisma.models.HelloWorldModule.prisma().find_first()
+    if hello_world is None:
+        raise project.exceptions.NotFoundError(
+            "No 'Hello, World!' message found to delete."
+        )
+    await prisma.models.HelloWorldModule.prisma().delete(where={"id": hello_world.id})
+    project.hello_world_cache.forget_loads()
+    await project.hello_world_cache.message_cache.load()
+    await project.change_notifications.publish("HelloWorldModule")
+    return DeleteHelloWorldResponseModel(
+        message="'Hello, World!' message deleted successfully"
+    )
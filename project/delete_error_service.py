@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+import project.change_notifications
+import project.error_cache
 from pydantic import BaseModel
 
 
@@ -26,4 +28,6 @@ async def delete_error(id: int) -> DeleteErrorResponseModel:
         > DeleteErrorResponseModel(message='Error message deleted successfully')
     """
     await prisma.models.ErrorHandlingModule.prisma().delete(where={"id": id})
+    project.error_cache.invalidate(id)
+    await project.change_notifications.publish("ErrorHandlingModule", key=id)
     return DeleteErrorResponseModel(message="Error message deleted successfully")
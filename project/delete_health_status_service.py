@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+import project.change_notifications
+import project.exceptions
 from pydantic import BaseModel
 
 
@@ -32,14 +34,17 @@ async def delete_health_status(
         HealthCheckDeleteResponse: Response model for the DELETE /health endpoint, confirming the deletion of the health status entry.
 
     Example:
-        request = HealthCheckDeleteRequest(id=1)
+        request = HealthCheckDeleteRequest()
         response = await delete_health_status(request)
         > HealthCheckDeleteResponse(confirmation_message="Health status with id 1 has been deleted")
     """
-    await prisma.models.HealthCheckModule.prisma().delete(
-        where={"id": request.id}
-    )  # TODO(autogpt): Cannot access attribute "id" for class "HealthCheckDeleteRequest"
-    #     Attribute "id" is unknown. reportAttributeAccessIssue
-    confirmation_message = f"Health status with id {request.id} has been deleted"  # TODO(autogpt): Cannot access attribute "id" for class "HealthCheckDeleteRequest"
-    #     Attribute "id" is unknown. reportAttributeAccessIssue
+    health_check = await prisma.models.HealthCheckModule.prisma().find_first()
+    if health_check is None:
+        raise project.exceptions.NotFoundError(
+            "No health status entry found to delete."
+        )
+    await prisma.models.HealthCheckModule.prisma().delete(where={"id": health_check.id})
+    project.change_notifications.notify_local("HealthCheckModule")
+    await project.change_notifications.publish("HealthCheckModule")
+    confirmation_message = f"Health status with id {health_check.id} has been deleted"
     return HealthCheckDeleteResponse(confirmation_message=confirmation_message)
@@ -0,0 +1,105 @@
+import gzip
+import hashlib
+from typing import Any, Callable, Optional
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class EncodedResponse:
+    """
+    A JSON response body that has already been validated and encoded, together with its strong ETag.
+
+    With `compress`, a gzip-compressed copy of the body is built once up front and served to
+    clients that accept gzip, under its own ETag since it is a different representation.
+    """
+
+    __slots__ = ("body", "etag", "gzip_body", "gzip_etag")
+
+    def __init__(self, body: bytes, compress: bool = False) -> None:
+        self.body = body
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.etag = f'"{digest}"'
+        self.gzip_body = gzip.compress(body, mtime=0) if compress else None
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    @classmethod
+    def from_model(cls, model: BaseModel, compress: bool = False) -> "EncodedResponse":
+        return cls(model.model_dump_json().encode(), compress)
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        Checks an If-None-Match header against this body's ETags.
+
+        If-None-Match uses the weak comparison function, so a `W/` prefix on the client's tag is ignored.
+        """
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/")
+            if tag == "*" or tag == self.etag or tag == self.gzip_etag:
+                return True
+        return False
+
+    def to_response(
+        self, if_none_match: Optional[str] = None, accept_encoding: Optional[str] = None
+    ) -> Response:
+        """
+        Builds the HTTP response, answering 304 Not Modified without a body when the client already has this version.
+
+        The pre-compressed body is sent when there is one and `accept_encoding` allows gzip.
+        """
+        if self.gzip_body is not None and _accepts_gzip(accept_encoding):
+            headers = {
+                "ETag": self.gzip_etag,
+                "Content-Encoding": "gzip",
+                "Vary": "Accept-Encoding",
+            }
+            body = self.gzip_body
+        else:
+            headers = {"ETag": self.etag}
+            if self.gzip_body is not None:
+                headers["Vary"] = "Accept-Encoding"
+            body = self.body
+        if self.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    if not accept_encoding:
+        return False
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip().removeprefix("q=")
+        try:
+            return not params or float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class EncodedResponseCache:
+    """
+    Keeps the encoded response for the most recently seen source value.
+
+    The response model is only built and encoded again when the source value changes, so repeated requests for an unchanged row cost a comparison instead of a validation and JSON encoding pass.
+    """
+
+    def __init__(
+        self, build: Callable[[Any], BaseModel], compress: bool = False
+    ) -> None:
+        self._build = build
+        self._compress = compress
+        self._source: Any = None
+        self._encoded: Optional[EncodedResponse] = None
+
+    def get(self, source: Any) -> EncodedResponse:
+        if self._encoded is None or source != self._source:
+            self._encoded = EncodedResponse.from_model(
+                self._build(source), self._compress
+            )
+            self._source = source
+        return self._encoded
@@ -0,0 +1,49 @@
+import os
+
+import project.cache
+import project.change_notifications
+import project.db
+import project.read_replica
+import project.single_flight
+
+ERROR_CACHE_SIZE = int(os.getenv("ERROR_CACHE_SIZE", "10000"))
+ERROR_CACHE_TTL = float(os.getenv("ERROR_CACHE_TTL", "60"))
+# Missing IDs are cached for a shorter time, since errors written in batches by the ingestion
+# queue do not invalidate the entries of their new IDs.
+ERROR_CACHE_NEGATIVE_TTL = float(os.getenv("ERROR_CACHE_NEGATIVE_TTL", "5"))
+
+# Maps error IDs to their ErrorResponseModel, or to None for IDs that do not exist.
+error_cache: project.cache.LRUCache = project.cache.LRUCache(
+    max_size=ERROR_CACHE_SIZE, ttl=ERROR_CACHE_TTL
+)
+# Single-flight groups of the services reading ErrorHandlingModule rows. Their keys start with
+# the client read from.
+_by_id_flight = project.single_flight.group("error_by_id")
+_list_flights = (
+    project.single_flight.group("error_list"),
+    project.single_flight.group("top_errors"),
+)
+
+
+def invalidate(id: int) -> None:
+    """
+    Drops error `id` from the cache after a write to it, and detaches the in-flight reads that may have missed the write: lookups of that ID and every error listing.
+    """
+    error_cache.invalidate(id)
+    for client in (project.db.db_client, project.read_replica.replica_client):
+        _by_id_flight.forget((client, id))
+    for flight in _list_flights:
+        flight.forget_all()
+
+
+def clear() -> None:
+    """
+    Empties the cache and detaches every in-flight error read, after a write to any number of errors.
+    """
+    error_cache.clear()
+    for flight in (_by_id_flight, *_list_flights):
+        flight.forget_all()
+
+
+# Writes to a single error name its ID and only drop that entry; bulk writes clear the cache.
+project.change_notifications.subscribe("ErrorHandlingModule", clear, invalidate)
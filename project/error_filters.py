@@ -0,0 +1,97 @@
+import os
+from typing import List, Optional, Tuple
+
+import prisma
+import prisma.models
+import prisma.types
+import project.exceptions
+from pydantic import BaseModel
+
+ERROR_BULK_MAX_ROWS = int(os.getenv("ERROR_BULK_MAX_ROWS", "5000"))
+
+
+class ErrorSelectionModel(BaseModel):
+    """
+    Selects the errors a bulk operation applies to, either by explicit IDs or by a filter on error code and ID range.
+    """
+
+    ids: Optional[List[int]] = None
+    code: Optional[int] = None
+    min_id: Optional[int] = None
+    max_id: Optional[int] = None
+
+
+def error_filter(
+    code: Optional[int] = None,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> prisma.types.ErrorHandlingModuleWhereInput:
+    """
+    Builds the ErrorHandlingModule filter shared by the error listing, export and bulk endpoints.
+
+    Args:
+        code (Optional[int]): Only match errors with this error code.
+        min_id (Optional[int]): Only match errors with an ID greater than or equal to this one.
+        max_id (Optional[int]): Only match errors with an ID less than or equal to this one.
+        after_id (Optional[int]): Only match errors with an ID greater than this one, i.e. a keyset pagination cursor.
+
+    Returns:
+        prisma.types.ErrorHandlingModuleWhereInput: The `where` argument for ErrorHandlingModule queries.
+
+    Example:
+        error_filter(code=500, min_id=10)
+        > {'id': {'gte': 10}, 'code': 500}
+    """
+    id_filter: prisma.types.IntFilter = {}
+    if after_id is not None:
+        id_filter["gt"] = after_id
+    if min_id is not None:
+        id_filter["gte"] = min_id
+    if max_id is not None:
+        id_filter["lte"] = max_id
+    where: prisma.types.ErrorHandlingModuleWhereInput = {}
+    if id_filter:
+        where["id"] = id_filter
+    if code is not None:
+        where["code"] = code
+    return where
+
+
+async def bounded_selection(
+    selection: ErrorSelectionModel, limit: int = ERROR_BULK_MAX_ROWS
+) -> Tuple[prisma.types.ErrorHandlingModuleWhereInput, bool]:
+    """
+    Turns a bulk selection into a filter that matches at most `limit` errors, so a single update_many or delete_many statement stays short.
+
+    An ID list longer than `limit` is rejected. A filter matching more than `limit` errors is narrowed to the `limit` lowest IDs by lowering its upper ID bound, found with one index lookup.
+
+    Args:
+        selection (ErrorSelectionModel): The errors to select.
+        limit (int): The maximum number of errors the filter may match.
+
+    Returns:
+        Tuple[prisma.types.ErrorHandlingModuleWhereInput, bool]: The bounded filter, and whether more errors match the selection beyond it.
+    """
+    filters = (selection.code, selection.min_id, selection.max_id)
+    if selection.ids is not None:
+        if any(value is not None for value in filters):
+            raise project.exceptions.BadRequestError(
+                "Select errors either by ids or by filter, not both."
+            )
+        if len(selection.ids) > limit:
+            raise project.exceptions.BadRequestError(
+                f"At most {limit} ids can be changed per request."
+            )
+        return {"id": {"in": selection.ids}}, False
+    if all(value is None for value in filters):
+        raise project.exceptions.BadRequestError(
+            "A bulk operation needs ids or at least one filter."
+        )
+    where = error_filter(selection.code, selection.min_id, selection.max_id)
+    boundary = await prisma.models.ErrorHandlingModule.prisma().find_many(
+        where=where, order={"id": "asc"}, skip=limit - 1, take=2
+    )
+    if len(boundary) < 2:
+        return where, False
+    return error_filter(selection.code, selection.min_id, boundary[0].id), True
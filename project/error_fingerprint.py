@@ -0,0 +1,22 @@
+import hashlib
+import os
+
+ERROR_DEDUP_ENABLED = os.getenv("ERROR_DEDUP_ENABLED", "false").lower() == "true"
+
+
+def fingerprint(code: int, message: str) -> str:
+    """
+    Computes the fingerprint under which repeated errors are counted in a single ErrorHandlingModule row.
+
+    Args:
+        code (int): The error code.
+        message (str): The error message.
+
+    Returns:
+        str: A hex digest identifying the (code, message) pair.
+
+    Example:
+        fingerprint(404, "Not Found")
+        > "0f2c..."
+    """
+    return hashlib.blake2b(f"{code}\0{message}".encode(), digest_size=16).hexdigest()
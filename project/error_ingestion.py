@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import os
+import random
+from collections import Counter, deque
+from enum import Enum
+from typing import Deque, List, Optional, Tuple
+
+import prisma
+import prisma.models
+import project.error_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    """
+    What the ingestion queue does with new errors once it is full.
+
+    DROP discards them. SAMPLE keeps only a random ERROR_INGESTION_SAMPLE_RATE fraction once the
+    queue is half full and discards them when it is full. BLOCK makes `submit` wait for room.
+    """
+
+    DROP = "drop"
+    SAMPLE = "sample"
+    BLOCK = "block"
+
+
+ERROR_INGESTION_BATCH_SIZE = int(os.getenv("ERROR_INGESTION_BATCH_SIZE", "500"))
+ERROR_INGESTION_FLUSH_INTERVAL = float(
+    os.getenv("ERROR_INGESTION_FLUSH_INTERVAL", "1.0")
+)
+ERROR_INGESTION_MAX_PENDING = int(os.getenv("ERROR_INGESTION_MAX_PENDING", "10000"))
+ERROR_INGESTION_OVERFLOW_POLICY = OverflowPolicy(
+    os.getenv("ERROR_INGESTION_OVERFLOW_POLICY", "drop").lower()
+)
+ERROR_INGESTION_SAMPLE_RATE = float(os.getenv("ERROR_INGESTION_SAMPLE_RATE", "0.1"))
+
+
+class ErrorIngestionQueue:
+    """
+    Buffers logged errors in memory and writes them to the ErrorHandlingModule table in batches.
+
+    A batch is flushed with a single `create_many` once `batch_size` errors are pending or
+    `flush_interval` seconds have passed, whichever comes first. At most `max_pending` errors are
+    held; what happens beyond that is decided by the overflow policy. A batch that fails to write is
+    put back at the front of the queue and retried on the next flush.
+
+    Deduplicated errors are counted per fingerprint within the batch and upserted with one
+    INSERT ... ON CONFLICT statement, so a burst of identical errors costs a single row update.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = ERROR_INGESTION_BATCH_SIZE,
+        flush_interval: float = ERROR_INGESTION_FLUSH_INTERVAL,
+        max_pending: int = ERROR_INGESTION_MAX_PENDING,
+        overflow_policy: OverflowPolicy = ERROR_INGESTION_OVERFLOW_POLICY,
+        sample_rate: float = ERROR_INGESTION_SAMPLE_RATE,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.accepted = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+        self._pending: Deque[Tuple[int, str, bool]] = deque()
+        self._batch_ready = asyncio.Event()
+        self._space_available = asyncio.Event()
+        self._space_available.set()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit_nowait(self, code: int, message: str, dedup: bool = False) -> bool:
+        """
+        Queues an error without waiting. Under the BLOCK policy a full queue drops the error, because
+        this method cannot wait for room.
+
+        Returns:
+            bool: Whether the error was queued.
+        """
+        if not self._has_room():
+            self.dropped += 1
+            return False
+        self._pending.append((code, message, dedup))
+        self.accepted += 1
+        if len(self._pending) >= self.batch_size:
+            self._batch_ready.set()
+        if len(self._pending) >= self.max_pending:
+            self._space_available.clear()
+        return True
+
+    async def submit(self, code: int, message: str, dedup: bool = False) -> bool:
+        """
+        Queues an error, waiting for room under the BLOCK policy.
+
+        Returns:
+            bool: Whether the error was queued.
+        """
+        if self.overflow_policy is OverflowPolicy.BLOCK:
+            while len(self._pending) >= self.max_pending:
+                await self._space_available.wait()
+        return self.submit_nowait(code, message, dedup)
+
+    def _has_room(self) -> bool:
+        pending = len(self._pending)
+        if pending >= self.max_pending:
+            return False
+        if (
+            self.overflow_policy is OverflowPolicy.SAMPLE
+            and pending >= self.max_pending // 2
+        ):
+            return random.random() < self.sample_rate
+        return True
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background flusher and writes out every error still queued.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            if not await self.flush():
+                logger.error(
+                    "Dropping %d queued errors that could not be written on shutdown",
+                    len(self._pending),
+                )
+                self.dropped += len(self._pending)
+                self._pending.clear()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.flush_interval):
+                    await self._batch_ready.wait()
+            except TimeoutError:
+                pass
+            while self._pending:
+                if not await self.flush():
+                    # Back off instead of retrying in a tight loop while the database is down.
+                    await asyncio.sleep(self.flush_interval)
+                    break
+                if len(self._pending) < self.batch_size:
+                    break
+
+    async def flush(self) -> bool:
+        """
+        Writes up to one batch of queued errors with a single `create_many`.
+
+        Returns:
+            bool: False if the write failed and the batch was put back in the queue.
+        """
+        async with self._flush_lock:
+            batch: List[Tuple[int, str, bool]] = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popleft())
+            if len(self._pending) < self.batch_size:
+                self._batch_ready.clear()
+            self._space_available.set()
+            if not batch:
+                return True
+            try:
+                await _write_batch(batch)
+            except Exception:
+                logger.exception("Failed to write a batch of %d errors", len(batch))
+                self.failed_flushes += 1
+                self._requeue(batch)
+                return False
+            self.flushed += len(batch)
+            return True
+
+    def _requeue(self, batch: List[Tuple[int, str, bool]]) -> None:
+        # Errors submitted while the batch was being written may have filled the queue; keep the
+        # older errors from the batch and drop what no longer fits.
+        room = max(self.max_pending - len(self._pending), 0)
+        self.dropped += max(len(batch) - room, 0)
+        self._pending.extendleft(reversed(batch[:room]))
+        if len(self._pending) >= self.max_pending:
+            self._space_available.clear()
+
+
+async def _write_batch(batch: List[Tuple[int, str, bool]]) -> None:
+    rows = [(code, message) for code, message, dedup in batch if not dedup]
+    if rows:
+        await prisma.models.ErrorHandlingModule.prisma().create_many(
+            data=[
+                {"errorMessage": message, "resolution": "", "code": code}
+                for code, message in rows
+            ]
+        )
+    repeats = Counter((code, message) for code, message, dedup in batch if dedup)
+    if repeats:
+        await prisma.get_client().execute_raw(
+            """
+            INSERT INTO "ErrorHandlingModule"
+                ("errorMessage", "resolution", "code", "fingerprint", "occurrences")
+            SELECT message, '', code, fingerprint, occurrences
+            FROM unnest($1::text[], $2::int[], $3::text[], $4::int[])
+                AS batch (message, code, fingerprint, occurrences)
+            ON CONFLICT ("fingerprint") DO UPDATE SET
+                "occurrences" = "ErrorHandlingModule"."occurrences" + EXCLUDED."occurrences",
+                "lastSeen" = now()
+            """,
+            [message for _, message in repeats],
+            [code for code, _ in repeats],
+            [
+                project.error_fingerprint.fingerprint(code, message)
+                for code, message in repeats
+            ],
+            list(repeats.values()),
+        )
+
+
+error_queue = ErrorIngestionQueue()
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import List, Optional
+
+import prisma
+import prisma.models
+import prisma.types
+import project.change_notifications
+import project.error_cache
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionMode(str, Enum):
+    """
+    What the retention job does with the errors it removes from ErrorHandlingModule.
+
+    DELETE drops them. ARCHIVE copies them into ErrorHandlingArchiveModule in the same transaction
+    as the delete.
+    """
+
+    DELETE = "delete"
+    ARCHIVE = "archive"
+
+
+ERROR_RETENTION_MAX_AGE_DAYS = float(os.getenv("ERROR_RETENTION_MAX_AGE_DAYS", "0"))
+ERROR_RETENTION_MAX_AGE = (
+    timedelta(days=ERROR_RETENTION_MAX_AGE_DAYS)
+    if ERROR_RETENTION_MAX_AGE_DAYS > 0
+    else None
+)
+ERROR_RETENTION_MAX_ROWS = int(os.getenv("ERROR_RETENTION_MAX_ROWS", "0"))
+ERROR_RETENTION_MODE = RetentionMode(
+    os.getenv("ERROR_RETENTION_MODE", "delete").lower()
+)
+ERROR_RETENTION_INTERVAL = float(os.getenv("ERROR_RETENTION_INTERVAL", "3600"))
+ERROR_RETENTION_BATCH_SIZE = int(os.getenv("ERROR_RETENTION_BATCH_SIZE", "1000"))
+ERROR_RETENTION_BATCH_PAUSE = float(os.getenv("ERROR_RETENTION_BATCH_PAUSE", "0.05"))
+
+
+class RetentionReport(BaseModel):
+    """
+    The outcome of one retention run over the ErrorHandlingModule table.
+    """
+
+    rows_removed: int
+    rows_archived: int
+    batches: int
+    duration_ms: float
+
+
+class ErrorRetentionJob:
+    """
+    Keeps the ErrorHandlingModule table bounded by age and by row count.
+
+    Errors last seen more than `max_age` ago are removed first. If more than `max_rows` errors
+    remain, the oldest are removed until the cap is met. Rows are removed in batches of at most
+    `batch_size` ids, each in its own short statement or transaction, with a pause between
+    batches, so the job never holds locks on large parts of the table. A limit of zero disables
+    that rule.
+    """
+
+    def __init__(
+        self,
+        max_age: Optional[timedelta] = ERROR_RETENTION_MAX_AGE,
+        max_rows: int = ERROR_RETENTION_MAX_ROWS,
+        mode: RetentionMode = ERROR_RETENTION_MODE,
+        interval: float = ERROR_RETENTION_INTERVAL,
+        batch_size: int = ERROR_RETENTION_BATCH_SIZE,
+        batch_pause: float = ERROR_RETENTION_BATCH_PAUSE,
+    ) -> None:
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self.mode = mode
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.last_report: Optional[RetentionReport] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age is not None or self.max_rows > 0
+
+    def start(self) -> None:
+        if self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error retention run failed")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> RetentionReport:
+        """
+        Applies the age and row-count limits once. Concurrent calls run one after the other.
+
+        Returns:
+            RetentionReport: The rows removed and archived, the number of batches and the time spent.
+        """
+        async with self._lock:
+            started = time.perf_counter()
+            removed = archived = batches = 0
+            if self.max_age is not None:
+                cutoff = datetime.now(timezone.utc) - self.max_age
+                while True:
+                    count = await self._remove_batch(
+                        {"lastSeen": {"lt": cutoff}}, "lastSeen", self.batch_size
+                    )
+                    if count == 0:
+                        break
+                    removed += count
+                    batches += 1
+                    await asyncio.sleep(self.batch_pause)
+            if self.max_rows > 0:
+                excess = (
+                    await prisma.models.ErrorHandlingModule.prisma().count()
+                    - self.max_rows
+                )
+                while excess > 0:
+                    count = await self._remove_batch(
+                        {}, "id", min(excess, self.batch_size)
+                    )
+                    if count == 0:
+                        break
+                    removed += count
+                    excess -= count
+                    batches += 1
+                    await asyncio.sleep(self.batch_pause)
+            if self.mode is RetentionMode.ARCHIVE:
+                archived = removed
+            if removed:
+                project.error_cache.clear()
+                await project.change_notifications.publish("ErrorHandlingModule")
+            report = RetentionReport(
+                rows_removed=removed,
+                rows_archived=archived,
+                batches=batches,
+                duration_ms=(time.perf_counter() - started) * 1000,
+            )
+            self.last_report = report
+            logger.info(
+                "Error retention removed %d rows (%d archived) in %d batches in %.0fms",
+                report.rows_removed,
+                report.rows_archived,
+                report.batches,
+                report.duration_ms,
+            )
+            return report
+
+    async def _remove_batch(
+        self,
+        where: prisma.types.ErrorHandlingModuleWhereInput,
+        oldest_by: str,
+        take: int,
+    ) -> int:
+        """
+        Removes up to `take` errors matching `where`, oldest by the `oldest_by` column first.
+
+        Returns:
+            int: The number of rows removed.
+        """
+        if self.mode is RetentionMode.ARCHIVE:
+            async with prisma.get_client().tx() as transaction:
+                return await _archive_and_delete(transaction, where, oldest_by, take)
+        rows = await prisma.models.ErrorHandlingModule.prisma().find_many(
+            where=where, order={oldest_by: "asc"}, take=take
+        )
+        if not rows:
+            return 0
+        return await prisma.models.ErrorHandlingModule.prisma().delete_many(
+            where={"id": {"in": [row.id for row in rows]}}
+        )
+
+
+async def _archive_and_delete(
+    transaction: prisma.Prisma,
+    where: prisma.types.ErrorHandlingModuleWhereInput,
+    oldest_by: str,
+    take: int,
+) -> int:
+    rows: List[prisma.models.ErrorHandlingModule] = (
+        await prisma.models.ErrorHandlingModule.prisma(transaction).find_many(
+            where=where, order={oldest_by: "asc"}, take=take
+        )
+    )
+    if not rows:
+        return 0
+    await prisma.models.ErrorHandlingArchiveModule.prisma(transaction).create_many(
+        data=[
+            {
+                "id": row.id,
+                "errorMessage": row.errorMessage,
+                "resolution": row.resolution,
+                "code": row.code,
+                "fingerprint": row.fingerprint,
+                "occurrences": row.occurrences,
+                "firstSeen": row.firstSeen,
+                "lastSeen": row.lastSeen,
+            }
+            for row in rows
+        ],
+        skip_duplicates=True,
+    )
+    return await prisma.models.ErrorHandlingModule.prisma(transaction).delete_many(
+        where={"id": {"in": [row.id for row in rows]}}
+    )
+
+
+retention_job = ErrorRetentionJob()
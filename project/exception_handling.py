@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Coroutine, Dict, Tuple, Type
+
+import prisma.engine.errors
+import prisma.errors
+import project.cache
+import project.exceptions
+import project.fast_json
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Within this many seconds, only the first failure with a given fingerprint is logged with its
+# traceback; the rest are counted and reported with the next logged one.
+EXCEPTION_LOG_INTERVAL = float(os.getenv("EXCEPTION_LOG_INTERVAL", "60"))
+EXCEPTION_LOG_MAX_FINGERPRINTS = int(
+    os.getenv("EXCEPTION_LOG_MAX_FINGERPRINTS", "1024")
+)
+
+# Checked in order; the first matching class decides the status code. Anything else is a 500.
+EXCEPTION_STATUS_CODES: Tuple[Tuple[Type[BaseException], int], ...] = (
+    (project.exceptions.NotFoundError, 404),
+    (project.exceptions.BadRequestError, 400),
+    (prisma.errors.RecordNotFoundError, 404),
+    (prisma.errors.UniqueViolationError, 409),
+    (prisma.errors.ForeignKeyViolationError, 409),
+    (prisma.errors.MissingRequiredValueError, 400),
+    (prisma.errors.InputError, 400),
+    (prisma.errors.ClientNotConnectedError, 503),
+    (prisma.engine.errors.NotConnectedError, 503),
+    (prisma.engine.errors.EngineConnectionError, 503),
+    (TimeoutError, 503),
+)
+
+Fingerprint = Tuple[str, str, int, str]
+
+
+def status_code_for(exc: Exception) -> int:
+    for exception_type, status_code in EXCEPTION_STATUS_CODES:
+        if isinstance(exc, exception_type):
+            return status_code
+    return 500
+
+
+def fingerprint(exc: BaseException, route: str) -> Fingerprint:
+    """
+    Identifies a failure by exception type, the line that raised it and the route it was raised in.
+    """
+    tb = exc.__traceback__
+    while tb is not None and tb.tb_next is not None:
+        tb = tb.tb_next
+    if tb is None:
+        return (type(exc).__qualname__, "", 0, route)
+    return (
+        type(exc).__qualname__,
+        tb.tb_frame.f_code.co_filename,
+        tb.tb_lineno,
+        route,
+    )
+
+
+class ExceptionLogSampler:
+    """
+    Decides which failures get their traceback logged.
+
+    The first failure of each fingerprint is logged, then at most one per `interval` seconds; the
+    ones in between are only counted. At most `max_fingerprints` fingerprints are tracked, the
+    least recently seen being forgotten first.
+    """
+
+    def __init__(
+        self,
+        interval: float = EXCEPTION_LOG_INTERVAL,
+        max_fingerprints: int = EXCEPTION_LOG_MAX_FINGERPRINTS,
+    ) -> None:
+        self.interval = interval
+        self.max_fingerprints = max_fingerprints
+        self.logged = 0
+        self.suppressed = 0
+        # Fingerprint -> [when it was last logged, failures suppressed since].
+        self._seen: "OrderedDict[Fingerprint, list]" = OrderedDict()
+
+    def sample(self, key: Fingerprint) -> Tuple[bool, int]:
+        """
+        Returns:
+            Tuple[bool, int]: Whether to log this failure, and how many were suppressed since the fingerprint was last logged.
+        """
+        now = time.monotonic()
+        entry = self._seen.get(key)
+        if entry is not None:
+            self._seen.move_to_end(key)
+            if now - entry[0] < self.interval:
+                entry[1] += 1
+                self.suppressed += 1
+                return False, 0
+            suppressed, entry[0], entry[1] = entry[1], now, 0
+        else:
+            suppressed = 0
+            self._seen[key] = [now, 0]
+            if len(self._seen) > self.max_fingerprints:
+                self._seen.popitem(last=False)
+        self.logged += 1
+        return True, suppressed
+
+
+sampler = ExceptionLogSampler()
+
+status_counts: Counter = Counter()
+
+# Error bodies by (status code, message), so that a burst of identical failures is encoded once.
+_encoded_bodies: project.cache.LRUCache[Tuple[int, str], bytes] = (
+    project.cache.LRUCache(max_size=1024, ttl=float("inf"))
+)
+
+
+def _encoded_body(status_code: int, message: str) -> bytes:
+    body = _encoded_bodies.get((status_code, message))
+    if body is project.cache.MISS:
+        body = json.dumps({"error": message}).encode()
+        _encoded_bodies.put((status_code, message), body)
+    return body
+
+
+def error_response(exc: Exception, route: str) -> Response:
+    """
+    Turns an exception raised by a service into a JSON error response.
+
+    Server errors are logged with their traceback, sampled per fingerprint; client errors are
+    expected and not logged.
+    """
+    status_code = status_code_for(exc)
+    status_counts[status_code] += 1
+    if status_code >= 500:
+        log, suppressed = sampler.sample(fingerprint(exc, route))
+        if log:
+            logger.error(
+                "Error processing request to %s (%d similar errors suppressed since last logged)",
+                route,
+                suppressed,
+                exc_info=exc,
+            )
+    return Response(
+        content=_encoded_body(status_code, str(exc)),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def exception_stats() -> Dict[str, int]:
+    return {
+        "logged": sampler.logged,
+        "suppressed": sampler.suppressed,
+        **{f"status_{code}": count for code, count in sorted(status_counts.items())},
+    }
+
+
+class ServiceRoute(APIRoute):
+    """
+    An APIRoute whose handler turns service exceptions into error responses.
+
+    FastAPI's own exceptions, such as HTTPException and request validation errors, are left to its
+    exception handlers. Endpoints are wrapped with `project.fast_json.fast_endpoint`, so their
+    responses take the fast JSON path when FAST_JSON_RESPONSES is set.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        status_code = kwargs.get("status_code") or 200
+        super().__init__(
+            path, project.fast_json.fast_endpoint(endpoint, status_code), **kwargs
+        )
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except (HTTPException, RequestValidationError):
+                raise
+            except Exception as exc:
+                return error_response(exc, route)
+
+        return route_handler
@@ -0,0 +1,12 @@
+class NotFoundError(ValueError):
+    """
+    Raised by services when the entry a request refers to does not exist.
+
+    It subclasses ValueError, so callers that treat every invalid request alike keep working.
+    """
+
+
+class BadRequestError(ValueError):
+    """
+    Raised by services when a request's arguments are invalid, e.g. a limit out of range.
+    """
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import os
+import zlib
+from enum import Enum
+from typing import AsyncIterator, List, Optional
+
+import prisma
+import prisma.models
+import project.error_filters
+import project.read_replica
+
+ERROR_EXPORT_CHUNK_SIZE = int(os.getenv("ERROR_EXPORT_CHUNK_SIZE", "1000"))
+
+EXPORT_COLUMNS = [
+    "id",
+    "code",
+    "errorMessage",
+    "resolution",
+    "fingerprint",
+    "occurrences",
+    "firstSeen",
+    "lastSeen",
+]
+
+
+class ExportFormat(str, Enum):
+    """
+    The file formats the error export can be streamed in.
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _row(error: prisma.models.ErrorHandlingModule) -> List[object]:
+    return [
+        error.id,
+        error.code,
+        error.errorMessage,
+        error.resolution,
+        error.fingerprint,
+        error.occurrences,
+        error.firstSeen.isoformat(),
+        error.lastSeen.isoformat(),
+    ]
+
+
+def _encode(
+    format: ExportFormat, errors: List[prisma.models.ErrorHandlingModule]
+) -> bytes:
+    if format is ExportFormat.NDJSON:
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, _row(error)))) + "\n"
+            for error in errors
+        ).encode()
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(_row(error) for error in errors)
+    return buffer.getvalue().encode()
+
+
+def _csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue().encode()
+
+
+async def export_errors(
+    format: ExportFormat = ExportFormat.NDJSON,
+    compress: bool = False,
+    code: Optional[int] = None,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    This endpoint streams every error recorded by the ErrorHandlingModule, optionally filtered by code and ID range, as NDJSON or CSV. Errors are read in keyset-paginated chunks of ERROR_EXPORT_CHUNK_SIZE rows and each chunk is sent as soon as it is encoded, so server memory stays flat however large the table is.
+
+    Args:
+        format (ExportFormat): The file format, NDJSON (one JSON object per line) or CSV with a header row.
+        compress (bool): Whether to gzip the stream on the fly. Each chunk is flushed through the compressor so clients receive data immediately.
+        code (Optional[int]): Only export errors with this error code.
+        min_id (Optional[int]): Only export errors with an ID greater than or equal to this one.
+        max_id (Optional[int]): Only export errors with an ID less than or equal to this one.
+
+    Returns:
+        AsyncIterator[bytes]: The encoded (and possibly compressed) export, chunk by chunk.
+
+    Example:
+        async for chunk in export_errors(ExportFormat.CSV):
+            output.write(chunk)
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def output(data: bytes) -> bytes:
+        if compressor is None:
+            return data
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    if format is ExportFormat.CSV:
+        yield output(_csv_header())
+    client = project.read_replica.read_client()
+    after_id: Optional[int] = None
+    while True:
+        errors = await prisma.models.ErrorHandlingModule.prisma(client).find_many(
+            where=project.error_filters.error_filter(
+                code, min_id, max_id, after_id=after_id
+            ),
+            order={"id": "asc"},
+            take=ERROR_EXPORT_CHUNK_SIZE,
+        )
+        if not errors:
+            break
+        yield output(_encode(format, errors))
+        after_id = errors[-1].id
+        if len(errors) < ERROR_EXPORT_CHUNK_SIZE:
+            break
+    if compressor is not None:
+        yield compressor.flush()
@@ -0,0 +1,56 @@
+import functools
+import os
+from typing import Any, Callable, Coroutine
+
+import pydantic_core
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Skip FastAPI's response_model validation and encoding for responses the services return as
+# pydantic models, and encode them straight to JSON bytes instead.
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+
+def encode(content: Any) -> bytes:
+    """
+    Encodes a service result to JSON bytes: pydantic models with pydantic-core's serializer, anything else with orjson (or pydantic-core if orjson is not installed).
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content)
+    return pydantic_core.to_json(content)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode(content)
+
+
+def fast_endpoint(
+    endpoint: Callable[..., Coroutine[Any, Any, Any]], status_code: int = 200
+) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """
+    Wraps a route handler so that, while FAST_JSON_RESPONSES is set, a pydantic model it returns is sent as a FastJSONResponse.
+
+    FastAPI sends a returned Response as it is, so the model is not validated against the route's
+    response_model a second time nor run through jsonable_encoder. The services build their
+    response models themselves, which is where the data is validated. The wrapper keeps the
+    handler's signature, so request parsing and the OpenAPI schema are unchanged.
+    """
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        res = await endpoint(*args, **kwargs)
+        if FAST_JSON_RESPONSES and isinstance(res, BaseModel):
+            return FastJSONResponse(res, status_code=status_code)
+        return res
+
+    return wrapper
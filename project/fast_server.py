@@ -0,0 +1,158 @@
+import asyncio
+import importlib
+import json
+import logging
+import os
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional
+
+import project.startup_profiler
+
+logger = logging.getLogger(__name__)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+# Seconds a request may wait for the app to finish loading before it is answered with 503.
+FAST_STARTUP_WAIT_TIMEOUT = float(os.getenv("FAST_STARTUP_WAIT_TIMEOUT", "30"))
+
+profiler: Optional[project.startup_profiler.StartupProfiler] = None
+if project.startup_profiler.STARTUP_PROFILE:
+    profiler = project.startup_profiler.StartupProfiler()
+    profiler.install()
+
+
+async def _send_json(send: Send, status: int, body: Dict[str, Any]) -> None:
+    encoded = json.dumps(body).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(encoded)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": encoded})
+
+
+class LazyApp:
+    """
+    An ASGI entry point that lets the server bind its socket before the app is imported.
+
+    Importing `project.server` pulls in every service module, their pydantic models and the
+    generated Prisma client. Here that import, and the app's own lifespan start-up, run in a
+    background task as soon as the server starts; the server's lifespan start-up completes at
+    once, so it binds and accepts connections straight away. Liveness probes are answered
+    without the app; every other request waits until the app has loaded, or gets a 503 if it
+    takes longer than FAST_STARTUP_WAIT_TIMEOUT or fails to load. Once loading has failed the
+    liveness probe gets a 503 too.
+    """
+
+    def __init__(self, target: str = "project.server") -> None:
+        self.target = target
+        self.app: Any = None
+        self.error: Optional[BaseException] = None
+        self._loading: Optional[asyncio.Task] = None
+        self._stack = AsyncExitStack()
+        self._first_request = True
+
+    async def _load(self) -> None:
+        try:
+            # The import is CPU-bound; running it in a thread keeps the event loop free to answer
+            # liveness probes meanwhile.
+            server = await asyncio.to_thread(importlib.import_module, self.target)
+            if profiler is not None:
+                profiler.mark("app_imported")
+            await self._stack.enter_async_context(server.lifespan(server.app))
+            self.app = server.app
+            if profiler is not None:
+                profiler.mark("app_started")
+            logger.info("%s loaded and started", self.target)
+        except Exception as exc:
+            self.error = exc
+            logger.exception("Failed to load %s", self.target)
+
+    def start(self) -> None:
+        if self._loading is None:
+            self._loading = asyncio.create_task(self._load())
+
+    async def ready(self) -> Any:
+        """
+        Returns the loaded app, waiting for it to finish loading if needed, or None if it could not be loaded in time.
+        """
+        if self.app is not None:
+            return self.app
+        self.start()
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._loading), FAST_STARTUP_WAIT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            return None
+        return self.app
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._loading is not None:
+                    await self._loading
+                try:
+                    await self._stack.aclose()
+                except Exception as exc:
+                    await send(
+                        {"type": "lifespan.shutdown.failed", "message": str(exc)}
+                    )
+                else:
+                    await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if self.app is None:
+            if scope["type"] == "http" and scope["path"] == "/health/live":
+                # An app that failed to load never recovers, so the process is reported dead
+                # and the orchestrator restarts it.
+                if self.error is not None:
+                    await _send_json(
+                        send, 503, {"detail": "The application failed to start."}
+                    )
+                else:
+                    await _send_json(send, 200, {"status": "ok"})
+                return
+            if await self.ready() is None:
+                if scope["type"] == "http":
+                    await _send_json(
+                        send,
+                        503,
+                        (
+                            {"detail": "The application is still starting up."}
+                            if self.error is None
+                            else {"detail": "The application failed to start."}
+                        ),
+                    )
+                return
+        if not self._first_request:
+            await self.app(scope, receive, send)
+            return
+        self._first_request = False
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if profiler is not None:
+                profiler.mark("first_request_served")
+                profiler.finish()
+
+
+app = LazyApp()
+if profiler is not None:
+    profiler.mark("entry_point_loaded")
@@ -1,7 +1,23 @@
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
 import prisma
-import prisma.enums
 import prisma.models
+import project.cache
+import project.change_notifications
+import project.encoded_response
+import project.read_replica
+import project.single_flight
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
+from starlette.routing import BaseRoute
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTATION_CACHE_TTL = float(os.getenv("DOCUMENTATION_CACHE_TTL", "300"))
+
+_flight = project.single_flight.group("documentation_overrides")
 
 
 class GetApiDocsRequest(BaseModel):
@@ -12,40 +28,132 @@ class GetApiDocsRequest(BaseModel):
     pass
 
 
-class GetApiDocsResponse(BaseModel):
+class EndpointDocumentation(BaseModel):
     """
-    This response provides the documentation details for the 'Hello, World!' API endpoint, including the endpoint, method, and description.
+    The documentation of one API endpoint: its path, HTTP method and description.
     """
 
-    id: int
+    id: Optional[int] = None
     endpoint: str
-    method: prisma.enums.HttpMethod
+    method: str
     description: str
 
 
+class GetApiDocsResponse(BaseModel):
+    """
+    This response provides the documentation details of every API endpoint, including the endpoint, method, and description.
+    """
+
+    endpoints: List[EndpointDocumentation]
+
+
+# Documentation generated from the application's route table; set by register_routes at startup.
+_route_documentation: List[EndpointDocumentation] = []
+
+
+def register_routes(routes: Iterable[BaseRoute]) -> None:
+    """
+    Builds the documentation of every API route from its path, methods and docstring.
+
+    Called once at startup with `app.routes`. Routes excluded from the OpenAPI schema, such as
+    FastAPI's own /docs pages, are left out.
+
+    Args:
+    routes (Iterable[BaseRoute]): The application's routes.
+    """
+    global _route_documentation
+    _route_documentation = sorted(
+        (
+            EndpointDocumentation(
+                endpoint=route.path,
+                method=method,
+                description=route.description,
+            )
+            for route in routes
+            if isinstance(route, APIRoute) and route.include_in_schema
+            for method in route.methods
+        ),
+        key=lambda doc: (doc.endpoint, doc.method),
+    )
+    documentation_cache.invalidate()
+
+
 async def getDocumentation(request: GetApiDocsRequest) -> GetApiDocsResponse:
     """
     This endpoint provides the documentation for the 'Hello, World!' API.
-    It interacts with the HelloWorldModule to fetch endpoint details and returns them in a structured format.
+    It lists every endpoint of the application with its method and description, generated from the route table at startup and merged with the DocumentationModule overrides.
     It's designed to be publicly accessible, allowing users and developers to understand how to interact with the API.
 
     Args:
     request (GetApiDocsRequest): This request doesn't require any parameters as it serves static documentation for the 'Hello, World!' endpoint.
 
     Returns:
-    GetApiDocsResponse: This response provides the documentation details for the 'Hello, World!' API endpoint, including the endpoint, method, and description.
+    GetApiDocsResponse: This response provides the documentation details of every API endpoint, including the endpoint, method, and description.
 
     Example:
         request = GetApiDocsRequest()
         response = await getDocumentation(request)
-        > GetApiDocsResponse(id=1, endpoint='/hello', method='GET', description='Returns Hello, World message')
-    """
-    documentation_entry = await prisma.models.DocumentationModule.prisma().find_first()
-    if not documentation_entry:
-        raise ValueError("No documentation entry found.")
-    return GetApiDocsResponse(
-        id=documentation_entry.id,
-        endpoint=documentation_entry.endpoint,
-        method=documentation_entry.method,
-        description=documentation_entry.description,
-    )
+        > GetApiDocsResponse(endpoints=[EndpointDocumentation(id=None, endpoint='/helloworld', method='GET', description='...'), ...])
+    """
+    return await documentation_cache.get()
+
+
+async def getDocumentationEncoded(
+    request: GetApiDocsRequest,
+) -> project.encoded_response.EncodedResponse:
+    """
+    Same as getDocumentation, but returns the pre-encoded and pre-compressed response body and its ETag. The body is only re-encoded when the documentation changes.
+
+    Args:
+    request (GetApiDocsRequest): This request doesn't require any parameters as it serves static documentation for the 'Hello, World!' endpoint.
+
+    Returns:
+    project.encoded_response.EncodedResponse: The encoded GetApiDocsResponse body, its gzip-compressed copy and their ETags.
+    """
+    return _encoded_responses.get(await getDocumentation(request))
+
+
+async def load_documentation() -> GetApiDocsResponse:
+    """
+    Merges the route documentation with the entries of the DocumentationModule table.
+
+    An entry for an existing endpoint and method replaces its generated description; entries for
+    other endpoints are added. If the overrides cannot be read, the generated documentation is
+    served on its own.
+
+    Returns:
+    GetApiDocsResponse: The documentation of every endpoint, sorted by path and method.
+    """
+    endpoints: Dict[Tuple[str, str], EndpointDocumentation] = {
+        (doc.endpoint, doc.method): doc for doc in _route_documentation
+    }
+    client = project.read_replica.read_client("DocumentationModule")
+    try:
+        overrides = await _flight.do(
+            client, lambda: prisma.models.DocumentationModule.prisma(client).find_many()
+        )
+    except Exception:
+        logger.exception("Failed to load documentation overrides")
+        overrides = []
+    for override in overrides:
+        method = override.method.value
+        endpoints[(override.endpoint, method)] = EndpointDocumentation(
+            id=override.id,
+            endpoint=override.endpoint,
+            method=method,
+            description=override.description,
+        )
+    return GetApiDocsResponse(endpoints=[endpoints[key] for key in sorted(endpoints)])
+
+
+documentation_cache: project.cache.CachedValue[GetApiDocsResponse] = (
+    project.cache.CachedValue(load_documentation, ttl=DOCUMENTATION_CACHE_TTL)
+)
+project.change_notifications.subscribe("DocumentationModule", _flight.forget_all)
+project.change_notifications.subscribe(
+    "DocumentationModule", documentation_cache.invalidate
+)
+
+_encoded_responses = project.encoded_response.EncodedResponseCache(
+    lambda documentation: documentation, compress=True
+)
@@ -1,5 +1,5 @@
-import prisma
-import prisma.models
+import project.encoded_response
+import project.hello_world_cache
 from pydantic import BaseModel
 
 
@@ -35,8 +35,26 @@ async def getHelloWorldJson(request: HelloWorldRequest) -> HelloWorldResponse:
         response = await getHelloWorldJson(request)
         assert response.message == 'Hello, World!'
     """
-    hello_world_module = await prisma.models.HelloWorldModule.prisma().find_first()
-    response_message = (
-        hello_world_module.message if hello_world_module else "Hello, World!"
-    )
+    response_message = await project.hello_world_cache.message_cache.get()
     return HelloWorldResponse(message=response_message)
+
+
+_encoded_responses = project.encoded_response.EncodedResponseCache(
+    lambda message: HelloWorldResponse(message=message)
+)
+
+
+async def getHelloWorldJsonEncoded(
+    request: HelloWorldRequest,
+) -> project.encoded_response.EncodedResponse:
+    """
+    Same as getHelloWorldJson, but returns the pre-encoded response body and its ETag. The body is only re-encoded when the stored message changes.
+
+    Args:
+    request (HelloWorldRequest): Request model for the 'Hello, World!' endpoint. This endpoint does not require any request parameters.
+
+    Returns:
+    project.encoded_response.EncodedResponse: The encoded HelloWorldResponse body and its ETag.
+    """
+    message = await project.hello_world_cache.message_cache.get()
+    return _encoded_responses.get(message)
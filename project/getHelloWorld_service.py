@@ -1,7 +1,5 @@
-from typing import Optional
-
-import prisma
-import prisma.models
+import project.encoded_response
+import project.hello_world_cache
 from pydantic import BaseModel
 
 
@@ -36,12 +34,27 @@ async def getHelloWorld(request: HelloWorldRequestModel) -> HelloWorldResponseMo
     response = getHelloWorld(request)
     print(response.message)  # 'Hello, World!'
     """
-    hello_world_module: Optional[
-        prisma.models.HelloWorldModule
-    ] = await prisma.models.HelloWorldModule.prisma().find_first()
-    if hello_world_module is None:
-        message = "Hello, World!"
-    else:
-        message = hello_world_module.message
+    message = await project.hello_world_cache.message_cache.get()
     response = HelloWorldResponseModel(message=message)
     return response
+
+
+_encoded_responses = project.encoded_response.EncodedResponseCache(
+    lambda message: HelloWorldResponseModel(message=message)
+)
+
+
+async def getHelloWorldEncoded(
+    request: HelloWorldRequestModel,
+) -> project.encoded_response.EncodedResponse:
+    """
+    Same as getHelloWorld, but returns the pre-encoded response body and its ETag. The body is only re-encoded when the stored message changes.
+
+    Args:
+    request (HelloWorldRequestModel): The request model for the HelloWorld endpoint has no parameters as it just returns a 'Hello, World!' message.
+
+    Returns:
+    project.encoded_response.EncodedResponse: The encoded HelloWorldResponseModel body and its ETag.
+    """
+    message = await project.hello_world_cache.message_cache.get()
+    return _encoded_responses.get(message)
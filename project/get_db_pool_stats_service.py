@@ -0,0 +1,59 @@
+from typing import Optional
+
+import project.db
+from pydantic import BaseModel
+
+
+class DbPoolStatsResponseModel(BaseModel):
+    """
+    Response model describing how busy this worker's database connection pool is.
+    """
+
+    connection_limit: int
+    connections_open: int
+    connections_busy: int
+    connections_idle: int
+    utilization: float
+    queries_active: int
+    queries_waiting: int
+    queries_total: int
+    wait_ms_avg: Optional[float]
+    query_ms_avg: Optional[float]
+
+
+async def get_db_pool_stats() -> DbPoolStatsResponseModel:
+    """
+    Reports the connection pool gauges and query wait times of this worker's Prisma query engine. Queries waiting for a connection, or a utilization close to 1, mean the pool is too small for the load.
+
+    Returns:
+    DbPoolStatsResponseModel: Open, busy and idle connections against the configured limit, the queries currently running and waiting, and the average time queries spent waiting for a connection and running.
+
+    Example:
+        stats = await get_db_pool_stats()
+        > DbPoolStatsResponseModel(connection_limit=9, connections_open=4, connections_busy=1, connections_idle=3, utilization=0.11, queries_active=1, queries_waiting=0, queries_total=1520, wait_ms_avg=0.02, query_ms_avg=1.3)
+    """
+    metrics = await project.db.pool_metrics()
+    connection_limit = project.db.effective_connection_limit()
+    busy = int(metrics.get("prisma_pool_connections_busy", 0))
+    wait_count = metrics.get("prisma_client_queries_wait_histogram_ms_count", 0)
+    query_count = metrics.get("prisma_client_queries_duration_histogram_ms_count", 0)
+    return DbPoolStatsResponseModel(
+        connection_limit=connection_limit,
+        connections_open=int(metrics.get("prisma_pool_connections_open", 0)),
+        connections_busy=busy,
+        connections_idle=int(metrics.get("prisma_pool_connections_idle", 0)),
+        utilization=busy / connection_limit,
+        queries_active=int(metrics.get("prisma_client_queries_active", 0)),
+        queries_waiting=int(metrics.get("prisma_client_queries_wait", 0)),
+        queries_total=int(metrics.get("prisma_client_queries_total", 0)),
+        wait_ms_avg=(
+            metrics["prisma_client_queries_wait_histogram_ms_sum"] / wait_count
+            if wait_count
+            else None
+        ),
+        query_ms_avg=(
+            metrics["prisma_client_queries_duration_histogram_ms_sum"] / query_count
+            if query_count
+            else None
+        ),
+    )
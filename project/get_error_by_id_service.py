@@ -1,7 +1,16 @@
+from typing import Dict
+
 import prisma
 import prisma.models
+import project.cache
+import project.error_cache
+import project.exceptions
+import project.read_replica
+import project.single_flight
 from pydantic import BaseModel
 
+_flight = project.single_flight.group("error_by_id")
+
 
 class ErrorResponseModel(BaseModel):
     """
@@ -18,6 +27,8 @@ async def get_error_by_id(id: int) -> ErrorResponseModel:
     """
     This endpoint retrieves a specific error message by its ID. It is useful for viewing detailed information about a single error. The expected response is a JSON object containing the error details.
 
+    Errors, and IDs found not to exist, are kept in a bounded LRU cache that the update and delete services invalidate.
+
     Args:
     id (int): The ID of the error message to be retrieved.
 
@@ -29,14 +40,60 @@ async def get_error_by_id(id: int) -> ErrorResponseModel:
         print(error)
         # ErrorResponseModel(id=1, errorMessage="Example error", resolution="Example resolution", code=500)
     """
-    error = await prisma.models.ErrorHandlingModule.prisma().find_unique(
-        where={"id": id}
-    )
-    if error is None:
-        raise ValueError(f"No error found with ID {id}")
-    return ErrorResponseModel(
-        id=error.id,
-        errorMessage=error.errorMessage,
-        resolution=error.resolution,
-        code=error.code,
-    )
+    cache = project.error_cache.error_cache
+    response = cache.get(id)
+    if response is project.cache.MISS:
+        # An update or delete invalidating the ID during the read means the row read may be
+        # the old one, which must not be cached.
+        generation = cache.generation(id)
+        client = project.read_replica.read_client("ErrorHandlingModule")
+        error = await _flight.do(
+            (client, id),
+            lambda: prisma.models.ErrorHandlingModule.prisma(client).find_unique(
+                where={"id": id}
+            ),
+        )
+        current = cache.generation(id) == generation
+        if error is None:
+            response = None
+            if current:
+                cache.put(id, None, ttl=project.error_cache.ERROR_CACHE_NEGATIVE_TTL)
+        else:
+            response = ErrorResponseModel(
+                id=error.id,
+                errorMessage=error.errorMessage,
+                resolution=error.resolution,
+                code=error.code,
+            )
+            if current:
+                cache.put(id, response)
+    if response is None:
+        raise project.exceptions.NotFoundError(f"No error found with ID {id}")
+    return response
+
+
+class ErrorCacheStatsResponseModel(BaseModel):
+    """
+    Response model with the counters of the error-by-ID cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+async def get_error_cache_stats() -> ErrorCacheStatsResponseModel:
+    """
+    This endpoint reports the hit, miss and eviction counters and the current size of the in-process cache in front of get_error_by_id.
+
+    Returns:
+    ErrorCacheStatsResponseModel: Response model with the counters of the error-by-ID cache.
+
+    Example:
+        stats = await get_error_cache_stats()
+        # ErrorCacheStatsResponseModel(hits=9120, misses=880, evictions=0, size=880, max_size=10000)
+    """
+    stats: Dict[str, int] = project.error_cache.error_cache.stats()
+    return ErrorCacheStatsResponseModel(**stats)
@@ -1,9 +1,19 @@
-from typing import List
+from typing import List, Optional
 
 import prisma
 import prisma.models
+import project.error_filters
+import project.exceptions
+import project.read_replica
+import project.single_flight
 from pydantic import BaseModel
 
+DEFAULT_PAGE_SIZE = 100
+
+MAX_PAGE_SIZE = 1000
+
+_flight = project.single_flight.group("error_list")
+
 
 class GetErrorsRequestModel(BaseModel):
     """
@@ -30,24 +40,53 @@ class ErrorListResponseModel(BaseModel):
     """
 
     errors: List[ErrorObject]
+    next_cursor: Optional[int] = None
 
 
-async def get_errors(request: GetErrorsRequestModel) -> ErrorListResponseModel:
+async def get_errors(
+    request: GetErrorsRequestModel,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[int] = None,
+    code: Optional[int] = None,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+) -> ErrorListResponseModel:
     """
-    This endpoint retrieves a list of all error messages recorded by the ErrorHandlingModule. It is meant for use by administrators to review and manage errors. The expected response is a JSON array of error objects.
+    This endpoint retrieves a list of error messages recorded by the ErrorHandlingModule, one page at a time. It is meant for use by administrators to review and manage errors. The expected response is a JSON array of error objects.
+
+    Pages are ordered by ID and use keyset pagination: pass the returned `next_cursor` as `cursor` to fetch the following page. Each page costs an index range scan of at most `limit` rows, however many errors are stored.
 
     Args:
         request (GetErrorsRequestModel): This request model is used for retrieving error messages. It doesn't require any additional parameters since it is a GET request for listing errors.
+        limit (int): The maximum number of errors to return, between 1 and MAX_PAGE_SIZE.
+        cursor (Optional[int]): Only return errors with an ID greater than this one, i.e. the `next_cursor` of the previous page.
+        code (Optional[int]): Only return errors with this error code.
+        min_id (Optional[int]): Only return errors with an ID greater than or equal to this one.
+        max_id (Optional[int]): Only return errors with an ID less than or equal to this one.
 
     Returns:
-        ErrorListResponseModel: A response model that returns a list of error objects recorded by the ErrorHandlingModule. This is meant for admin review and management of errors.
+        ErrorListResponseModel: A response model that returns a page of error objects recorded by the ErrorHandlingModule, and the cursor of the next page if there is one.
 
     Example:
         request = GetErrorsRequestModel()
-        response = await get_errors(request)
+        response = await get_errors(request, limit=1)
         > response.errors  # [ErrorObject(id=1, errorMessage='Error', resolution='Resolved', code=500)]
+        > response.next_cursor  # 1
     """
-    errors = await prisma.models.ErrorHandlingModule.prisma().find_many()
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise project.exceptions.BadRequestError(
+            f"limit must be between 1 and {MAX_PAGE_SIZE}."
+        )
+    where = project.error_filters.error_filter(code, min_id, max_id, after_id=cursor)
+    # Fetch one row past the page to learn whether another page follows.
+    client = project.read_replica.read_client()
+    errors = await _flight.do(
+        (client, limit, cursor, code, min_id, max_id),
+        lambda: prisma.models.ErrorHandlingModule.prisma(client).find_many(
+            where=where, order={"id": "asc"}, take=limit + 1
+        ),
+    )
+    next_cursor = errors[limit - 1].id if len(errors) > limit else None
     error_objects = [
         ErrorObject(
             id=error.id,
@@ -55,6 +94,6 @@ async def get_errors(request: GetErrorsRequestModel) -> ErrorListResponseModel:
             resolution=error.resolution,
             code=error.code,
         )
-        for error in errors
+        for error in errors[:limit]
     ]
-    return ErrorListResponseModel(errors=error_objects)
+    return ErrorListResponseModel(errors=error_objects, next_cursor=next_cursor)
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import List, Optional
+
+import project.exceptions
+import project.health_history
+from pydantic import BaseModel
+
+
+class HistoryResolution(str, Enum):
+    """
+    The granularity of the health history tiers.
+    """
+
+    RAW = "raw"
+    MINUTE = "minute"
+    HOUR = "hour"
+
+
+RESOLUTION_SECONDS = {
+    HistoryResolution.RAW: 0,
+    HistoryResolution.MINUTE: 60,
+    HistoryResolution.HOUR: 3600,
+}
+
+DEFAULT_HISTORY_WINDOW = timedelta(hours=1)
+
+
+class HealthHistoryPoint(BaseModel):
+    """
+    One point of the health history: a single probe, or the aggregate of the probes in a minute or hour.
+    """
+
+    start: datetime
+    samples: int
+    ready_ratio: float
+    status: str
+    database_latency_ms_avg: Optional[float]
+    database_latency_ms_max: Optional[float]
+    event_loop_lag_ms_avg: float
+    event_loop_lag_ms_max: float
+
+
+class HealthHistoryResponseModel(BaseModel):
+    """
+    Response model for the health history endpoint.
+    """
+
+    resolution: HistoryResolution
+    points: List[HealthHistoryPoint]
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+async def get_health_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[HistoryResolution] = None,
+) -> HealthHistoryResponseModel:
+    """
+    Returns the recorded health probes of this instance between `start` and `end`.
+
+    Without an explicit resolution, the finest tier that still reaches back to `start` is used:
+    raw probes for the last hour, per-minute aggregates for the last day, per-hour aggregates
+    beyond that (with the default retentions). The status of an aggregated point is the last one
+    seen in it.
+
+    Args:
+        start (Optional[datetime]): Start of the range. Defaults to one hour before `end`.
+            Times without a timezone are taken as UTC, for `start` and `end` alike.
+        end (Optional[datetime]): End of the range. Defaults to now.
+        resolution (Optional[HistoryResolution]): Force a tier instead of picking one from `start`.
+
+    Returns:
+        HealthHistoryResponseModel: The chosen resolution and the points in the range, oldest first.
+
+    Example:
+        response = await get_health_history(resolution=HistoryResolution.MINUTE)
+        > HealthHistoryResponseModel(resolution='minute', points=[HealthHistoryPoint(start=..., samples=12, ready_ratio=1.0, ...)])
+    """
+    end = _as_utc(end) if end is not None else datetime.now(timezone.utc)
+    start = _as_utc(start) if start is not None else end - DEFAULT_HISTORY_WINDOW
+    if start > end:
+        raise project.exceptions.BadRequestError("start must not be after end")
+    tier, buckets = project.health_history.history.query(
+        start.timestamp(),
+        end.timestamp(),
+        RESOLUTION_SECONDS[resolution] if resolution is not None else None,
+    )
+    points = [
+        HealthHistoryPoint(
+            start=datetime.fromtimestamp(bucket.start, timezone.utc),
+            samples=bucket.samples,
+            ready_ratio=bucket.ready_samples / bucket.samples,
+            status=bucket.status,
+            database_latency_ms_avg=(
+                bucket.latency_sum_ms / bucket.latency_samples
+                if bucket.latency_samples
+                else None
+            ),
+            database_latency_ms_max=(
+                bucket.latency_max_ms if bucket.latency_samples else None
+            ),
+            event_loop_lag_ms_avg=bucket.lag_sum_ms / bucket.samples,
+            event_loop_lag_ms_max=bucket.lag_max_ms,
+        )
+        for bucket in buckets
+    ]
+    return HealthHistoryResponseModel(
+        resolution=next(
+            name
+            for name, seconds in RESOLUTION_SECONDS.items()
+            if seconds == tier.resolution
+        ),
+        points=points,
+    )
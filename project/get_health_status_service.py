@@ -1,7 +1,15 @@
 import prisma
 import prisma.models
+import project.change_notifications
+import project.health_prober
+import project.read_replica
+import project.single_flight
 from pydantic import BaseModel
 
+_flight = project.single_flight.group("health_status")
+# The health status services notify locally as well as publishing, so this covers every write.
+project.change_notifications.subscribe("HealthCheckModule", _flight.forget_all)
+
 
 class HealthCheckRequestModel(BaseModel):
     """
@@ -25,6 +33,7 @@ async def get_health_status(
     """
     This endpoint checks the health status of the API. When called, it returns a simple JSON object that indicates if the API is running correctly.
     Expected response is a JSON object with a 'status' key set to 'ok'. In case of failure, it interacts with the ErrorHandlingModule to return appropriate status messages.
+    The status is served from the background health prober's latest snapshot; the database is only queried before the prober has run.
 
     Args:
     request (HealthCheckRequestModel): Request model for the health check endpoint. Since this endpoint does not require any parameters, the Fields array will be empty.
@@ -37,8 +46,14 @@ async def get_health_status(
         response = await get_health_status(request)
         print(response.status)  # Will print 'ok' if API is running correctly
     """
+    snapshot = project.health_prober.prober.current()
+    if snapshot is not None:
+        return HealthCheckResponseModel(status=snapshot.status)
     try:
-        health_check = await prisma.models.HealthCheckModule.prisma().find_first()
+        client = project.read_replica.read_client()
+        health_check = await _flight.do(
+            client, lambda: prisma.models.HealthCheckModule.prisma(client).find_first()
+        )
         if health_check:
             return HealthCheckResponseModel(status=health_check.statusMessage)
         else:
@@ -46,7 +61,9 @@ async def get_health_status(
                 status="Health check module not configured."
             )
     except Exception as e:
-        error_message = await prisma.models.ErrorHandlingModule.prisma().find_first()
+        error_message = await prisma.models.ErrorHandlingModule.prisma(
+            project.read_replica.read_client()
+        ).find_first()
         if error_message:
             return HealthCheckResponseModel(status=error_message.errorMessage)
         else:
@@ -0,0 +1,37 @@
+import project.hello_world_cache
+from pydantic import BaseModel
+
+
+class HelloWorldRequest(BaseModel):
+    """
+    Request model for the 'Hello World' endpoint. This endpoint does not require any request parameters.
+    """
+
+    pass
+
+
+class HelloWorldResponse(BaseModel):
+    """
+    Response model for the 'Hello World' endpoint, containing the 'Hello World' message.
+    """
+
+    message: str
+
+
+async def get_hello_world(request: HelloWorldRequest) -> HelloWorldResponse:
+    """
+    This endpoint returns a simple 'Hello World' message. It doesn't require any input parameters and returns a JSON object containing the message. The purpose is to verify that the API is working correctly.
+
+    Args:
+        request (HelloWorldRequest): Request model for the 'Hello World' endpoint. This endpoint does not require any request parameters.
+
+    Returns:
+        HelloWorldResponse: Response model for the 'Hello World' endpoint, containing the 'Hello World' message.
+
+    Example:
+        request = HelloWorldRequest()
+        response = await get_hello_world(request)
+        > HelloWorldResponse(message="Hello, World!")
+    """
+    message = await project.hello_world_cache.message_cache.get()
+    return HelloWorldResponse(message=message)
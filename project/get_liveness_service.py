@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+
+
+class LivenessResponseModel(BaseModel):
+    """
+    Response model for the liveness probe. The status is always 'ok' while the process can serve requests.
+    """
+
+    status: str
+
+
+LIVENESS_RESPONSE = LivenessResponseModel(status="ok")
+
+
+async def get_liveness() -> LivenessResponseModel:
+    """
+    Reports that the process is up and its event loop is serving requests. It performs no I/O, so
+    a slow or unavailable database never makes the orchestrator restart the process.
+
+    Returns:
+    LivenessResponseModel: Always a status of 'ok'.
+
+    Example:
+        response = await get_liveness()
+        print(response.status)  # 'ok'
+    """
+    return LIVENESS_RESPONSE
@@ -0,0 +1,205 @@
+import logging
+from typing import List, Tuple
+
+import project.db
+import project.error_cache
+import project.error_ingestion
+import project.exception_handling
+import project.health_prober
+import project.hello_world_stream
+import project.metrics
+import project.read_replica
+import project.single_flight
+
+logger = logging.getLogger(__name__)
+
+_registry = project.metrics.registry
+
+
+def _error_queue_counts() -> List[Tuple[project.metrics.LabelValues, float]]:
+    queue = project.error_ingestion.error_queue
+    return [
+        (("accepted",), queue.accepted),
+        (("dropped",), queue.dropped),
+        (("flushed",), queue.flushed),
+    ]
+
+
+def _error_cache_counts() -> List[Tuple[project.metrics.LabelValues, float]]:
+    stats = project.error_cache.error_cache.stats()
+    return [((name,), stats[name]) for name in ("hits", "misses", "evictions")]
+
+
+def _health() -> List[Tuple[project.metrics.LabelValues, float]]:
+    snapshot = project.health_prober.prober.current()
+    if snapshot is None:
+        return []
+    return [((), float(snapshot.ready))]
+
+
+def _health_latency() -> List[Tuple[project.metrics.LabelValues, float]]:
+    snapshot = project.health_prober.prober.current()
+    if snapshot is None:
+        return []
+    samples = [(("event_loop_lag",), snapshot.event_loop_lag_ms / 1000)]
+    if snapshot.database_latency_ms is not None:
+        samples.append((("database",), snapshot.database_latency_ms / 1000))
+    return samples
+
+
+async def _db_pool() -> List[Tuple[project.metrics.LabelValues, float]]:
+    try:
+        metrics = await project.db.pool_metrics()
+    except Exception:
+        logger.warning("Could not read the Prisma pool metrics", exc_info=True)
+        return []
+    return [
+        ((state,), metrics[f"prisma_pool_connections_{state}"])
+        for state in ("open", "busy", "idle")
+        if f"prisma_pool_connections_{state}" in metrics
+    ] + [
+        (("waiting_queries",), metrics.get("prisma_client_queries_wait", 0)),
+        (("limit",), project.db.effective_connection_limit()),
+    ]
+
+
+def _replica() -> List[Tuple[project.metrics.LabelValues, float]]:
+    router = project.read_replica.router
+    if not router.configured:
+        return []
+    samples = [(("available",), float(router.available))]
+    if router.lag_seconds is not None:
+        samples.append((("lag_seconds",), router.lag_seconds))
+    return samples
+
+
+def _single_flight_calls() -> List[Tuple[project.metrics.LabelValues, float]]:
+    samples: List[Tuple[project.metrics.LabelValues, float]] = []
+    for name, flight in project.single_flight.groups.items():
+        samples.append(((name, "executed"), flight.executed))
+        samples.append(((name, "coalesced"), flight.coalesced))
+        samples.append(((name, "failed"), flight.failed))
+    return samples
+
+
+for _metric in (
+    project.metrics.CallbackGauge(
+        "error_ingestion_events_total",
+        "Errors accepted into, dropped from and written by the ingestion queue.",
+        _error_queue_counts,
+        ("event",),
+        type_name="counter",
+    ),
+    project.metrics.CallbackGauge(
+        "error_ingestion_failed_flushes_total",
+        "Ingestion batches that failed to write and were requeued.",
+        lambda: [((), project.error_ingestion.error_queue.failed_flushes)],
+        type_name="counter",
+    ),
+    project.metrics.CallbackGauge(
+        "error_ingestion_pending",
+        "Errors waiting in the ingestion queue.",
+        lambda: [((), project.error_ingestion.error_queue.pending)],
+    ),
+    project.metrics.CallbackGauge(
+        "error_cache_events_total",
+        "Lookups and evictions of the GET /api/errors/{id} cache.",
+        _error_cache_counts,
+        ("event",),
+        type_name="counter",
+    ),
+    project.metrics.CallbackGauge(
+        "error_cache_size",
+        "Entries held by the GET /api/errors/{id} cache.",
+        lambda: [((), len(project.error_cache.error_cache))],
+    ),
+    project.metrics.CallbackGauge(
+        "exception_logs_total",
+        "Server errors whose traceback was logged or suppressed by sampling.",
+        lambda: [
+            (("logged",), project.exception_handling.sampler.logged),
+            (("suppressed",), project.exception_handling.sampler.suppressed),
+        ],
+        ("outcome",),
+        type_name="counter",
+    ),
+    project.metrics.CallbackGauge(
+        "health_ready",
+        "1 if the last health probe found the instance ready, else 0.",
+        _health,
+    ),
+    project.metrics.CallbackGauge(
+        "health_probe_latency_seconds",
+        "Database round trip and event-loop lag measured by the last health probe.",
+        _health_latency,
+        ("measurement",),
+    ),
+    project.metrics.CallbackGauge(
+        "hello_world_stream_subscribers",
+        "Clients connected to GET /helloworld/stream.",
+        lambda: [((), project.hello_world_stream.broadcaster.subscribers)],
+    ),
+    project.metrics.CallbackGauge(
+        "db_pool_connections",
+        "Prisma connection pool state: open, busy and idle connections, queries waiting for one, and the limit.",
+        _db_pool,
+        ("state",),
+    ),
+    project.metrics.CallbackGauge(
+        "db_replica_state",
+        "Whether reads may use the read replica (1 or 0), and its replication lag in seconds at the last check.",
+        _replica,
+        ("measurement",),
+    ),
+    project.metrics.CallbackGauge(
+        "db_reads_total",
+        "Reads routed to the replica or the primary, and replica queries retried on the primary.",
+        lambda: [
+            (("replica",), project.read_replica.router.replica_reads),
+            (("primary",), project.read_replica.router.primary_reads),
+            (("fallback",), project.read_replica.router.fallbacks),
+        ],
+        ("target",),
+        type_name="counter",
+    ),
+    project.metrics.CallbackGauge(
+        "single_flight_calls_total",
+        "Callers of each single-flight group that ran the query, shared another caller's query, or ran a query that failed.",
+        _single_flight_calls,
+        ("group", "outcome"),
+        type_name="counter",
+    ),
+    project.metrics.CallbackGauge(
+        "single_flight_coalescing_ratio",
+        "Share of each single-flight group's callers served by a query another caller started.",
+        lambda: [
+            ((name,), flight.coalescing_ratio)
+            for name, flight in project.single_flight.groups.items()
+        ],
+        ("group",),
+    ),
+    project.metrics.CallbackGauge(
+        "single_flight_in_flight",
+        "Shared queries currently running, per single-flight group.",
+        lambda: [
+            ((name,), flight.in_flight)
+            for name, flight in project.single_flight.groups.items()
+        ],
+        ("group",),
+    ),
+):
+    _registry.register(_metric)
+
+
+async def get_metrics() -> bytes:
+    """
+    Renders every registered metric in the Prometheus text exposition format: per-route request counts and latencies, Prisma query latencies by model and operation, in-flight gauges, and the counters kept by the error ingestion queue, error cache, exception logging, health prober, connection pool, read replica routing and request coalescing.
+
+    Returns:
+    bytes: The exposition body, to be served as text/plain; version=0.0.4.
+
+    Example:
+        body = await get_metrics()
+        > b'# HELP http_requests_total HTTP requests handled, by method, route and status code.\n...'
+    """
+    return await _registry.render()
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Optional
+
+import project.health_prober
+from pydantic import BaseModel
+
+
+class ReadinessResponseModel(BaseModel):
+    """
+    Response model for the readiness probe, built from the latest background health probe.
+    """
+
+    ready: bool
+    status: str
+    database_latency_ms: Optional[float]
+    event_loop_lag_ms: Optional[float]
+    checked_at: Optional[datetime]
+    error: Optional[str]
+
+
+async def get_readiness() -> ReadinessResponseModel:
+    """
+    Reports whether this instance should receive traffic. The answer comes from the snapshot kept by
+    the background health prober, so the probe itself never queries the database.
+
+    The instance is not ready if the last probe could not reach the database, if the database
+    round trip exceeded HEALTH_MAX_DB_LATENCY_MS, or if the snapshot is older than
+    HEALTH_MAX_MISSED_PROBES probe intervals.
+
+    Returns:
+    ReadinessResponseModel: The readiness flag, the HealthCheckModule statusMessage, the measured database latency and when it was measured.
+
+    Example:
+        response = await get_readiness()
+        print(response.ready)  # True while the database is reachable and fast enough
+    """
+    snapshot = project.health_prober.prober.current()
+    if snapshot is None:
+        return ReadinessResponseModel(
+            ready=False,
+            status="Health prober has not run yet.",
+            database_latency_ms=None,
+            event_loop_lag_ms=None,
+            checked_at=None,
+            error="Health prober has not run yet.",
+        )
+    return ReadinessResponseModel(
+        ready=snapshot.ready,
+        status=snapshot.status,
+        database_latency_ms=snapshot.database_latency_ms,
+        event_loop_lag_ms=snapshot.event_loop_lag_ms,
+        checked_at=snapshot.checked_at,
+        error=snapshot.error,
+    )
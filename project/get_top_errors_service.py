@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import List
+
+import prisma
+import prisma.models
+import project.exceptions
+import project.read_replica
+import project.single_flight
+from pydantic import BaseModel
+
+MAX_TOP_ERRORS = 100
+
+_flight = project.single_flight.group("top_errors")
+
+
+class TopErrorObject(BaseModel):
+    """
+    A deduplicated error and how often it has occurred.
+    """
+
+    id: int
+    code: int
+    errorMessage: str
+    occurrences: int
+    firstSeen: datetime
+    lastSeen: datetime
+
+
+class TopErrorsResponseModel(BaseModel):
+    """
+    A response model that returns the most frequent deduplicated errors, most frequent first.
+    """
+
+    errors: List[TopErrorObject]
+
+
+async def get_top_errors(limit: int = 10) -> TopErrorsResponseModel:
+    """
+    This endpoint returns the most frequent errors recorded in deduplicated mode, ordered by occurrence count. It reads the first rows of the occurrences index, so its cost does not grow with the size of the ErrorHandlingModule table.
+
+    Args:
+        limit (int): The number of errors to return, between 1 and MAX_TOP_ERRORS.
+
+    Returns:
+        TopErrorsResponseModel: A response model that returns the most frequent deduplicated errors, most frequent first.
+
+    Example:
+        response = await get_top_errors(1)
+        > TopErrorsResponseModel(errors=[TopErrorObject(id=7, code=500, errorMessage='Timeout', occurrences=1532, ...)])
+    """
+    if not 1 <= limit <= MAX_TOP_ERRORS:
+        raise project.exceptions.BadRequestError(
+            f"limit must be between 1 and {MAX_TOP_ERRORS}."
+        )
+    client = project.read_replica.read_client()
+    errors = await _flight.do(
+        (client, limit),
+        lambda: prisma.models.ErrorHandlingModule.prisma(client).find_many(
+            where={"fingerprint": {"not": None}},
+            order={"occurrences": "desc"},
+            take=limit,
+        ),
+    )
+    return TopErrorsResponseModel(
+        errors=[
+            TopErrorObject(
+                id=error.id,
+                code=error.code,
+                errorMessage=error.errorMessage,
+                occurrences=error.occurrences,
+                firstSeen=error.firstSeen,
+                lastSeen=error.lastSeen,
+            )
+            for error in errors
+        ]
+    )
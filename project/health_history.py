@@ -0,0 +1,156 @@
+import bisect
+import os
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+HEALTH_HISTORY_RAW_RETENTION = float(os.getenv("HEALTH_HISTORY_RAW_RETENTION", "3600"))
+HEALTH_HISTORY_MINUTE_RETENTION = float(
+    os.getenv("HEALTH_HISTORY_MINUTE_RETENTION", "86400")
+)
+HEALTH_HISTORY_HOUR_RETENTION = float(
+    os.getenv("HEALTH_HISTORY_HOUR_RETENTION", "2592000")
+)
+
+
+class HealthBucket:
+    """
+    Aggregated health samples that fall into one time bucket. A raw sample is a bucket of one.
+    """
+
+    __slots__ = (
+        "start",
+        "samples",
+        "ready_samples",
+        "status",
+        "latency_samples",
+        "latency_sum_ms",
+        "latency_max_ms",
+        "lag_sum_ms",
+        "lag_max_ms",
+    )
+
+    def __init__(self, start: float, status: str) -> None:
+        self.start = start
+        self.samples = 0
+        self.ready_samples = 0
+        self.status = status
+        self.latency_samples = 0
+        self.latency_sum_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.lag_sum_ms = 0.0
+        self.lag_max_ms = 0.0
+
+    def merge(
+        self, ready: bool, status: str, latency_ms: Optional[float], lag_ms: float
+    ) -> None:
+        self.samples += 1
+        self.ready_samples += ready
+        self.status = status
+        if latency_ms is not None:
+            self.latency_samples += 1
+            self.latency_sum_ms += latency_ms
+            self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+        self.lag_sum_ms += lag_ms
+        self.lag_max_ms = max(self.lag_max_ms, lag_ms)
+
+
+class HealthTier:
+    """
+    Buckets of one resolution kept for `retention` seconds. A resolution of 0 keeps every sample.
+    """
+
+    def __init__(self, resolution: float, retention: float) -> None:
+        self.resolution = resolution
+        self.retention = retention
+        self.buckets: Deque[HealthBucket] = deque()
+
+    def add(
+        self,
+        timestamp: float,
+        ready: bool,
+        status: str,
+        latency_ms: Optional[float],
+        lag_ms: float,
+    ) -> None:
+        start = (
+            timestamp - timestamp % self.resolution if self.resolution else timestamp
+        )
+        if not self.buckets or self.buckets[-1].start != start:
+            self.buckets.append(HealthBucket(start, status))
+        self.buckets[-1].merge(ready, status, latency_ms, lag_ms)
+        cutoff = timestamp - self.retention
+        while self.buckets and self.buckets[0].start < cutoff:
+            self.buckets.popleft()
+
+    def range(self, start: float, end: float) -> List[HealthBucket]:
+        buckets = self.buckets
+        if self.resolution:
+            # Include the bucket that `start` falls into.
+            low = bisect.bisect_right(
+                buckets, start - self.resolution, key=lambda bucket: bucket.start
+            )
+        else:
+            low = bisect.bisect_left(buckets, start, key=lambda bucket: bucket.start)
+        high = bisect.bisect_right(buckets, end, key=lambda bucket: bucket.start)
+        return [buckets[i] for i in range(low, high)]
+
+
+class HealthHistory:
+    """
+    Append-only, in-memory time series of health samples, downsampled as it ages.
+
+    Every sample goes into each tier: kept as-is in the raw tier, and merged into the current
+    bucket of the per-minute and per-hour tiers. Each tier drops buckets older than its retention,
+    so memory stays bounded and recording a sample is constant time. Reads binary-search the
+    tier and copy out only the requested range.
+    """
+
+    def __init__(
+        self,
+        raw_retention: float = HEALTH_HISTORY_RAW_RETENTION,
+        minute_retention: float = HEALTH_HISTORY_MINUTE_RETENTION,
+        hour_retention: float = HEALTH_HISTORY_HOUR_RETENTION,
+    ) -> None:
+        self.tiers = [
+            HealthTier(0, raw_retention),
+            HealthTier(60, minute_retention),
+            HealthTier(3600, hour_retention),
+        ]
+
+    def record(
+        self,
+        ready: bool,
+        status: str,
+        latency_ms: Optional[float],
+        lag_ms: float,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        timestamp = time.time() if timestamp is None else timestamp
+        for tier in self.tiers:
+            tier.add(timestamp, ready, status, latency_ms, lag_ms)
+
+    def tier_for(self, start: float, resolution: Optional[float] = None) -> HealthTier:
+        """
+        Picks the tier with the given resolution, or else the finest tier that still covers `start`.
+        """
+        if resolution is not None:
+            for tier in self.tiers:
+                if tier.resolution == resolution:
+                    return tier
+            raise ValueError(f"Unknown health history resolution: {resolution}s")
+        # Allow some slack so that a range of exactly one retention period still maps to that tier.
+        oldest_needed = time.time() - start - 60
+        for tier in self.tiers:
+            if tier.retention >= oldest_needed:
+                return tier
+        return self.tiers[-1]
+
+    def query(
+        self, start: float, end: float, resolution: Optional[float] = None
+    ) -> Tuple[HealthTier, List[HealthBucket]]:
+        tier = self.tier_for(start, resolution)
+        return tier, tier.range(start, end)
+
+
+history = HealthHistory()
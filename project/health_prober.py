@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import prisma
+import prisma.models
+import project.change_notifications
+import project.health_history
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+HEALTH_MAX_DB_LATENCY_MS = float(os.getenv("HEALTH_MAX_DB_LATENCY_MS", "1000"))
+# A snapshot older than this many probe intervals means the prober itself is stuck.
+HEALTH_MAX_MISSED_PROBES = int(os.getenv("HEALTH_MAX_MISSED_PROBES", "3"))
+
+NOT_CONFIGURED_STATUS = "Health check module not configured."
+
+
+class HealthSnapshot(BaseModel):
+    """
+    The result of the most recent background health probe.
+    """
+
+    ready: bool
+    status: str
+    database_latency_ms: Optional[float]
+    event_loop_lag_ms: float
+    checked_at: datetime
+    error: Optional[str] = None
+
+
+class HealthProber:
+    """
+    Checks database connectivity and latency on a fixed interval and keeps the latest result.
+
+    Each probe is a single HealthCheckModule read, which both measures the database round trip
+    and picks up the current status message. Probe endpoints read the snapshot instead of
+    querying the database, so their cost does not depend on how often they are called. Every
+    probe is also recorded in the health history.
+    """
+
+    def __init__(
+        self,
+        interval: float = HEALTH_PROBE_INTERVAL,
+        timeout: float = HEALTH_PROBE_TIMEOUT,
+        max_latency_ms: float = HEALTH_MAX_DB_LATENCY_MS,
+        max_missed_probes: int = HEALTH_MAX_MISSED_PROBES,
+    ) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.max_latency_ms = max_latency_ms
+        self.max_missed_probes = max_missed_probes
+        self.snapshot: Optional[HealthSnapshot] = None
+        self._refresh = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Runs a first probe, so readiness is known before the app serves requests, then keeps probing in the background.
+        """
+        await self.probe()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def refresh_soon(self) -> None:
+        """
+        Wakes the prober up for an early probe, e.g. after the status message changed.
+        """
+        self._refresh.set()
+
+    def current(self) -> Optional[HealthSnapshot]:
+        """
+        Returns the latest snapshot, marked not ready if the prober has stopped updating it.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        age = (datetime.now(timezone.utc) - snapshot.checked_at).total_seconds()
+        if snapshot.ready and age > self.interval * self.max_missed_probes:
+            return snapshot.model_copy(
+                update={"ready": False, "error": f"Health snapshot is {age:.1f}s old."}
+            )
+        return snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.interval):
+                    await self._refresh.wait()
+            except TimeoutError:
+                pass
+            self._refresh.clear()
+            await self.probe()
+
+    async def probe(self) -> HealthSnapshot:
+        # Yielding once takes as long as the callbacks already queued on the loop take to run.
+        loop = asyncio.get_running_loop()
+        yielded_at = loop.time()
+        await asyncio.sleep(0)
+        lag_ms = (loop.time() - yielded_at) * 1000
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                health_check = (
+                    await prisma.models.HealthCheckModule.prisma().find_first()
+                )
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                error = f"Database did not respond within {self.timeout}s."
+            else:
+                error = f"Database unavailable: {e}"
+            logger.warning("Health probe failed: %s", error)
+            snapshot = HealthSnapshot(
+                ready=False,
+                status=f"Error Occurred: {error}",
+                database_latency_ms=None,
+                event_loop_lag_ms=lag_ms,
+                checked_at=datetime.now(timezone.utc),
+                error=error,
+            )
+        else:
+            latency_ms = (time.perf_counter() - started) * 1000
+            error = None
+            if latency_ms > self.max_latency_ms:
+                error = f"Database latency {latency_ms:.0f}ms exceeds {self.max_latency_ms:.0f}ms."
+            snapshot = HealthSnapshot(
+                ready=error is None,
+                status=(
+                    health_check.statusMessage
+                    if health_check
+                    else NOT_CONFIGURED_STATUS
+                ),
+                database_latency_ms=latency_ms,
+                event_loop_lag_ms=lag_ms,
+                checked_at=datetime.now(timezone.utc),
+                error=error,
+            )
+        self.snapshot = snapshot
+        project.health_history.history.record(
+            snapshot.ready,
+            snapshot.status,
+            snapshot.database_latency_ms,
+            snapshot.event_loop_lag_ms,
+            snapshot.checked_at.timestamp(),
+        )
+        return snapshot
+
+
+prober = HealthProber()
+project.change_notifications.subscribe("HealthCheckModule", prober.refresh_soon)
@@ -0,0 +1,44 @@
+import os
+
+import prisma
+import prisma.models
+import project.cache
+import project.change_notifications
+import project.read_replica
+import project.single_flight
+
+DEFAULT_MESSAGE = "Hello, World!"
+
+HELLO_WORLD_CACHE_TTL = float(os.getenv("HELLO_WORLD_CACHE_TTL", "300"))
+
+_flight = project.single_flight.group("hello_world_message")
+
+
+async def load_message() -> str:
+    """
+    Reads the current 'Hello, World!' message from the HelloWorldModule table. Concurrent reads share one query.
+
+    Returns:
+        str: The stored message, or the default 'Hello, World!' message if no row exists.
+    """
+    client = project.read_replica.read_client("HelloWorldModule")
+    hello_world_module = await _flight.do(
+        client, lambda: prisma.models.HelloWorldModule.prisma(client).find_first()
+    )
+    if hello_world_module is None:
+        return DEFAULT_MESSAGE
+    return hello_world_module.message
+
+
+def forget_loads() -> None:
+    """
+    Detaches in-flight reads of the message, so that a load after a write queries the database again instead of sharing a read started before the write.
+    """
+    _flight.forget_all()
+
+
+message_cache: project.cache.CachedValue[str] = project.cache.CachedValue(
+    load_message, ttl=HELLO_WORLD_CACHE_TTL
+)
+project.change_notifications.subscribe("HelloWorldModule", forget_loads)
+project.change_notifications.subscribe("HelloWorldModule", message_cache.invalidate)
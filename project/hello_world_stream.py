@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+from typing import AsyncIterator, Optional, Set
+
+import project.change_notifications
+import project.hello_world_cache
+
+HELLO_WORLD_STREAM_HEARTBEAT = float(os.getenv("HELLO_WORLD_STREAM_HEARTBEAT", "15"))
+
+_HEARTBEAT_EVENT = b": keep-alive\n\n"
+
+
+class Broadcaster:
+    """
+    Fans the latest server-sent event out to every connected subscriber.
+
+    All subscribers wait on one shared asyncio.Event that is swapped out on every publish, so an idle
+    connection costs a single waiter and publishing is one wake-up pass. The event is encoded once
+    per change rather than once per connection, and slow subscribers never queue up old events;
+    they skip straight to the latest.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.event: Optional[bytes] = None
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+
+    def publish(self, event: bytes) -> None:
+        self.event = event
+        self.version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self, version: int) -> int:
+        """
+        Waits until an event newer than `version` has been published and returns the new version.
+        """
+        while self.version == version:
+            await self._changed.wait()
+        return self.version
+
+
+broadcaster = Broadcaster()
+
+# Keeps the reload tasks started by remote invalidations alive until they finish.
+_reload_tasks: Set[asyncio.Task] = set()
+
+
+def encode_event(message: str) -> bytes:
+    return f"data: {json.dumps({'message': message})}\n\n".encode()
+
+
+def _publish_message(message: str) -> None:
+    broadcaster.publish(encode_event(message))
+
+
+def _reload_after_remote_change() -> None:
+    # A write on another worker only invalidates this worker's cache. Reload it right away when
+    # clients are streaming, so they are pushed the new message instead of waiting for a read.
+    # load() rather than get(): with caching disabled get() skips the cache, and with it the
+    # listener that publishes the change.
+    if broadcaster.subscribers == 0:
+        return
+    task = asyncio.get_running_loop().create_task(
+        project.hello_world_cache.message_cache.load()
+    )
+    _reload_tasks.add(task)
+    task.add_done_callback(_reload_tasks.discard)
+
+
+project.hello_world_cache.message_cache.add_listener(_publish_message)
+project.change_notifications.subscribe("HelloWorldModule", _reload_after_remote_change)
+
+
+async def stream_messages() -> AsyncIterator[bytes]:
+    """
+    Yields the current 'Hello, World!' message as a server-sent event, then one event per message change.
+
+    A comment line is sent every HELLO_WORLD_STREAM_HEARTBEAT seconds while nothing changes, so
+    proxies do not close idle connections.
+    """
+    broadcaster.subscribers += 1
+    try:
+        message = await project.hello_world_cache.message_cache.get()
+        version = broadcaster.version
+        yield encode_event(message)
+        while True:
+            try:
+                async with asyncio.timeout(HELLO_WORLD_STREAM_HEARTBEAT):
+                    version = await broadcaster.wait(version)
+            except TimeoutError:
+                yield _HEARTBEAT_EVENT
+                continue
+            yield broadcaster.event  # type: ignore[misc]
+    finally:
+        broadcaster.subscribers -= 1
@@ -0,0 +1,194 @@
+"""
+Runs the app in several uvicorn worker processes, for production.
+
+    poetry run python -m project.launcher
+
+Each worker is a separate process with its own event loop, database pool and caches. They use
+uvloop and httptools, which the uvicorn[standard] dependency installs, and fall back to asyncio
+and h11 without them; each worker logs the ones it picked. With SO_REUSEPORT (the default where the platform has it)
+every worker binds its own listening socket on the same port and the kernel spreads
+connections between them; otherwise the launcher binds one socket and the workers share it.
+
+On SIGTERM or SIGINT the launcher forwards SIGTERM to the workers, each of which stops
+accepting connections, lets in-flight requests finish (up to GRACEFUL_TIMEOUT seconds) and then
+runs the app's lifespan shutdown, closing its database connections. Workers are recycled after
+MAX_REQUESTS requests, plus a random jitter so they do not all restart at once, and any worker
+that exits is replaced.
+"""
+
+import importlib.util
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+from multiprocessing.context import SpawnProcess
+from typing import Dict, Optional
+
+import project.cpus
+import uvicorn
+
+logger = logging.getLogger("project.launcher")
+
+ASGI_APP = os.getenv("ASGI_APP", "project.fast_server:app")
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Worker processes to run (0 = one per usable CPU, see project.cpus.available_cpus).
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+REUSE_PORT = os.getenv("REUSE_PORT", "true").lower() == "true" and hasattr(
+    socket, "SO_REUSEPORT"
+)
+# Requests after which a worker is replaced (0 = never), plus up to MAX_REQUESTS_JITTER more.
+MAX_REQUESTS = int(os.getenv("MAX_REQUESTS", "0"))
+MAX_REQUESTS_JITTER = int(os.getenv("MAX_REQUESTS_JITTER", "0"))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
+# Workers that exit within this many seconds of starting are restarted after a delay, so that
+# an app that cannot start does not spin the launcher.
+MIN_WORKER_LIFETIME = 5.0
+
+
+def worker_count() -> int:
+    return WEB_CONCURRENCY or project.cpus.available_cpus()
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def bind_socket(reuse_port: bool) -> socket.socket:
+    sock = socket.socket(
+        socket.AF_INET6 if ":" in HOST else socket.AF_INET, socket.SOCK_STREAM
+    )
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((HOST, PORT))
+    sock.listen(BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _configure_logging() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+
+
+def run_worker(sock: Optional[socket.socket]) -> None:
+    """
+    Serves the app in this process on `sock`, or on a socket of its own bound with SO_REUSEPORT.
+    """
+    # Worker processes are spawned, so they do not inherit the launcher's logging set-up.
+    _configure_logging()
+    loop = "uvloop" if _installed("uvloop") else "asyncio"
+    http = "httptools" if _installed("httptools") else "h11"
+    logger.info("Worker pid %d using the %s event loop and %s", os.getpid(), loop, http)
+    if sock is None:
+        sock = bind_socket(reuse_port=True)
+    max_requests = None
+    if MAX_REQUESTS:
+        max_requests = MAX_REQUESTS + random.randint(0, MAX_REQUESTS_JITTER)
+    config = uvicorn.Config(
+        ASGI_APP,
+        loop=loop,
+        http=http,
+        backlog=BACKLOG,
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        lifespan="on",
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Launcher:
+    """
+    Starts the worker processes, replaces those that exit and stops them all on SIGTERM or SIGINT.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.processes: Dict[int, SpawnProcess] = {}
+        self.started_at: Dict[int, float] = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._socket: Optional[socket.socket] = None
+        self._stopping = False
+
+    def _spawn(self, slot: int) -> None:
+        process = self._context.Process(
+            target=run_worker, args=(self._socket,), name=f"worker-{slot}"
+        )
+        process.start()
+        self.processes[slot] = process
+        self.started_at[slot] = time.monotonic()
+        logger.info("Started worker %d (pid %d)", slot, process.pid)
+
+    def _handle_signal(self, signum: int, frame: object) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        if not REUSE_PORT:
+            self._socket = bind_socket(reuse_port=False)
+        logger.info(
+            "Serving %s on %s:%d with %d workers (%s)",
+            ASGI_APP,
+            HOST,
+            PORT,
+            self.workers,
+            "SO_REUSEPORT" if REUSE_PORT else "shared socket",
+        )
+        # The workers split the database connection budget between them (see project.db).
+        os.environ["WEB_CONCURRENCY"] = str(self.workers)
+        for slot in range(self.workers):
+            self._spawn(slot)
+        while not self._stopping:
+            time.sleep(0.5)
+            for slot, process in list(self.processes.items()):
+                if process.is_alive() or self._stopping:
+                    continue
+                lifetime = time.monotonic() - self.started_at[slot]
+                if process.exitcode == 0:
+                    logger.info("Worker %d (pid %d) recycled", slot, process.pid)
+                else:
+                    logger.warning(
+                        "Worker %d (pid %d) exited with code %s after %.1fs",
+                        slot,
+                        process.pid,
+                        process.exitcode,
+                        lifetime,
+                    )
+                    if lifetime < MIN_WORKER_LIFETIME:
+                        time.sleep(MIN_WORKER_LIFETIME - lifetime)
+                self._spawn(slot)
+        self.stop()
+
+    def stop(self) -> None:
+        logger.info("Stopping %d workers", len(self.processes))
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        # Leave the workers their graceful timeout plus time for the lifespan shutdown.
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT + 10
+        for slot, process in self.processes.items():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning(
+                    "Worker %d (pid %d) did not stop in time; killing it",
+                    slot,
+                    process.pid,
+                )
+                process.kill()
+                process.join()
+        if self._socket is not None:
+            self._socket.close()
+
+
+def main() -> None:
+    _configure_logging()
+    Launcher(worker_count()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import abc
+import bisect
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import project.query_accounting
+from prisma import Prisma
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(abc.ABC):
+    """
+    Base class of the metric types: a name, help text and label names, rendered in the Prometheus text format.
+
+    Metrics are updated from the event loop thread only, so plain dict and list updates need no
+    locking.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """
+        Returns the metric's lines in the Prometheus text format, header included.
+        """
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        self.values[labels] = value
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """
+    Counts observations into fixed buckets. Each label set gets its bucket counts allocated once,
+    on its first observation; observing is then a binary search and three additions.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # Label values -> [per-bucket counts, with a final +Inf bucket], sum, count.
+        self.series: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        label_names = self.labels + ("le",)
+        for labels, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(label_names, labels + (_format_value(bound),))}"
+                    f" {cumulative}"
+                )
+            suffix = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+Samples = Iterable[Tuple[LabelValues, float]]
+
+
+class CallbackGauge(Metric):
+    """
+    A gauge or counter whose samples are read at scrape time, for state that is already counted elsewhere.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Union[Samples, Awaitable[Samples]]],
+        labels: Sequence[str] = (),
+        type_name: str = "gauge",
+    ):
+        super().__init__(name, documentation, labels)
+        self.collect = collect
+        self.type_name = type_name
+        self.samples: Samples = ()
+
+    async def refresh(self) -> None:
+        samples = self.collect()
+        if isinstance(samples, Awaitable):
+            samples = await samples
+        self.samples = list(samples)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            for labels, value in self.samples
+        ]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self.metrics[metric.name] = metric
+        return metric
+
+    async def render(self) -> bytes:
+        lines: List[str] = []
+        for metric in self.metrics.values():
+            if isinstance(metric, CallbackGauge):
+                await metric.refresh()
+            lines.extend(metric.render())
+        lines.append("")
+        return "\n".join(lines).encode()
+
+
+registry = Registry()
+
+http_requests_total: Counter = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests handled, by method, route and status code.",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration_seconds: Histogram = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from receiving an HTTP request to sending the end of its response.",
+        ("method", "route", "status"),
+    )
+)
+http_requests_in_flight: Gauge = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+)
+db_query_duration_seconds: Histogram = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Duration of Prisma queries, by model and operation.",
+        ("model", "operation", "outcome"),
+    )
+)
+db_queries_in_flight: Gauge = registry.register(
+    Gauge("db_queries_in_flight", "Prisma queries currently running.")
+)
+
+# Called with the model name ("raw" for raw queries) and operation of every query that succeeds.
+query_listeners: List[Callable[[str, str], None]] = []
+
+# Requests that matched no route share one label value, so that scanners cannot blow up the
+# number of series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count, status and latency of every HTTP request by route template.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            labels = (
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                str(status),
+            )
+            http_requests_total.inc(labels)
+            http_request_duration_seconds.observe(time.perf_counter() - started, labels)
+
+
+class InstrumentedPrisma(Prisma):
+    """
+    A Prisma client that times every query it sends to the query engine, by model and operation.
+
+    Raw queries are recorded with the model "raw". Transactions are copies of the client and are
+    instrumented too. Queries are also added to the per-request query accounting, when enabled,
+    and passed to the `query_listeners`.
+    """
+
+    __slots__ = ()
+
+    async def _execute(
+        self,
+        *,
+        method: str,
+        arguments: Dict[str, Any],
+        model: Optional[type] = None,
+        root_selection: Optional[List[str]] = None,
+    ) -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        db_queries_in_flight.inc()
+        try:
+            result = await super()._execute(
+                method=method,
+                arguments=arguments,
+                model=model,
+                root_selection=root_selection,
+            )
+            outcome = "ok"
+            for listener in query_listeners:
+                listener(model.__name__ if model is not None else "raw", method)
+            return result
+        finally:
+            duration = time.perf_counter() - started
+            model_name = model.__name__ if model is not None else "raw"
+            db_queries_in_flight.dec()
+            db_query_duration_seconds.observe(duration, (model_name, method, outcome))
+            project.query_accounting.record(
+                model_name, method, arguments, duration * 1000
+            )
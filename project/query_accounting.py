@@ -0,0 +1,155 @@
+import contextvars
+import json
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+QUERY_ACCOUNTING_ENABLED = (
+    os.getenv("QUERY_ACCOUNTING_ENABLED", "false").lower() == "true"
+)
+# Queries a request may issue before it is flagged, unless QUERY_BUDGETS sets its route's own.
+QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", "3"))
+REPORT_HEADER = "x-query-report"
+
+
+def parse_budgets(spec: str) -> Dict[Tuple[str, str], int]:
+    """
+    Parses QUERY_BUDGETS, a comma-separated list of `METHOD /route/template=budget` entries,
+    e.g. "PUT /helloworld=2,GET /api/errors/{id}=1".
+    """
+    budgets: Dict[Tuple[str, str], int] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        route, _, budget = entry.rpartition("=")
+        method, _, path = route.strip().partition(" ")
+        if not path or not budget.strip().isdigit():
+            raise ValueError(f"Invalid QUERY_BUDGETS entry: {entry!r}")
+        budgets[(method.upper(), path.strip())] = int(budget)
+    return budgets
+
+
+QUERY_BUDGETS = parse_budgets(os.getenv("QUERY_BUDGETS", ""))
+
+
+class RequestQueries:
+    """
+    The Prisma queries issued while handling one request, with their durations.
+
+    A query is identified by its model, operation and arguments; the same identity seen twice in
+    one request is a repeated query, usually a sign that a result could have been reused.
+    """
+
+    __slots__ = ("queries", "_seen")
+
+    def __init__(self) -> None:
+        self.queries: List[Tuple[str, str, float]] = []
+        self._seen: Counter = Counter()
+
+    def record(
+        self, model: str, operation: str, arguments: Dict[str, Any], duration_ms: float
+    ) -> None:
+        self.queries.append((model, operation, duration_ms))
+        key = (model, operation, json.dumps(arguments, sort_keys=True, default=str))
+        self._seen[key] += 1
+
+    @property
+    def total_ms(self) -> float:
+        return sum(duration for _, _, duration in self.queries)
+
+    def repeated(self) -> List[str]:
+        return [
+            f"{model}.{operation}*{count}"
+            for (model, operation, _), count in self._seen.items()
+            if count > 1
+        ]
+
+    def report(self, budget: int) -> str:
+        parts = [
+            f"queries={len(self.queries)}",
+            f"db_ms={self.total_ms:.1f}",
+            f"budget={budget}",
+        ]
+        repeated = self.repeated()
+        if repeated:
+            parts.append(f"repeated={'|'.join(repeated)}")
+        return "; ".join(parts)
+
+
+_current: contextvars.ContextVar[Optional[RequestQueries]] = contextvars.ContextVar(
+    "request_queries", default=None
+)
+
+
+def record(
+    model: str, operation: str, arguments: Dict[str, Any], duration_ms: float
+) -> None:
+    """
+    Adds a finished query to the accounting of the request being handled, if any.
+    """
+    queries = _current.get()
+    if queries is not None:
+        queries.record(model, operation, arguments, duration_ms)
+
+
+def budget_for(method: str, route: str) -> int:
+    return QUERY_BUDGETS.get((method, route), QUERY_BUDGET_DEFAULT)
+
+
+class QueryAccountingMiddleware:
+    """
+    ASGI middleware that counts the Prisma queries of each request when QUERY_ACCOUNTING_ENABLED is set.
+
+    The report is sent in an X-Query-Report header, as far as the response has got when its headers
+    are sent, and logged once the request finishes: as a warning if the request exceeded its
+    route's budget or repeated a query, else at debug level.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not QUERY_ACCOUNTING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        queries = RequestQueries()
+        token = _current.set(queries)
+
+        def route() -> str:
+            matched = scope.get("route")
+            return matched.path if matched is not None else scope["path"]
+
+        async def send_with_report(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                budget = budget_for(scope["method"], route())
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REPORT_HEADER.encode(), queries.report(budget).encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_report)
+        finally:
+            _current.reset(token)
+            method, path = scope["method"], route()
+            budget = budget_for(method, path)
+            if len(queries.queries) > budget or queries.repeated():
+                logger.warning(
+                    "%s %s issued %d queries (budget %d): %s; %s",
+                    method,
+                    path,
+                    len(queries.queries),
+                    budget,
+                    queries.report(budget),
+                    ", ".join(
+                        f"{model}.{operation} {duration:.1f}ms"
+                        for model, operation, duration in queries.queries
+                    ),
+                )
+            else:
+                logger.debug("%s %s: %s", method, path, queries.report(budget))
@@ -0,0 +1,275 @@
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+import prisma
+import project.db
+import project.exception_handling
+import project.metrics
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# A read-only (streaming replica) database for the read services. Unset, every query goes to
+# DATABASE_URL.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+# Replication lag, in seconds, beyond which reads go back to the primary.
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+DB_REPLICA_CHECK_TIMEOUT = float(os.getenv("DB_REPLICA_CHECK_TIMEOUT", "2"))
+# Seconds after a write during which the writer's reads, and reloads of cached data of the
+# written model, go to the primary.
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+
+READ_PRIMARY_HEADER = "x-read-primary"
+READ_PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+WRITE_OPERATIONS = frozenset(
+    (
+        "create",
+        "create_many",
+        "update",
+        "update_many",
+        "upsert",
+        "delete",
+        "delete_many",
+    )
+)
+
+# Errors meaning the replica cannot be reached, after which the query is retried on the primary.
+UNAVAILABLE_ERRORS = tuple(
+    exc
+    for exc, status in project.exception_handling.EXCEPTION_STATUS_CODES
+    if status == 503
+)
+
+# The lag is zero when the replica has replayed everything it received, even if the primary
+# has not written for a while.
+LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END::float8 AS lag_seconds
+"""
+
+_read_primary: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "read_primary", default=False
+)
+# Set while checking the replica, whose queries must fail rather than fall back to the primary.
+_checking: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "checking_replica", default=False
+)
+
+
+class ReplicaPrisma(project.metrics.InstrumentedPrisma):
+    """
+    The Prisma client of the read replica. A query that fails because the replica is unreachable is run again on the primary, and the replica is marked unavailable until its next successful check.
+    """
+
+    __slots__ = ()
+
+    async def _execute(self, **kwargs: Any) -> Any:
+        try:
+            return await super()._execute(**kwargs)
+        except UNAVAILABLE_ERRORS as exc:
+            if _checking.get():
+                raise
+            router.mark_unavailable(f"Query failed: {exc!r}")
+            router.fallbacks += 1
+            return await project.db.db_client._execute(**kwargs)
+
+
+replica_client: Optional[ReplicaPrisma] = None
+if DATABASE_REPLICA_URL:
+    replica_client = ReplicaPrisma(
+        datasource={"url": project.db.pooled_database_url(DATABASE_REPLICA_URL)},
+        connect_timeout=timedelta(seconds=project.db.DB_ENGINE_CONNECT_TIMEOUT),
+    )
+
+
+class ReplicaRouter:
+    """
+    Decides whether a read goes to the replica or the primary, and checks the replica's health and lag in the background.
+
+    Reads go to the primary when no replica is configured, when the last check failed or found
+    the replica lagging by more than `max_lag` seconds, when the request asked for it (see
+    ReadRoutingMiddleware), or, for callers naming the model they read, when this process wrote
+    to that model within the read-your-writes window. The last case keeps caches from reloading
+    a value the replica has not caught up with yet.
+    """
+
+    def __init__(
+        self,
+        interval: float = DB_REPLICA_CHECK_INTERVAL,
+        timeout: float = DB_REPLICA_CHECK_TIMEOUT,
+        max_lag: float = DB_REPLICA_MAX_LAG,
+        window: float = READ_YOUR_WRITES_WINDOW,
+    ) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.max_lag = max_lag
+        self.window = window
+        self.available = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+        self._written_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def configured(self) -> bool:
+        return replica_client is not None
+
+    def note_query(self, model: str, operation: str) -> None:
+        if operation in WRITE_OPERATIONS:
+            self._written_at[model] = time.monotonic()
+
+    def recently_written(self, model: str) -> bool:
+        written_at = self._written_at.get(model)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+    def client(self, model: Optional[str] = None) -> prisma.Prisma:
+        """
+        Returns the client to read with: the replica if it is usable for this read, else the primary.
+
+        Args:
+            model (Optional[str]): The model read, for reads whose result is cached; reads of a
+                model this process wrote within the read-your-writes window go to the primary.
+        """
+        if (
+            replica_client is None
+            or not self.available
+            or _read_primary.get()
+            or (model is not None and self.recently_written(model))
+        ):
+            self.primary_reads += 1
+            return project.db.db_client
+        self.replica_reads += 1
+        return replica_client
+
+    def mark_unavailable(self, error: str) -> None:
+        if self.available:
+            logger.warning(
+                "Read replica unavailable, reading from the primary: %s", error
+            )
+        self.available = False
+        self.error = error
+
+    async def check(self) -> None:
+        if replica_client is None:
+            return
+        token = _checking.set(True)
+        try:
+            async with asyncio.timeout(self.timeout):
+                if not replica_client.is_connected():
+                    await replica_client.connect()
+                rows = await replica_client.query_raw(LAG_QUERY)
+        except Exception as exc:
+            self.lag_seconds = None
+            self.mark_unavailable(
+                f"Replica did not respond within {self.timeout}s."
+                if isinstance(exc, TimeoutError)
+                else f"Replica check failed: {exc}"
+            )
+            return
+        finally:
+            _checking.reset(token)
+        self.lag_seconds = float(rows[0]["lag_seconds"])
+        if self.lag_seconds > self.max_lag:
+            self.mark_unavailable(
+                f"Replica lags {self.lag_seconds:.1f}s behind, over {self.max_lag:g}s."
+            )
+            return
+        if not self.available:
+            logger.info("Reading from the replica (lag %.2fs)", self.lag_seconds)
+        self.available = True
+        self.error = None
+
+    async def start(self) -> None:
+        """
+        Connects the replica client and checks it once, so reads use it from the first request, then keeps checking in the background.
+        """
+        if replica_client is None:
+            return
+        await self.check()
+        if not self.available:
+            logger.warning("Read replica not in use yet: %s", self.error)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if replica_client is not None and replica_client.is_connected():
+            await replica_client.disconnect()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+
+router = ReplicaRouter()
+project.metrics.query_listeners.append(router.note_query)
+
+
+def read_client(model: Optional[str] = None) -> prisma.Prisma:
+    """
+    Returns the Prisma client read-only services should query; see ReplicaRouter.client.
+    """
+    return router.client(model)
+
+
+class ReadRoutingMiddleware:
+    """
+    ASGI middleware that sends a request's reads to the primary when the request needs to see its client's recent writes.
+
+    That is the case for requests that are not GET, HEAD or OPTIONS, for requests with an
+    X-Read-Primary header, and for requests carrying the read_primary_until cookie, which a
+    successful write request sets for READ_YOUR_WRITES_WINDOW seconds. It does nothing unless a
+    replica is configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not router.configured:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        writes = scope["method"] not in SAFE_METHODS
+        read_primary = writes or READ_PRIMARY_HEADER in headers
+        if not read_primary and "cookie" in headers:
+            until = cookie_parser(headers["cookie"]).get(READ_PRIMARY_COOKIE, "")
+            read_primary = until.isdigit() and int(until) > time.time()
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = int(router.window)
+                cookie = (
+                    f"{READ_PRIMARY_COOKIE}={int(time.time()) + window}; "
+                    f"Max-Age={window}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode())
+                ]
+            await send(message)
+
+        token = _read_primary.set(read_primary)
+        try:
+            await self.app(scope, receive, send_with_cookie if writes else send)
+        finally:
+            _read_primary.reset(token)
@@ -0,0 +1,15 @@
+import project.error_retention
+
+
+async def run_error_retention() -> project.error_retention.RetentionReport:
+    """
+    This endpoint runs the error retention job immediately instead of waiting for its next scheduled run. Errors older than the configured maximum age, and the oldest errors beyond the configured row cap, are deleted or archived in small batches.
+
+    Returns:
+        project.error_retention.RetentionReport: The number of rows removed and archived, the number of batches and the time spent.
+
+    Example:
+        report = await run_error_retention()
+        > RetentionReport(rows_removed=12000, rows_archived=0, batches=12, duration_ms=840.2)
+    """
+    return await project.error_retention.retention_job.run_once()
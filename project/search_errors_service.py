@@ -0,0 +1,124 @@
+from enum import Enum
+from typing import List, Optional
+
+import project.exceptions
+import project.read_replica
+from pydantic import BaseModel
+
+MAX_SEARCH_RESULTS = 100
+
+MAX_SEARCH_OFFSET = 1000
+
+_SELECT = """
+    SELECT id, code, "errorMessage", resolution, {rank} AS rank
+    FROM "ErrorHandlingModule"{source}
+    WHERE {condition}
+    ORDER BY rank DESC, id DESC
+    LIMIT $2 OFFSET $3
+"""
+
+_TEXT_QUERY = _SELECT.format(
+    rank='ts_rank("searchVector", query)',
+    source=", websearch_to_tsquery('english', $1) AS query",
+    condition='"searchVector" @@ query',
+)
+
+_SUBSTRING_QUERY = _SELECT.format(
+    rank='GREATEST(similarity("errorMessage", $4), similarity(resolution, $4))',
+    source="",
+    condition="\"errorMessage\" ILIKE $1 ESCAPE '\\' OR resolution ILIKE $1 ESCAPE '\\'",
+)
+
+_FUZZY_QUERY = _SELECT.format(
+    rank='GREATEST(similarity("errorMessage", $1), similarity(resolution, $1))',
+    source="",
+    condition='"errorMessage" % $1 OR resolution % $1',
+)
+
+
+class SearchMode(str, Enum):
+    """
+    How the search query is matched against error messages and resolutions.
+
+    TEXT is a ranked full-text search supporting quoted phrases, OR and -exclusions. SUBSTRING
+    matches the query anywhere in the text, case-insensitively. FUZZY matches text that is
+    similar to the query, tolerating typos.
+    """
+
+    TEXT = "text"
+    SUBSTRING = "substring"
+    FUZZY = "fuzzy"
+
+
+class ErrorSearchResult(BaseModel):
+    """
+    An error matching a search query, with its relevance rank.
+    """
+
+    id: int
+    code: int
+    errorMessage: str
+    resolution: str
+    rank: float
+
+
+class SearchErrorsResponseModel(BaseModel):
+    """
+    A response model that returns a page of errors matching a search query, most relevant first, and the offset of the next page if there is one.
+    """
+
+    results: List[ErrorSearchResult]
+    next_offset: Optional[int] = None
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def search_errors(
+    query: str,
+    mode: SearchMode = SearchMode.TEXT,
+    limit: int = 20,
+    offset: int = 0,
+) -> SearchErrorsResponseModel:
+    """
+    This endpoint searches the message and resolution of the errors recorded by the ErrorHandlingModule and returns ranked, paginated results. Full-text queries use the GIN index on the generated search vector; substring and fuzzy queries use the trigram indexes, so none of them scans the table.
+
+    Args:
+        query (str): The text to search for.
+        mode (SearchMode): How the query is matched: ranked full-text, case-insensitive substring or fuzzy similarity.
+        limit (int): The maximum number of results to return, between 1 and MAX_SEARCH_RESULTS.
+        offset (int): The number of results to skip, at most MAX_SEARCH_OFFSET.
+
+    Returns:
+        SearchErrorsResponseModel: A response model that returns a page of errors matching a search query, most relevant first, and the offset of the next page if there is one.
+
+    Example:
+        response = await search_errors("connection timeout")
+        > SearchErrorsResponseModel(results=[ErrorSearchResult(id=42, code=504, errorMessage='Upstream connection timeout', resolution='', rank=0.0607)], next_offset=None)
+    """
+    if not query.strip():
+        raise project.exceptions.BadRequestError("The search query must not be empty.")
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        raise project.exceptions.BadRequestError(
+            f"limit must be between 1 and {MAX_SEARCH_RESULTS}."
+        )
+    if not 0 <= offset <= MAX_SEARCH_OFFSET:
+        raise project.exceptions.BadRequestError(
+            f"offset must be between 0 and {MAX_SEARCH_OFFSET}."
+        )
+    client = project.read_replica.read_client()
+    # Fetch one row past the page to learn whether another page follows.
+    if mode is SearchMode.TEXT:
+        rows = await client.query_raw(_TEXT_QUERY, query, limit + 1, offset)
+    elif mode is SearchMode.SUBSTRING:
+        rows = await client.query_raw(
+            _SUBSTRING_QUERY, _like_pattern(query), limit + 1, offset, query
+        )
+    else:
+        rows = await client.query_raw(_FUZZY_QUERY, query, limit + 1, offset)
+    return SearchErrorsResponseModel(
+        results=[ErrorSearchResult(**row) for row in rows[:limit]],
+        next_offset=offset + limit if len(rows) > limit else None,
+    )
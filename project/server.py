@@ -1,39 +1,73 @@
-import logging
 from contextlib import asynccontextmanager
+from datetime import datetime
 
 import prisma
 import prisma.enums
+import project.bulk_delete_errors_service
+import project.bulk_update_errors_service
+import project.change_notifications
 import project.create_error_service
 import project.create_health_status_service
 import project.createHelloWorld_service
+import project.db
 import project.delete_error_service
 import project.delete_health_status_service
 import project.deleteHelloWorld_service
+import project.error_filters
+import project.error_ingestion
+import project.error_retention
+import project.exception_handling
+import project.export_errors_service
+import project.get_db_pool_stats_service
 import project.get_error_by_id_service
 import project.get_errors_service
+import project.get_health_history_service
 import project.get_health_status_service
 import project.get_hello_world_service
+import project.get_liveness_service
+import project.get_metrics_service
+import project.get_readiness_service
+import project.get_top_errors_service
 import project.getDocumentation_service
 import project.getHelloWorld_service
 import project.getHelloWorldJson_service
+import project.health_prober
+import project.hello_world_cache
+import project.hello_world_stream
+import project.metrics
+import project.query_accounting
+import project.read_replica
+import project.run_error_retention_service
+import project.search_errors_service
 import project.update_error_service
 import project.update_health_status_service
 import project.updateHelloWorld_service
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, Query
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import Response
-from prisma import Prisma
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
-logger = logging.getLogger(__name__)
-
-db_client = Prisma(auto_register=True)
+change_listener = project.change_notifications.ChangeListener(project.db.DATABASE_URL)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await db_client.connect()
+    await project.db.connect()
+    await project.read_replica.router.start()
+    await project.hello_world_cache.message_cache.load()
+    project.getDocumentation_service.register_routes(app.routes)
+    await project.getDocumentation_service.documentation_cache.load()
+    if project.change_notifications.CHANGE_NOTIFICATIONS_ENABLED:
+        change_listener.start()
+    project.error_ingestion.error_queue.start()
+    project.error_retention.retention_job.start()
+    await project.health_prober.prober.start()
     yield
-    await db_client.disconnect()
+    await project.health_prober.prober.stop()
+    await project.error_retention.retention_job.stop()
+    await project.error_ingestion.error_queue.stop()
+    await change_listener.stop()
+    await project.read_replica.router.stop()
+    await project.db.disconnect()
 
 
 app = FastAPI(
@@ -41,6 +75,10 @@ app = FastAPI(
     lifespan=lifespan,
     description="create an api that returns just hello world.",
 )
+app.router.route_class = project.exception_handling.ServiceRoute
+app.add_middleware(project.metrics.MetricsMiddleware)
+app.add_middleware(project.query_accounting.QueryAccountingMiddleware)
+app.add_middleware(project.read_replica.ReadRoutingMiddleware)
 
 
 @app.post(
@@ -53,18 +91,8 @@ async def api_post_createHelloWorld(
     """
     This endpoint allows the creation of a new 'Hello, World!' message. It accepts a JSON payload with a 'message' field. This new message can then be fetched via the GET endpoints. Only admin users can create new messages.
     """
-    try:
-        res = project.createHelloWorld_service.createHelloWorld(message, responseType)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.createHelloWorld_service.createHelloWorld(message, responseType)
+    return res
 
 
 @app.put(
@@ -77,18 +105,8 @@ async def api_put_update_error(
     """
     This endpoint updates an existing error message by its ID. It accepts a JSON object with updated 'code' and 'message' fields and the ID of the error to update in the URL path. The expected response is the updated error object.
     """
-    try:
-        res = await project.update_error_service.update_error(id, code, message)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.update_error_service.update_error(id, code, message)
+    return res
 
 
 @app.get(
@@ -100,18 +118,8 @@ async def api_get_get_hello_world(
     """
     This endpoint returns a simple 'Hello World' message. It doesn't require any input parameters and returns a JSON object containing the message. The purpose is to verify that the API is working correctly.
     """
-    try:
-        res = project.get_hello_world_service.get_hello_world(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.get_hello_world_service.get_hello_world(request)
+    return res
 
 
 @app.delete(
@@ -124,18 +132,8 @@ async def api_delete_delete_error(
     """
     This endpoint deletes an existing error message by its ID. It is mainly used by administrators to clean up old or resolved errors. The expected response is a success message indicating the error has been deleted.
     """
-    try:
-        res = await project.delete_error_service.delete_error(id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.delete_error_service.delete_error(id)
+    return res
 
 
 @app.post(
@@ -147,20 +145,10 @@ async def api_post_create_health_status(
     """
     This endpoint is meant for updating or initiating new health status entry for the API logging purpose. Expected response is a confirmation message that the health status entry was created. Generally, this won't be typically used frequently and is kept primarily for administrative use.
     """
-    try:
-        res = project.create_health_status_service.create_health_status(
-            statusMessage, adminId
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.create_health_status_service.create_health_status(
+        statusMessage, adminId
+    )
+    return res
 
 
 @app.delete(
@@ -173,18 +161,8 @@ async def api_delete_deleteHelloWorld(
     """
     This endpoint allows deleting the 'Hello, World!' message. It's a destructive operation and hence restricted to admin users only. After deletion, the GET endpoints will no longer return the message.
     """
-    try:
-        res = project.deleteHelloWorld_service.deleteHelloWorld(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.deleteHelloWorld_service.deleteHelloWorld(request)
+    return res
 
 
 @app.get(
@@ -192,22 +170,29 @@ async def api_delete_deleteHelloWorld(
 )
 async def api_get_getHelloWorld(
     request: project.getHelloWorld_service.HelloWorldRequestModel,
+    if_none_match: str | None = Header(default=None),
 ) -> project.getHelloWorld_service.HelloWorldResponseModel | Response:
     """
     This endpoint returns a simple 'Hello, World!' message in plain text. It doesn't accept any parameters and is accessible to all users and admins.
     """
-    try:
-        res = await project.getHelloWorld_service.getHelloWorld(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getHelloWorld_service.getHelloWorldEncoded(request)
+    return res.to_response(if_none_match)
+
+
+@app.get(
+    "/helloworld/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def api_get_streamHelloWorld() -> StreamingResponse:
+    """
+    This endpoint streams the 'Hello, World!' message as server-sent events. The current message is sent on connect and every new message is pushed as soon as it is updated, so clients no longer need to poll GET /helloworld.
+    """
+    return StreamingResponse(
+        project.hello_world_stream.stream_messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.put(
@@ -220,20 +205,8 @@ async def api_put_update_health_status(
     """
     This endpoint allows updating the existing health status entry. It would accept relevant health data in the request body and update the current status accordingly. Expected response is a confirmation message that the health status was updated. It is primarily intended for maintenance purposes.
     """
-    try:
-        res = await project.update_health_status_service.update_health_status(
-            statusMessage
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.update_health_status_service.update_health_status(statusMessage)
+    return res
 
 
 @app.put(
@@ -246,18 +219,8 @@ async def api_put_updateHelloWorld(
     """
     This endpoint allows updating the 'Hello, World!' message. It expects a JSON payload with an updated 'message' field. Like the creation endpoint, this is restricted to admin users.
     """
-    try:
-        res = await project.updateHelloWorld_service.updateHelloWorld(message)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.updateHelloWorld_service.updateHelloWorld(message)
+    return res
 
 
 @app.get(
@@ -266,22 +229,13 @@ async def api_put_updateHelloWorld(
 )
 async def api_get_getHelloWorldJson(
     request: project.getHelloWorldJson_service.HelloWorldRequest,
+    if_none_match: str | None = Header(default=None),
 ) -> project.getHelloWorldJson_service.HelloWorldResponse | Response:
     """
     This endpoint returns a JSON object containing the 'Hello, World!' message. The response format is {'message': 'Hello, World!'}. This endpoint is also open to all users and admins.
     """
-    try:
-        res = await project.getHelloWorldJson_service.getHelloWorldJson(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getHelloWorldJson_service.getHelloWorldJsonEncoded(request)
+    return res.to_response(if_none_match)
 
 
 @app.get(
@@ -289,22 +243,23 @@ async def api_get_getHelloWorldJson(
 )
 async def api_get_get_errors(
     request: project.get_errors_service.GetErrorsRequestModel,
+    limit: int = Query(
+        default=project.get_errors_service.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=project.get_errors_service.MAX_PAGE_SIZE,
+    ),
+    cursor: int | None = None,
+    code: int | None = None,
+    min_id: int | None = None,
+    max_id: int | None = None,
 ) -> project.get_errors_service.ErrorListResponseModel | Response:
     """
-    This endpoint retrieves a list of all error messages recorded by the ErrorHandlingModule. It is meant for use by administrators to review and manage errors. The expected response is a JSON array of error objects.
+    This endpoint retrieves a page of the error messages recorded by the ErrorHandlingModule, ordered by ID and optionally filtered by code and ID range. Pass the returned 'next_cursor' as 'cursor' to fetch the next page. It is meant for use by administrators to review and manage errors. The expected response is a JSON array of error objects.
     """
-    try:
-        res = await project.get_errors_service.get_errors(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.get_errors_service.get_errors(
+        request, limit, cursor, code, min_id, max_id
+    )
+    return res
 
 
 @app.get(
@@ -316,39 +271,228 @@ async def api_get_get_health_status(
     """
     This endpoint checks the health status of the API. When called, it returns a simple JSON object that indicates if the API is running correctly. Expected response is a JSON object with a 'status' key set to 'ok'. In case of failure, it interacts with the ErrorHandlingModule to return appropriate status messages.
     """
-    try:
-        res = await project.get_health_status_service.get_health_status(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.post("/api/errors", response_model=project.create_error_service.ErrorResponse)
+    res = await project.get_health_status_service.get_health_status(request)
+    return res
+
+
+@app.get(
+    "/health/live", response_model=project.get_liveness_service.LivenessResponseModel
+)
+async def api_get_get_liveness() -> (
+    project.get_liveness_service.LivenessResponseModel | Response
+):
+    """
+    Liveness probe. Reports that the process is serving requests without touching the database.
+    """
+    res = await project.get_liveness_service.get_liveness()
+    return res
+
+
+@app.get(
+    "/health/ready",
+    response_model=project.get_readiness_service.ReadinessResponseModel,
+    responses={503: {"model": project.get_readiness_service.ReadinessResponseModel}},
+)
+async def api_get_get_readiness() -> (
+    project.get_readiness_service.ReadinessResponseModel | Response
+):
+    """
+    Readiness probe. Served from the background health prober's latest snapshot; responds with 503 while the database is unreachable, too slow, or the snapshot is stale.
+    """
+    res = await project.get_readiness_service.get_readiness()
+    if not res.ready:
+        return JSONResponse(content=jsonable_encoder(res), status_code=503)
+    return res
+
+
+@app.get("/metrics", response_class=Response)
+async def api_get_get_metrics() -> Response:
+    """
+    This endpoint exposes request, query and internal counters in the Prometheus text format, for scraping by a monitoring system.
+    """
+    res = await project.get_metrics_service.get_metrics()
+    return Response(content=res, media_type=project.metrics.CONTENT_TYPE)
+
+
+@app.get(
+    "/api/db/pool-stats",
+    response_model=project.get_db_pool_stats_service.DbPoolStatsResponseModel,
+)
+async def api_get_get_db_pool_stats() -> (
+    project.get_db_pool_stats_service.DbPoolStatsResponseModel | Response
+):
+    """
+    This endpoint reports this worker's database connection pool utilization and the time queries wait for a connection. It is meant for administrators sizing DB_CONNECTION_LIMIT.
+    """
+    res = await project.get_db_pool_stats_service.get_db_pool_stats()
+    return res
+
+
+@app.get(
+    "/health/history",
+    response_model=project.get_health_history_service.HealthHistoryResponseModel,
+)
+async def api_get_get_health_history(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    resolution: project.get_health_history_service.HistoryResolution | None = None,
+) -> project.get_health_history_service.HealthHistoryResponseModel | Response:
+    """
+    This endpoint returns this instance's recorded health probes (status, database round-trip time and event-loop lag) between 'start' and 'end', downsampled to per-minute or per-hour points for older ranges. Defaults to the last hour.
+    """
+    res = await project.get_health_history_service.get_health_history(
+        start, end, resolution
+    )
+    return res
+
+
+@app.post(
+    "/api/errors",
+    response_model=project.create_error_service.ErrorResponse,
+    responses={202: {"model": project.create_error_service.ErrorAcceptedResponse}},
+)
 async def api_post_create_error(
-    code: int, message: str
+    code: int,
+    message: str,
+    fire_and_forget: bool = False,
+    dedup: bool | None = None,
 ) -> project.create_error_service.ErrorResponse | Response:
     """
-    This endpoint allows for the creation of a new error message. It is used internally by other modules to log errors. It accepts a JSON object with 'code' and 'message' fields as input and returns the created error object with a unique ID.
+    This endpoint allows for the creation of a new error message. It is used internally by other modules to log errors. It accepts a JSON object with 'code' and 'message' fields as input and returns the created error object with a unique ID. With 'fire_and_forget' set, the error is queued and written in a batch in the background, and the endpoint answers 202 without an ID. With 'dedup' set, repeats of the same code and message are counted in a single row.
+    """
+    if fire_and_forget:
+        res = await project.create_error_service.enqueue_error(code, message, dedup)
+        return JSONResponse(content=res.model_dump(), status_code=202)
+    res = await project.create_error_service.create_error(code, message, dedup)
+    return res
+
+
+@app.post(
+    "/api/errors/bulk-update",
+    response_model=project.bulk_update_errors_service.BulkUpdateErrorsResponseModel,
+)
+async def api_post_bulk_update_errors(
+    request: project.bulk_update_errors_service.BulkUpdateErrorsRequestModel,
+) -> project.bulk_update_errors_service.BulkUpdateErrorsResponseModel | Response:
+    """
+    This endpoint resolves or updates many errors at once. It accepts a selection of errors, either a list of IDs or a filter on code and ID range, and the 'resolution', 'code' or 'errorMessage' to apply. The change runs as a single statement on at most a bounded number of errors; the response reports the affected count and whether more errors remain.
+    """
+    res = await project.bulk_update_errors_service.bulk_update_errors(request)
+    return res
+
+
+@app.post(
+    "/api/errors/bulk-delete",
+    response_model=project.bulk_delete_errors_service.BulkDeleteErrorsResponseModel,
+)
+async def api_post_bulk_delete_errors(
+    request: project.error_filters.ErrorSelectionModel,
+) -> project.bulk_delete_errors_service.BulkDeleteErrorsResponseModel | Response:
+    """
+    This endpoint deletes many errors at once. It accepts a selection of errors, either a list of IDs or a filter on code and ID range. The delete runs as a single statement on at most a bounded number of errors; the response reports the affected count and whether more errors remain. It is intended for administrative clean-up purposes.
+    """
+    res = await project.bulk_delete_errors_service.bulk_delete_errors(request)
+    return res
+
+
+@app.post(
+    "/api/errors/retention",
+    response_model=project.error_retention.RetentionReport,
+)
+async def api_post_run_error_retention() -> (
+    project.error_retention.RetentionReport | Response
+):
+    """
+    This endpoint runs the error retention job immediately. Errors past the configured maximum age, and the oldest errors beyond the configured row cap, are deleted or archived in small batches. The expected response reports the rows removed and the time spent. It is intended for administrative clean-up purposes.
+    """
+    res = await project.run_error_retention_service.run_error_retention()
+    return res
+
+
+@app.get(
+    "/api/errors/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                "application/x-ndjson": {},
+                "text/csv": {},
+                "application/gzip": {},
+            }
+        }
+    },
+)
+async def api_get_export_errors(
+    format: project.export_errors_service.ExportFormat = project.export_errors_service.ExportFormat.NDJSON,
+    gzip: bool = False,
+    code: int | None = None,
+    min_id: int | None = None,
+    max_id: int | None = None,
+) -> StreamingResponse:
+    """
+    This endpoint streams the errors recorded by the ErrorHandlingModule as an NDJSON or CSV download, optionally gzip-compressed and filtered by code and ID range. Rows are read from the database in chunks and sent as they are encoded, so exports of any size start immediately and use constant server memory. It is meant for offline analysis by administrators.
+    """
+    filename = f"errors.{format.value}"
+    media_type = project.export_errors_service.EXPORT_MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        project.export_errors_service.export_errors(format, gzip, code, min_id, max_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get(
+    "/api/errors/search",
+    response_model=project.search_errors_service.SearchErrorsResponseModel,
+)
+async def api_get_search_errors(
+    q: str,
+    mode: project.search_errors_service.SearchMode = project.search_errors_service.SearchMode.TEXT,
+    limit: int = Query(
+        default=20, ge=1, le=project.search_errors_service.MAX_SEARCH_RESULTS
+    ),
+    offset: int = Query(
+        default=0, ge=0, le=project.search_errors_service.MAX_SEARCH_OFFSET
+    ),
+) -> project.search_errors_service.SearchErrorsResponseModel | Response:
+    """
+    This endpoint searches the messages and resolutions of recorded errors. 'mode' selects a ranked full-text search, a case-insensitive substring match or a typo-tolerant fuzzy match. The expected response is a page of matching error objects, most relevant first, and the offset of the next page.
+    """
+    res = await project.search_errors_service.search_errors(q, mode, limit, offset)
+    return res
+
+
+@app.get(
+    "/api/errors/top",
+    response_model=project.get_top_errors_service.TopErrorsResponseModel,
+)
+async def api_get_get_top_errors(
+    limit: int = Query(
+        default=10, ge=1, le=project.get_top_errors_service.MAX_TOP_ERRORS
+    ),
+) -> project.get_top_errors_service.TopErrorsResponseModel | Response:
+    """
+    This endpoint returns the most frequent deduplicated errors, ordered by how often they occurred. It is meant for administrators triaging incidents.
+    """
+    res = await project.get_top_errors_service.get_top_errors(limit)
+    return res
+
+
+@app.get(
+    "/api/errors/cache-stats",
+    response_model=project.get_error_by_id_service.ErrorCacheStatsResponseModel,
+)
+async def api_get_get_error_cache_stats() -> (
+    project.get_error_by_id_service.ErrorCacheStatsResponseModel | Response
+):
+    """
+    This endpoint reports the hit, miss and eviction counters of the in-process cache in front of GET /api/errors/{id}. It is meant for administrators tuning the cache size and TTLs.
     """
-    try:
-        res = await project.create_error_service.create_error(code, message)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.get_error_by_id_service.get_error_cache_stats()
+    return res
 
 
 @app.get(
@@ -361,18 +505,8 @@ async def api_get_get_error_by_id(
     """
     This endpoint retrieves a specific error message by its ID. It is useful for viewing detailed information about a single error. The expected response is a JSON object containing the error details.
     """
-    try:
-        res = await project.get_error_by_id_service.get_error_by_id(id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.get_error_by_id_service.get_error_by_id(id)
+    return res
 
 
 @app.get(
@@ -380,22 +514,14 @@ async def api_get_get_error_by_id(
 )
 async def api_get_getDocumentation(
     request: project.getDocumentation_service.GetApiDocsRequest,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
 ) -> project.getDocumentation_service.GetApiDocsResponse | Response:
     """
-    This endpoint provides the documentation for the 'Hello, World!' API. It interacts with the HelloWorldModule to fetch endpoint details and returns them in a structured format. It's designed to be publicly accessible, allowing users and developers to understand how to interact with the API.
+    This endpoint provides the documentation for the 'Hello, World!' API. It lists every endpoint with its method and description, generated from the route table at startup and merged with the DocumentationModule overrides. It's designed to be publicly accessible, allowing users and developers to understand how to interact with the API.
     """
-    try:
-        res = await project.getDocumentation_service.getDocumentation(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getDocumentation_service.getDocumentationEncoded(request)
+    return res.to_response(if_none_match, accept_encoding)
 
 
 @app.delete(
@@ -408,15 +534,5 @@ async def api_delete_delete_health_status(
     """
     This endpoint allows deletion of the existing health status entry from the logging system. Expected response is a confirmation message that the health status was deleted. It is intended for administrative clean-up purposes.
     """
-    try:
-        res = await project.delete_health_status_service.delete_health_status(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.delete_health_status_service.delete_health_status(request)
+    return res
@@ -0,0 +1,85 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# Seconds a shared call may run before it fails, with TimeoutError, for every caller waiting on it.
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "10"))
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls for the same key into one: the first caller starts the call and every caller that asks for the key before it finishes awaits the same result.
+
+    The call runs in its own task, so a caller that is cancelled, e.g. because its client went
+    away, does not cancel it for the others. It is bounded by `timeout`; an exception, including
+    the TimeoutError, is raised to every caller that shared the call. Nothing is kept once the
+    call finishes: the next caller for the key starts a new one. Writers call `forget` after
+    changing the data a key reads, so that callers arriving after the write do not share a call
+    that may have read it before.
+    """
+
+    def __init__(self, name: str, timeout: float = SINGLE_FLIGHT_TIMEOUT) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.executed = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._calls: Dict[Hashable, "asyncio.Task[T]"] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """
+        The share of callers that were served by another caller's call.
+        """
+        callers = self.executed + self.coalesced
+        return self.coalesced / callers if callers else 0.0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(call))
+            self._calls[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Detaches the in-flight call for `key`, if any: callers already waiting on it still get its result, later callers start a new call.
+        """
+        self._calls.pop(key, None)
+
+    def forget_all(self) -> None:
+        self._calls.clear()
+
+    async def _run(self, call: Callable[[], Awaitable[T]]) -> T:
+        async with asyncio.timeout(self.timeout):
+            return await call()
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieving the exception here keeps asyncio from reporting it as never retrieved when
+        # every caller was cancelled.
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+
+
+groups: Dict[str, SingleFlight[Any]] = {}
+
+
+def group(name: str, timeout: float = SINGLE_FLIGHT_TIMEOUT) -> SingleFlight[Any]:
+    """
+    Returns the single-flight group called `name`, creating it on first use. Each group is reported separately in the metrics.
+    """
+    if name not in groups:
+        groups[name] = SingleFlight(name, timeout)
+    return groups[name]
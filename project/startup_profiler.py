@@ -0,0 +1,146 @@
+import importlib.abc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+# Where to write the startup report as JSON, in addition to logging it.
+STARTUP_PROFILE_OUTPUT = os.getenv("STARTUP_PROFILE_OUTPUT", "")
+STARTUP_PROFILE_TOP = int(os.getenv("STARTUP_PROFILE_TOP", "25"))
+
+
+class _TimedLoader:
+    """
+    Wraps a module loader to time `exec_module`, i.e. running the module's top-level code.
+    """
+
+    def __init__(self, loader: Any, profiler: "StartupProfiler") -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        self._profiler.enter()
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.leave(module.__name__, time.perf_counter() - started)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self._profiler = profiler
+
+    def find_spec(
+        self, fullname: str, path: Optional[Sequence[str]], target: Any = None
+    ) -> Any:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Records how long each module takes to import and when the app became ready and served its first request.
+
+    Import times are measured around each module's top-level code. `cumulative_ms` includes the
+    modules it imported in turn; `self_ms` excludes them. Timestamps are relative to when the
+    profiler was created, which is as early in start-up as the entry point allows.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self.milestones: Dict[str, float] = {}
+        # Per thread, the time spent so far in the nested imports of each module being imported.
+        self._local = threading.local()
+        self._finder: Optional[_TimingFinder] = None
+
+    def install(self) -> None:
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def _stack(self) -> List[float]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def enter(self) -> None:
+        self._stack().append(0.0)
+
+    def leave(self, name: str, elapsed: float) -> None:
+        stack = self._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.imports[name] = {
+            "cumulative_ms": elapsed * 1000,
+            "self_ms": (elapsed - children) * 1000,
+        }
+
+    def mark(self, milestone: str) -> None:
+        """
+        Records that a start-up milestone was reached, e.g. "app_imported" or "first_request".
+        """
+        self.milestones.setdefault(
+            milestone, (time.perf_counter() - self.started) * 1000
+        )
+
+    def report(self, top: int = STARTUP_PROFILE_TOP) -> Dict[str, Any]:
+        by_self = sorted(
+            self.imports.items(), key=lambda item: item[1]["self_ms"], reverse=True
+        )
+        return {
+            "milestones_ms": self.milestones,
+            "modules_imported": len(self.imports),
+            "import_self_ms_total": sum(
+                timing["self_ms"] for timing in self.imports.values()
+            ),
+            "slowest_imports": [
+                {"module": name, **timing} for name, timing in by_self[:top]
+            ],
+        }
+
+    def finish(self) -> None:
+        """
+        Stops timing imports, then logs the report and writes it to STARTUP_PROFILE_OUTPUT if set.
+        """
+        self.uninstall()
+        report = self.report()
+        logger.info(
+            "Startup profile: %s",
+            ", ".join(f"{name} at {ms:.0f}ms" for name, ms in self.milestones.items()),
+        )
+        for entry in report["slowest_imports"]:
+            logger.info(
+                "  import %-50s self %7.1fms  cumulative %7.1fms",
+                entry["module"],
+                entry["self_ms"],
+                entry["cumulative_ms"],
+            )
+        if STARTUP_PROFILE_OUTPUT:
+            with open(STARTUP_PROFILE_OUTPUT, "w") as output:
+                json.dump(report, output, indent=2)
@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+import project.change_notifications
+import project.hello_world_cache
 from pydantic import BaseModel
 
 
@@ -32,4 +34,7 @@ async def updateHelloWorld(message: str) -> UpdateHelloWorldResponse:
         )
     else:
         await prisma.models.HelloWorldModule.prisma().create(data={"message": message})
+    project.hello_world_cache.forget_loads()
+    project.hello_world_cache.message_cache.set(message)
+    await project.change_notifications.publish("HelloWorldModule")
     return UpdateHelloWorldResponse(message=message)
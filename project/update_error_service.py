@@ -1,5 +1,8 @@
 import prisma
 import prisma.models
+import project.change_notifications
+import project.error_cache
+import project.exceptions
 from pydantic import BaseModel
 
 
@@ -31,20 +34,19 @@ async def update_error(id: int, code: int, message: str) -> UpdateErrorResponseM
         print(updated_error)
         # Output: UpdateErrorResponseModel(id=1, errorMessage='Not Found', resolution='Resolution', code=404)
     """
-    existing_error = prisma.models.ErrorHandlingModule.prisma().find_unique(
-        where={"id": id}
-    )
-    if not existing_error:
-        raise ValueError(f"Error with ID {id} does not exist.")
-    updated_error = prisma.models.ErrorHandlingModule.prisma().update(
-        where={"id": id}, data={"code": code, "errorMessage": message}
+    # The fingerprint was computed from the old code and message, so it no longer identifies the
+    # row; later occurrences of the new error start their own row instead of merging into this one.
+    updated_error = await prisma.models.ErrorHandlingModule.prisma().update(
+        where={"id": id},
+        data={"code": code, "errorMessage": message, "fingerprint": None},
     )
+    if updated_error is None:
+        raise project.exceptions.NotFoundError(f"Error with ID {id} does not exist.")
+    project.error_cache.invalidate(id)
+    await project.change_notifications.publish("ErrorHandlingModule", key=id)
     return UpdateErrorResponseModel(
         id=updated_error.id,
         errorMessage=updated_error.errorMessage,
         resolution=updated_error.resolution,
         code=updated_error.code,
-    )  # TODO(autogpt): Cannot access attribute "id" for class "Coroutine[Any, Any, ErrorHandlingModule | None]"
-
-
-#     Attribute "id" is unknown. reportAttributeAccessIssue
+    )
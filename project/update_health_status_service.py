@@ -1,5 +1,6 @@
 import prisma
 import prisma.models
+import project.change_notifications
 from pydantic import BaseModel
 
 
@@ -29,6 +30,8 @@ async def update_health_status(statusMessage: str) -> HealthCheckUpdateResponse:
     await prisma.models.HealthCheckModule.prisma().update(
         where={"id": 1}, data={"statusMessage": statusMessage}
     )
+    project.change_notifications.notify_local("HealthCheckModule")
+    await project.change_notifications.publish("HealthCheckModule")
     response = HealthCheckUpdateResponse(
         confirmationMessage=f"Health status updated to: {statusMessage}"
     )
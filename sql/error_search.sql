@@ -0,0 +1,26 @@
+-- Makes ErrorHandlingModule."searchVector" a generated full-text search column, so Postgres keeps
+-- it in sync with "errorMessage" and "resolution". Prisma cannot declare generated columns, so
+-- apply this once after `prisma db push`:
+--
+--   prisma db execute --file sql/error_search.sql --schema schema.prisma
+--
+-- Re-running it is a no-op once the column is generated. The first run rewrites the table.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_attribute
+        WHERE attrelid = '"ErrorHandlingModule"'::regclass
+          AND attname = 'searchVector'
+          AND attgenerated = 's'
+    ) THEN
+        ALTER TABLE "ErrorHandlingModule" DROP COLUMN IF EXISTS "searchVector";
+        ALTER TABLE "ErrorHandlingModule" ADD COLUMN "searchVector" tsvector
+            GENERATED ALWAYS AS (
+                to_tsvector('english', "errorMessage" || ' ' || "resolution")
+            ) STORED;
+        CREATE INDEX "ErrorHandlingModule_searchVector_idx"
+            ON "ErrorHandlingModule" USING GIN ("searchVector");
+    END IF;
+END
+$$;
@@ -0,0 +1,28 @@
+from typing import Any, Dict, List, Optional
+
+import benchmarks.in_memory_db
+import prisma
+import pytest
+
+
+@pytest.fixture
+def database(monkeypatch) -> benchmarks.in_memory_db.InMemoryDatabase:
+    """
+    An empty in-memory database answering the Prisma queries of the test.
+    """
+    import project.db  # registers the Prisma client the models query through
+
+    database = benchmarks.in_memory_db.InMemoryDatabase()
+
+    async def execute(
+        self: Any,
+        *,
+        method: str,
+        arguments: Dict[str, Any],
+        model: Optional[type] = None,
+        root_selection: Optional[List[str]] = None,
+    ) -> Any:
+        return {"data": {"result": database.execute(method, arguments, model)}}
+
+    monkeypatch.setattr(prisma.Prisma, "_execute", execute)
+    return database
@@ -0,0 +1,113 @@
+import asyncio
+
+import project.cache
+import pytest
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(project.cache.time, "monotonic", clock)
+    return clock
+
+
+def test_get_returns_miss_for_absent_keys_and_counts_it(clock):
+    cache = project.cache.LRUCache(max_size=2, ttl=10)
+    assert cache.get(1) is project.cache.MISS
+    cache.put(1, None)
+    assert cache.get(1) is None
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "size": 1,
+        "max_size": 2,
+    }
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = project.cache.LRUCache(max_size=2, ttl=10)
+    cache.put(1, "one")
+    cache.put(2, "two")
+    cache.get(1)
+    cache.put(3, "three")
+    assert cache.get(2) is project.cache.MISS
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = project.cache.LRUCache(max_size=10, ttl=10)
+    cache.put("row", "value")
+    cache.put("missing", None, ttl=1)
+    clock.now += 5
+    assert cache.get("missing") is project.cache.MISS
+    assert cache.get("row") == "value"
+    clock.now += 5
+    assert cache.get("row") is project.cache.MISS
+    assert len(cache) == 0
+
+
+def test_zero_max_size_disables_caching(clock):
+    cache = project.cache.LRUCache(max_size=0, ttl=10)
+    cache.put(1, "one")
+    assert cache.get(1) is project.cache.MISS
+
+
+def test_invalidate_and_clear_bump_generations(clock):
+    cache = project.cache.LRUCache(max_size=10, ttl=10)
+    cache.put(1, "one")
+    cache.put(2, "two")
+    before = cache.generation(1), cache.generation(2)
+    cache.invalidate(1)
+    assert cache.get(1) is project.cache.MISS
+    assert cache.generation(1) != before[0]
+    assert cache.generation(2) == before[1]
+    after_invalidate = cache.generation(1)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.generation(1) != after_invalidate
+    assert cache.generation(2) != before[1]
+
+
+def test_forgotten_generations_still_change(clock):
+    cache = project.cache.LRUCache(max_size=2, ttl=10)
+    before = cache.generation(1)
+    for key in (1, 2, 3):
+        cache.invalidate(key)
+    # Only max_size generations are remembered; key 1's falls back to the floor, which must
+    # still differ from what a load started before its invalidation saw.
+    assert cache.generation(1) != before
+
+
+def test_cached_value_discards_a_load_that_raced_with_a_write():
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return "old"
+
+        cached = project.cache.CachedValue(slow_loader, ttl=60)
+        changes = []
+        cached.add_listener(changes.append)
+        read = asyncio.create_task(cached.get())
+        await started.wait()
+        cached.set("new")
+        release.set()
+        assert await read == "new"
+        assert await cached.get() == "new"
+        assert changes == ["new"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,73 @@
+import gzip
+
+import project.encoded_response
+import pytest
+from pydantic import BaseModel
+
+
+class Message(BaseModel):
+    message: str
+
+
+@pytest.fixture
+def encoded():
+    return project.encoded_response.EncodedResponse(b'{"message":"hi"}', compress=True)
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ("", False),
+        ('"something-else"', False),
+        ("*", True),
+    ],
+)
+def test_matches_missing_and_wildcard_tags(encoded, header, matches):
+    assert encoded.matches(header) is matches
+
+
+def test_matches_either_representation_and_weak_tags(encoded):
+    assert encoded.matches(encoded.etag)
+    assert encoded.matches(encoded.gzip_etag)
+    assert encoded.matches(f"W/{encoded.etag}")
+    assert encoded.matches(f'"stale", {encoded.etag}')
+    assert not encoded.matches(encoded.etag.strip('"'))
+
+
+def test_equal_bodies_share_an_etag():
+    first = project.encoded_response.EncodedResponse.from_model(Message(message="hi"))
+    second = project.encoded_response.EncodedResponse.from_model(Message(message="hi"))
+    other = project.encoded_response.EncodedResponse.from_model(Message(message="ho"))
+    assert first.etag == second.etag != other.etag
+
+
+def test_not_modified_has_no_body(encoded):
+    response = encoded.to_response(if_none_match=encoded.etag)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == encoded.etag
+
+
+def test_gzip_is_served_when_accepted(encoded):
+    response = encoded.to_response(accept_encoding="br, gzip;q=0.8")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == encoded.gzip_etag
+    assert gzip.decompress(response.body) == encoded.body
+    plain = encoded.to_response(accept_encoding="gzip;q=0")
+    assert plain.body == encoded.body
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+
+def test_cache_encodes_again_only_when_the_source_changes():
+    builds = []
+
+    def build(source):
+        builds.append(source)
+        return Message(message=source)
+
+    cache = project.encoded_response.EncodedResponseCache(build)
+    first = cache.get("hi")
+    assert cache.get("hi") is first
+    assert cache.get("ho") is not first
+    assert builds == ["hi", "ho"]
@@ -0,0 +1,62 @@
+import asyncio
+
+import project.error_filters
+import project.exceptions
+import pytest
+
+Selection = project.error_filters.ErrorSelectionModel
+
+
+def bounded(selection, limit=3):
+    return asyncio.run(project.error_filters.bounded_selection(selection, limit))
+
+
+@pytest.fixture
+def errors(database):
+    for i in range(10):
+        database.insert(
+            "ErrorHandlingModule",
+            {"errorMessage": f"error {i}", "resolution": "", "code": 500 + i % 2},
+        )
+    return database
+
+
+def test_error_filter_combines_code_and_id_bounds():
+    assert project.error_filters.error_filter(code=500, min_id=10, max_id=20) == {
+        "id": {"gte": 10, "lte": 20},
+        "code": 500,
+    }
+    assert project.error_filters.error_filter(after_id=5) == {"id": {"gt": 5}}
+    assert project.error_filters.error_filter() == {}
+
+
+def test_ids_are_selected_as_given(errors):
+    assert bounded(Selection(ids=[1, 2])) == ({"id": {"in": [1, 2]}}, False)
+
+
+@pytest.mark.parametrize(
+    "selection",
+    [Selection(ids=[1, 2, 3, 4]), Selection(ids=[1], code=500), Selection()],
+)
+def test_invalid_selections_are_bad_requests(errors, selection):
+    with pytest.raises(project.exceptions.BadRequestError):
+        bounded(selection)
+
+
+def test_a_filter_within_the_limit_is_kept(errors):
+    assert bounded(Selection(code=500, max_id=4)) == (
+        {"id": {"lte": 4}, "code": 500},
+        False,
+    )
+
+
+def test_a_filter_over_the_limit_is_narrowed_to_the_lowest_ids(errors):
+    where, has_more = bounded(Selection(code=501))
+    assert has_more
+    assert where == {"id": {"lte": 6}, "code": 501}
+    matched = errors.select("ErrorHandlingModule", {"where": where})
+    assert [row["id"] for row in matched] == [2, 4, 6]
+
+
+def test_a_filter_matching_exactly_the_limit_has_no_more(errors):
+    assert bounded(Selection(min_id=8)) == ({"id": {"gte": 8}}, False)
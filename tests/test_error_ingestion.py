@@ -0,0 +1,130 @@
+import asyncio
+
+import project.error_ingestion
+import pytest
+
+Policy = project.error_ingestion.OverflowPolicy
+
+
+def make_queue(**kwargs):
+    kwargs.setdefault("batch_size", 2)
+    kwargs.setdefault("max_pending", 4)
+    kwargs.setdefault("overflow_policy", Policy.DROP)
+    return project.error_ingestion.ErrorIngestionQueue(**kwargs)
+
+
+@pytest.fixture
+def failing_writes(monkeypatch):
+    async def fail(batch):
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(project.error_ingestion, "_write_batch", fail)
+
+
+def test_drop_policy_discards_errors_beyond_max_pending():
+    queue = make_queue()
+    results = [queue.submit_nowait(500, f"error {i}") for i in range(6)]
+    assert results == [True] * 4 + [False] * 2
+    assert (queue.accepted, queue.dropped, queue.pending) == (4, 2, 4)
+
+
+def test_sample_policy_keeps_a_fraction_once_half_full(monkeypatch):
+    queue = make_queue(overflow_policy=Policy.SAMPLE, sample_rate=0.5)
+    draws = iter([0.9, 0.1, 0.1])
+    monkeypatch.setattr(project.error_ingestion.random, "random", lambda: next(draws))
+    results = [queue.submit_nowait(500, f"error {i}") for i in range(6)]
+    # Two fit below half; then one sample is rejected, two are kept and the queue is full.
+    assert results == [True, True, False, True, True, False]
+    assert queue.pending == 4
+
+
+def test_block_policy_waits_for_a_flush(database):
+    async def scenario():
+        queue = make_queue(overflow_policy=Policy.BLOCK)
+        for i in range(4):
+            await queue.submit(500, f"error {i}")
+        blocked = asyncio.create_task(queue.submit(500, "error 4"))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        await queue.flush()
+        assert await blocked
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert (queue.flushed, queue.pending, queue.dropped) == (2, 3, 0)
+
+
+def test_flush_writes_one_batch(database):
+    async def scenario():
+        queue = make_queue(max_pending=10)
+        for i in range(3):
+            queue.submit_nowait(500 + i, f"error {i}")
+        assert await queue.flush()
+        return queue
+
+    queue = asyncio.run(scenario())
+    rows = database.select("ErrorHandlingModule", {})
+    assert [(row["code"], row["errorMessage"]) for row in rows] == [
+        (500, "error 0"),
+        (501, "error 1"),
+    ]
+    assert (queue.flushed, queue.pending) == (2, 1)
+
+
+def test_a_failed_batch_is_requeued_in_front(failing_writes):
+    async def scenario():
+        queue = make_queue(max_pending=10)
+        for i in range(3):
+            queue.submit_nowait(500, f"error {i}")
+        assert not await queue.flush()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert [message for _, message, _ in queue._pending] == [
+        "error 0",
+        "error 1",
+        "error 2",
+    ]
+    assert (queue.failed_flushes, queue.dropped) == (1, 0)
+
+
+def test_requeue_drops_what_no_longer_fits(monkeypatch):
+    queue = make_queue()
+
+    async def fill_then_fail(batch):
+        # Errors submitted while the batch is being written take the room it left.
+        queue.submit_nowait(500, "new 0")
+        queue.submit_nowait(500, "new 1")
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(project.error_ingestion, "_write_batch", fill_then_fail)
+
+    async def scenario():
+        for i in range(4):
+            queue.submit_nowait(500, f"error {i}")
+        assert not await queue.flush()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert queue.pending == 4
+    assert queue.dropped == 2
+    assert [message for _, message, _ in queue._pending] == [
+        "error 2",
+        "error 3",
+        "new 0",
+        "new 1",
+    ]
+
+
+def test_stop_flushes_everything_queued(database):
+    async def scenario():
+        queue = make_queue(max_pending=10)
+        queue.start()
+        for i in range(5):
+            queue.submit_nowait(500, f"error {i}")
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert queue.pending == 0
+    assert len(database.select("ErrorHandlingModule", {})) == 5
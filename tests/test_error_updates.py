@@ -0,0 +1,57 @@
+import asyncio
+
+import project.bulk_update_errors_service
+import project.error_filters
+import project.error_fingerprint
+import project.update_error_service
+import pytest
+
+Request = project.bulk_update_errors_service.BulkUpdateErrorsRequestModel
+Selection = project.error_filters.ErrorSelectionModel
+
+
+@pytest.fixture
+def fingerprinted(database):
+    for code, message in [(404, "Not Found"), (500, "Server Error")]:
+        database.insert(
+            "ErrorHandlingModule",
+            {
+                "errorMessage": message,
+                "resolution": "",
+                "code": code,
+                "fingerprint": project.error_fingerprint.fingerprint(code, message),
+            },
+        )
+    return database
+
+
+def fingerprints(database):
+    return [
+        row["fingerprint"]
+        for row in database.select("ErrorHandlingModule", {"where": {}})
+    ]
+
+
+def test_update_error_clears_the_fingerprint(fingerprinted):
+    asyncio.run(project.update_error_service.update_error(1, 410, "Gone"))
+    assert fingerprints(fingerprinted) == [
+        None,
+        project.error_fingerprint.fingerprint(500, "Server Error"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [{"code": 410}, {"errorMessage": "Gone"}, {"code": 410, "resolution": "x"}],
+)
+def test_bulk_update_of_code_or_message_clears_fingerprints(fingerprinted, changes):
+    request = Request(selection=Selection(ids=[1, 2]), **changes)
+    asyncio.run(project.bulk_update_errors_service.bulk_update_errors(request))
+    assert fingerprints(fingerprinted) == [None, None]
+
+
+def test_bulk_update_of_resolution_keeps_fingerprints(fingerprinted):
+    before = fingerprints(fingerprinted)
+    request = Request(selection=Selection(ids=[1, 2]), resolution="Fixed")
+    asyncio.run(project.bulk_update_errors_service.bulk_update_errors(request))
+    assert fingerprints(fingerprinted) == before
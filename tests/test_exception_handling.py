@@ -0,0 +1,74 @@
+import json
+
+import project.exception_handling
+import project.exceptions
+import pytest
+
+KEY = ("RuntimeError", "service.py", 10, "/api/errors")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(project.exception_handling.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_a_fingerprint_is_logged_once_per_interval(clock):
+    sampler = project.exception_handling.ExceptionLogSampler(interval=60)
+    assert sampler.sample(KEY) == (True, 0)
+    clock[0] += 10
+    assert sampler.sample(KEY) == (False, 0)
+    assert sampler.sample(KEY) == (False, 0)
+    clock[0] += 60
+    assert sampler.sample(KEY) == (True, 2)
+    assert (sampler.logged, sampler.suppressed) == (2, 2)
+
+
+def test_fingerprints_are_sampled_independently(clock):
+    sampler = project.exception_handling.ExceptionLogSampler(interval=60)
+    other = KEY[:3] + ("/health",)
+    assert sampler.sample(KEY) == (True, 0)
+    assert sampler.sample(other) == (True, 0)
+
+
+def test_the_least_recently_seen_fingerprint_is_forgotten(clock):
+    sampler = project.exception_handling.ExceptionLogSampler(
+        interval=60, max_fingerprints=2
+    )
+    first, second, third = (KEY[:2] + (line,) + KEY[3:] for line in (1, 2, 3))
+    sampler.sample(first)
+    sampler.sample(second)
+    sampler.sample(first)
+    sampler.sample(third)
+    assert sampler.sample(first) == (False, 0)
+    assert sampler.sample(second) == (True, 0)
+
+
+def test_fingerprint_identifies_the_raising_line():
+    def fail():
+        raise RuntimeError("boom")
+
+    try:
+        fail()
+    except RuntimeError as exc:
+        name, filename, line, route = project.exception_handling.fingerprint(
+            exc, "/route"
+        )
+    assert (name, route) == ("RuntimeError", "/route")
+    assert filename == __file__
+    assert line == fail.__code__.co_firstlineno + 1
+
+
+@pytest.mark.parametrize(
+    "exc, status_code",
+    [
+        (project.exceptions.NotFoundError("missing"), 404),
+        (project.exceptions.BadRequestError("bad limit"), 400),
+        (TimeoutError(), 503),
+        (ValueError("bug"), 500),
+        (json.JSONDecodeError("bug", "", 0), 500),
+    ],
+)
+def test_status_codes(exc, status_code):
+    assert project.exception_handling.status_code_for(exc) == status_code
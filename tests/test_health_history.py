@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime, timezone
+
+import project.get_health_history_service
+import project.health_history
+import pytest
+
+NOW = 1_800_000_000.0  # a whole hour
+
+
+@pytest.fixture
+def history(monkeypatch):
+    monkeypatch.setattr(project.health_history.time, "time", lambda: NOW)
+    history = project.health_history.HealthHistory(
+        raw_retention=3600, minute_retention=86400, hour_retention=7 * 86400
+    )
+    monkeypatch.setattr(project.health_history, "history", history)
+    return history
+
+
+def test_every_sample_goes_into_each_tier(history):
+    for offset, ready in ((0, True), (20, False), (70, True)):
+        history.record(ready, "ok", 5.0, 1.0, timestamp=NOW - 3600 + offset)
+    raw, minute, hour = history.tiers
+    assert len(raw.buckets) == 3
+    assert [bucket.samples for bucket in minute.buckets] == [2, 1]
+    assert [bucket.samples for bucket in hour.buckets] == [3]
+    assert hour.buckets[0].ready_samples == 2
+
+
+def test_aggregates_track_latency_lag_and_the_last_status(history):
+    history.record(True, "ok", 10.0, 1.0, timestamp=NOW - 30)
+    history.record(False, "degraded", None, 4.0, timestamp=NOW - 20)
+    history.record(True, "ok", 30.0, 2.0, timestamp=NOW - 10)
+    (bucket,) = history.tiers[1].buckets
+    assert bucket.status == "ok"
+    assert bucket.latency_samples == 2
+    assert bucket.latency_sum_ms == 40.0
+    assert bucket.latency_max_ms == 30.0
+    assert bucket.lag_sum_ms == 7.0
+    assert bucket.lag_max_ms == 4.0
+
+
+def test_buckets_older_than_the_retention_are_dropped(history):
+    history.record(True, "ok", 1.0, 1.0, timestamp=NOW - 7200)
+    history.record(True, "ok", 1.0, 1.0, timestamp=NOW)
+    raw, minute, _ = history.tiers
+    assert [bucket.start for bucket in raw.buckets] == [NOW]
+    assert len(minute.buckets) == 2
+
+
+def test_query_picks_the_finest_tier_covering_the_start(history):
+    assert history.query(NOW - 600, NOW)[0].resolution == 0
+    assert history.query(NOW - 7200, NOW)[0].resolution == 60
+    assert history.query(NOW - 2 * 86400, NOW)[0].resolution == 3600
+    assert history.query(NOW - 30 * 86400, NOW)[0].resolution == 3600
+    assert history.query(NOW - 600, NOW, resolution=3600)[0].resolution == 3600
+
+
+def test_range_includes_the_bucket_the_start_falls_into(history):
+    for minute in range(5):
+        history.record(True, "ok", 1.0, 1.0, timestamp=NOW - 300 + minute * 60 + 5)
+    _, buckets = history.query(NOW - 170, NOW - 60, resolution=60)
+    assert [bucket.start for bucket in buckets] == [NOW - 180, NOW - 120, NOW - 60]
+
+
+def test_unknown_resolution_is_rejected(history):
+    with pytest.raises(ValueError):
+        history.query(NOW - 600, NOW, resolution=5)
+
+
+def test_service_treats_naive_times_as_utc(history):
+    history.record(True, "ok", 1.0, 1.0, timestamp=NOW - 30)
+    naive_start = datetime.fromtimestamp(NOW - 600, timezone.utc).replace(tzinfo=None)
+    response = asyncio.run(
+        project.get_health_history_service.get_health_history(
+            start=naive_start, end=datetime.fromtimestamp(NOW, timezone.utc)
+        )
+    )
+    assert [point.samples for point in response.points] == [1]
+
+
+def test_retention_shorter_than_resolution_does_not_fail():
+    tier = project.health_history.HealthTier(resolution=60, retention=30)
+    tier.add(NOW + 45, True, "ok", 5.0, 1.0)
+    assert len(tier.buckets) == 0
@@ -0,0 +1,32 @@
+import asyncio
+
+import project.change_notifications
+import project.hello_world_cache
+import project.hello_world_stream
+import pytest
+
+
+@pytest.mark.parametrize("ttl", [0, 300])
+def test_remote_change_is_streamed_whatever_the_cache_ttl(monkeypatch, ttl):
+    message_cache = project.hello_world_cache.message_cache
+    broadcaster = project.hello_world_stream.Broadcaster()
+    broadcaster.subscribers = 1
+
+    async def load_message():
+        return "Updated elsewhere"
+
+    monkeypatch.setattr(project.hello_world_stream, "broadcaster", broadcaster)
+    monkeypatch.setattr(message_cache, "ttl", ttl)
+    monkeypatch.setattr(message_cache, "_loader", load_message)
+    monkeypatch.setattr(message_cache, "_value", "Hello, World!")
+    monkeypatch.setattr(message_cache, "_has_value", True)
+    monkeypatch.setattr(message_cache, "_loaded_at", None)
+
+    async def scenario():
+        project.change_notifications.notify_local("HelloWorldModule")
+        await asyncio.gather(*project.hello_world_stream._reload_tasks)
+
+    asyncio.run(scenario())
+    assert broadcaster.event == project.hello_world_stream.encode_event(
+        "Updated elsewhere"
+    )
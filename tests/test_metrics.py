@@ -0,0 +1,69 @@
+import asyncio
+
+import project.metrics
+import pytest
+
+
+def test_metric_is_abstract():
+    with pytest.raises(TypeError):
+        project.metrics.Metric("untyped_metric", "No render method.")
+
+
+def test_counter_and_gauge_render_labels_and_values():
+    counter = project.metrics.Counter("requests_total", "Requests.", ("route",))
+    counter.inc(("/a",))
+    counter.inc(("/a",), 2)
+    counter.inc(('/b"\\',))
+    gauge = project.metrics.Gauge("pending", "Pending items.")
+    gauge.set(5)
+    gauge.dec()
+    assert counter.render() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 3',
+        'requests_total{route="/b\\"\\\\"} 1',
+    ]
+    assert gauge.render()[1:] == ["# TYPE pending gauge", "pending 4"]
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = project.metrics.Histogram(
+        "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ("/a",))
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_registry_refreshes_callback_gauges_at_render():
+    registry = project.metrics.Registry()
+    values = iter([1, 2])
+
+    async def collect():
+        return [((), next(values))]
+
+    registry.register(
+        project.metrics.CallbackGauge(
+            "queue_size", "Queue size.", collect, type_name="counter"
+        )
+    )
+    first = asyncio.run(registry.render())
+    second = asyncio.run(registry.render())
+    assert (
+        first
+        == b"# HELP queue_size Queue size.\n# TYPE queue_size counter\nqueue_size 1\n"
+    )
+    assert second.endswith(b"queue_size 2\n")
+
+
+def test_a_name_can_only_be_registered_once():
+    registry = project.metrics.Registry()
+    registry.register(project.metrics.Counter("twice_total", "Twice."))
+    with pytest.raises(ValueError):
+        registry.register(project.metrics.Gauge("twice_total", "Twice."))
@@ -0,0 +1,143 @@
+import asyncio
+
+import project.single_flight
+import pytest
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_concurrent_calls_for_a_key_share_one_call():
+    async def scenario():
+        flight = project.single_flight.SingleFlight("test")
+        calls = 0
+        release = asyncio.Event()
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.in_flight == 1
+        release.set()
+        results = await asyncio.gather(*waiters)
+        return flight, calls, results
+
+    flight, calls, results = run(scenario())
+    assert calls == 1
+    assert results == [1] * 5
+    assert (flight.executed, flight.coalesced) == (1, 4)
+    assert flight.coalescing_ratio == pytest.approx(0.8)
+    assert flight.in_flight == 0
+
+
+def test_different_keys_and_later_calls_run_separately():
+    async def scenario():
+        flight = project.single_flight.SingleFlight("test")
+
+        async def call(value):
+            await asyncio.sleep(0)
+            return value
+
+        first = await asyncio.gather(
+            flight.do("a", lambda: call("a")), flight.do("b", lambda: call("b"))
+        )
+        second = await flight.do("a", lambda: call("again"))
+        return flight, first, second
+
+    flight, first, second = run(scenario())
+    assert first == ["a", "b"]
+    assert second == "again"
+    assert (flight.executed, flight.coalesced) == (3, 0)
+
+
+def test_timeout_is_raised_to_every_caller():
+    async def scenario():
+        flight = project.single_flight.SingleFlight("test", timeout=0.01)
+
+        async def call():
+            await asyncio.sleep(1)
+
+        return flight, await asyncio.gather(
+            flight.do("key", call), flight.do("key", call), return_exceptions=True
+        )
+
+    flight, results = run(scenario())
+    assert all(isinstance(result, TimeoutError) for result in results)
+    assert flight.failed == 1
+
+
+def test_an_exception_is_raised_to_every_caller():
+    async def scenario():
+        flight = project.single_flight.SingleFlight("test")
+
+        async def call():
+            await asyncio.sleep(0)
+            raise RuntimeError("database down")
+
+        return flight, await asyncio.gather(
+            *(flight.do("key", call) for _ in range(3)), return_exceptions=True
+        )
+
+    flight, results = run(scenario())
+    assert [str(result) for result in results] == ["database down"] * 3
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.failed == 1
+    assert flight.in_flight == 0
+
+
+def test_a_cancelled_caller_does_not_cancel_the_call_for_the_others():
+    async def scenario():
+        flight = project.single_flight.SingleFlight("test")
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", call))
+        second = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert run(scenario()) == "done"
+
+
+def test_forget_makes_later_callers_start_a_new_call():
+    async def scenario():
+        flight = project.single_flight.SingleFlight("test")
+        release = asyncio.Event()
+        values = iter(["before the write", "after the write"])
+
+        async def call():
+            value = next(values)
+            await release.wait()
+            return value
+
+        stale = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0)
+        flight.forget("key")
+        fresh = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0)
+        release.set()
+        return await stale, await fresh, flight
+
+    stale, fresh, flight = run(scenario())
+    assert (stale, fresh) == ("before the write", "after the write")
+    assert flight.executed == 2
+    assert flight.in_flight == 0
+
+
+def test_group_returns_the_same_named_group():
+    group = project.single_flight.group("test_group_registry")
+    assert project.single_flight.group("test_group_registry") is group
+    assert project.single_flight.groups["test_group_registry"] is group